@@ -0,0 +1,308 @@
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import util
+
+# Adjust system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.batch import invalid_result, read_records
+from core.core_setup import create_driver_pool
+from core.metrics import METRICS
+from core.session_store import SessionStore
+from core.http_backend import HttpBackendError
+from core.reconciliation import format_reconciliation, reconcile
+from core.scheduler import plan_affinity, run_queues
+from core.validation import format_report, validate_records
+from Purchase_Order.create_purchase_order import PURCHASE_ORDER_RULES, PurchaseOrder
+from Purchase_Order.sharded_query import query_purchase_orders
+
+BOOLEAN_FIELDS = ("tax_on_free_active",)
+# create_purchase_order reloads a blank form per record, so sharing a store or
+# supplier saves nothing; affinity queues only share the logged-in PO workflow.
+AFFINITY_FIELDS = ()
+
+
+def run_record(index, record, username, password, driver_pool, session_store, pacing, profile, bulk_fill=False):
+    """Create one PO and return its result row."""
+    start = time.perf_counter()
+    bot = PurchaseOrder(username, password, driver_pool=driver_pool, session_store=session_store,
+                        pacing=pacing, profile=profile, job_id=f"po-{index}")
+    try:
+        ok = bot.load_dashboard(record, bulk_fill=bulk_fill)
+        error = bot.errors[0] if bot.errors else None
+    except Exception as e:
+        ok, error = False, str(e)
+    return {
+        "index": index,
+        "status": "ok" if ok else "failed",
+        "duration": round(time.perf_counter() - start, 3),
+        "error": error,
+    }
+
+
+# -----------------------
+# Affinity workers: one logged-in bot per queue, reusing the PO form between jobs
+# -----------------------
+def open_affinity_worker(n, username, password, driver_pool, session_store, pacing, profile):
+    bot = PurchaseOrder(username, password, driver_pool=driver_pool, session_store=session_store,
+                        pacing=pacing, profile=profile, job_id=f"po-affinity-{n}")
+    try:
+        bot.init_driver()
+        bot.login()
+    except Exception:
+        bot.quit()  # give the driver back before run_queues fails this queue's jobs
+        raise
+    return bot
+
+
+def run_affinity_record(bot, index, record, bulk_fill=False):
+    """Create one PO on a long-lived bot and return its result row."""
+    start = time.perf_counter()
+    bot.job_id = f"po-{index}"
+    try:
+        ok = bot.create_purchase_order(record, bulk_fill=bulk_fill)
+        error = bot.errors[0] if bot.errors else None
+    except Exception as e:
+        ok, error = False, str(e)
+    return {
+        "index": index,
+        "status": "ok" if ok else "failed",
+        "duration": round(time.perf_counter() - start, 3),
+        "error": error,
+    }
+
+
+# -----------------------
+# HTTP fast path: one browser login, then plain POSTs
+# -----------------------
+def is_ui_sample(index, rate):
+    """Spread a fraction `rate` of the records evenly over the batch for the browser check."""
+    return int((index + 1) * rate) > int(index * rate)
+
+
+def open_http_backend(username, password, pool, session_store, pacing, profile, pool_size):
+    """Log in once through the browser and hand its session to an HttpBackend."""
+    bot = PurchaseOrder(username, password, driver_pool=pool, session_store=session_store,
+                        pacing=pacing, profile=profile, job_id="po-login")
+    try:
+        bot.init_driver()
+        bot.login()
+        return bot.http_backend(pool_size=pool_size)
+    finally:
+        bot.quit()
+
+
+def run_http_record(index, record, backend):
+    """Create one PO over HTTP and return its result row."""
+    start = time.perf_counter()
+    try:
+        created = backend.create_purchase_order(record)
+        ok, error = True, None
+    except (HttpBackendError, OSError) as e:
+        created, ok, error = {}, False, str(e)
+    METRICS.record("PurchaseOrder", "http:create_purchase_order", time.perf_counter() - start)
+    return {
+        "index": index,
+        "status": "ok" if ok else "failed",
+        "duration": round(time.perf_counter() - start, 3),
+        "error": error,
+        "path": "http",
+        "id": created.get("id"),
+    }
+
+
+# -----------------------
+# Process workers: one warm driver per process
+# -----------------------
+_worker = {}
+
+
+def _init_process_worker(username, password, pacing, profile, session_dir, bulk_fill):
+    pool = create_driver_pool(1, profile)
+    util.Finalize(None, pool.close, exitpriority=10)  # quit Chrome when the worker exits
+    _worker.update(username=username, password=password, pacing=pacing, profile=profile,
+                   pool=pool, store=SessionStore(session_dir), bulk_fill=bulk_fill)
+
+
+def _run_in_process(index, record):
+    METRICS.reset()
+    result = run_record(index, record, _worker["username"], _worker["password"], _worker["pool"],
+                        _worker["store"], _worker["pacing"], _worker["profile"], _worker["bulk_fill"])
+    result["metrics"] = METRICS.samples()  # merged into the parent's METRICS
+    return result
+
+
+# -----------------------
+# Reconciliation: one bulk scrape of the PO list before and after the batch
+# -----------------------
+def snapshot_purchase_orders(username, password, from_date, to_date, session_dir, pacing, profile):
+    """{po_number: row} for every PO dated in the range, read page by page from the list."""
+    rows = {}
+    for page in query_purchase_orders(username, password, "All", from_date, to_date, pacing=pacing,
+                                      profile=profile, session_dir=session_dir):
+        for row in page:
+            rows[row.get("po_number")] = row
+    return rows
+
+
+def reconcile_batch(ledger, before, after):
+    """
+    Diff the successfully run records ([(index, record)]) against the POs that
+    appeared in the list during the batch, matched by supplier; several POs for
+    one supplier are paired with its rows by requisitioner before diffing.
+    """
+    created = [row for number, row in after.items() if number not in before]
+    return reconcile(ledger, created, key=("supplier",), compare={"prepared_by": "requisitioner"})
+
+
+def run_batch(records, username, password, workers=4, mode="thread", pacing="fast", profile="lean",
+              output=None, session_dir=".sessions", bulk_fill=False, http=False, ui_sample=0.0,
+              validate=True, reconcile_list=False):
+    """
+    Run records across `workers` threads or processes, each with its own driver.
+    mode="affinity" splits the records into one queue per worker, and each queue runs
+    on one logged-in bot that stays in the PO workflow between records.
+    With http=True records are posted through HttpBackend on threads (mode is ignored)
+    and only a `ui_sample` fraction of them go through the browser as a UI check.
+    With validate=True records are first checked against PURCHASE_ORDER_RULES; rejected
+    ones are reported as "invalid" without a job and fixable ones run corrected.
+    Results are written to `output` (JSONL) as they complete and returned as a list.
+    With reconcile_list=True the PO list is scraped once before and once after the
+    run and the new rows are diffed against the records reported ok (saved); each of those
+    results gets a "reconciled" status (matched/missing/duplicated/mismatched).
+    """
+    results = []
+    started = time.perf_counter()
+    out = open(output, "w", encoding="utf-8") if output else None
+    pool = backend = None
+    jobs = list(enumerate(records))
+    if validate:
+        report = validate_records(records, PURCHASE_ORDER_RULES)
+        print(format_report(report))
+        jobs = report.valid
+        for index, _, errors in report.rejected:
+            results.append(invalid_result(index, errors))
+            if out:
+                out.write(json.dumps(results[-1]) + "\n")
+    if reconcile_list and jobs:
+        first_day = datetime.date.today().isoformat()
+        before = snapshot_purchase_orders(username, password, first_day, first_day, session_dir, pacing, profile)
+
+    def collect(result):
+        METRICS.merge(result.pop("metrics", []))
+        results.append(result)
+        if out:
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+        print(f"[{len(results)}/{len(records)}] record {result['index']}: {result['status']} "
+              f"in {result['duration']}s" + (f" - {result['error']}" if result["error"] else ""))
+
+    try:
+        if not jobs:
+            return results
+        executor = None
+        if http:
+            executor = ThreadPoolExecutor(max_workers=workers)
+            pool = create_driver_pool(1 if ui_sample <= 0 else workers, profile)
+            store = SessionStore(session_dir)
+            backend = open_http_backend(username, password, pool, store, pacing, profile, workers)
+            submit = lambda i, r: executor.submit(
+                run_record, i, r, username, password, pool, store, pacing, profile, bulk_fill
+            ) if is_ui_sample(i, ui_sample) else executor.submit(run_http_record, i, r, backend)
+        elif mode == "affinity":
+            queues = plan_affinity(jobs, workers, AFFINITY_FIELDS)
+            pool = create_driver_pool(len(queues), profile)
+            store = SessionStore(session_dir)
+            run_queues(queues,
+                       lambda n: open_affinity_worker(n, username, password, pool, store, pacing, profile),
+                       lambda bot, i, r: run_affinity_record(bot, i, r, bulk_fill),
+                       on_result=collect)
+        elif mode == "process":
+            executor = ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_process_worker,
+                initargs=(username, password, pacing, profile, session_dir, bulk_fill))
+            submit = lambda i, r: executor.submit(_run_in_process, i, r)
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers)
+            pool = create_driver_pool(workers, profile)
+            store = SessionStore(session_dir)
+            submit = lambda i, r: executor.submit(
+                run_record, i, r, username, password, pool, store, pacing, profile, bulk_fill)
+
+        if executor is not None:
+            with executor:
+                futures = [submit(i, r) for i, r in jobs]
+                for future in as_completed(futures):
+                    collect(future.result())
+    finally:
+        if backend:
+            backend.close()
+        if pool:
+            pool.close()
+        if out:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    if reconcile_list:
+        after = snapshot_purchase_orders(username, password, first_day, datetime.date.today().isoformat(),
+                                         session_dir, pacing, profile)
+        records = dict(jobs)
+        report = reconcile_batch([(r["index"], records[r["index"]]) for r in results if r["status"] == "ok"],
+                                 before, after)
+        print(format_reconciliation(report, "purchase orders"))
+        status = {index: "matched" for index in report.matched}
+        status.update({index: "missing" for index in report.missing})
+        status.update({index: "duplicated" for index, _ in report.duplicated})
+        status.update({index: "mismatched" for index, _ in report.mismatched})
+        for result in results:
+            if result["index"] in status:
+                result["reconciled"] = status[result["index"]]
+    ok = sum(1 for r in results if r["status"] == "ok")
+    invalid = sum(1 for r in results if r["status"] == "invalid")
+    print(f"\nBatch finished: {ok} ok, {len(results) - ok - invalid} failed, {invalid} invalid in {elapsed:.1f}s "
+          f"({len(results) / elapsed * 60 if elapsed else 0:.1f} jobs/min)")
+    print(METRICS.format_summary())
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create Purchase Orders in bulk from a CSV/JSONL file.")
+    parser.add_argument("input", help="CSV or JSONL file with one PO record per row/line.")
+    parser.add_argument("-o", "--output", default="po_batch_results.jsonl", help="Per-record results (JSONL).")
+    parser.add_argument("-w", "--workers", type=int, default=4)
+    parser.add_argument("--mode", choices=("thread", "process", "affinity"), default="thread",
+                        help="affinity: one logged-in session per worker, kept in the PO workflow.")
+    parser.add_argument("--pacing", default="fast", help="Pacing profile (demo/fast).")
+    parser.add_argument("--profile", default="lean", help="Chrome profile (default/lean).")
+    parser.add_argument("--bulk-fill", action="store_true",
+                        help="Set the plain header fields in one script call instead of field by field.")
+    parser.add_argument("--http", action="store_true",
+                        help="Log in once in the browser, then create POs with plain HTTP requests.")
+    parser.add_argument("--ui-sample", type=float, default=0.05,
+                        help="With --http, fraction of records still created through the browser.")
+    parser.add_argument("--no-validate", action="store_true",
+                        help="Skip the pre-flight check of records against cached master data and field formats.")
+    parser.add_argument("--validate-only", action="store_true",
+                        help="Check the records, print the report and exit without running anything.")
+    parser.add_argument("--reconcile", action="store_true",
+                        help="Scrape the PO list before and after the batch and report missing/duplicated POs.")
+    parser.add_argument("--username", default=os.environ.get("DOLPHIN_USERNAME"))
+    parser.add_argument("--password", default=os.environ.get("DOLPHIN_PASSWORD"))
+    args = parser.parse_args()
+
+    if args.validate_only:
+        report = validate_records(list(read_records(args.input, BOOLEAN_FIELDS)), PURCHASE_ORDER_RULES)
+        print(format_report(report))
+        sys.exit(1 if report.rejected else 0)
+
+    username = args.username or input("Enter your username: ")
+    password = args.password or input("Enter your password: ")
+
+    run_batch(list(read_records(args.input, BOOLEAN_FIELDS)), username, password, workers=args.workers,
+              mode=args.mode, pacing=args.pacing, profile=args.profile, output=args.output,
+              bulk_fill=args.bulk_fill, http=args.http, ui_sample=args.ui_sample, validate=not args.no_validate,
+              reconcile_list=args.reconcile)
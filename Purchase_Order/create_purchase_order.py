@@ -1,6 +1,5 @@
 import sys
 import os
-import time
 import traceback
 from faker import Faker
 import random
@@ -10,12 +9,47 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 # Adjust system path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from core.core_setup import BaseCanteenAutomation
+from core.core_setup import BaseAutomation, PURCHASE_ORDER_CREATE_URL, SESSION_ENVIRONMENT
+from core.catalogue import catalogue_directory
+from core.master_data import get_directory
+from core.metrics import METRICS
+from core.multiselect import VueMultiselect
+from core.validation import boolean, choice, integer, iso_date, master, percent, required
+from core.waits import input_enabled, input_value, url_left
 
 
 # ✅ Initialize Faker
 fake = Faker('en_IN')  # Use Indian locale (close to Nepali data style)
 
+SUPPLIER_TARGET = {"name": "supplier"}
+STORE_TARGET = {"placeholder": "Select Store"}
+CATALOGUE_TARGET = {"css": "div.input-group.custom-widthed-multiselect"}
+PAYMENT_TERMS = ("CASH", "BT", "AFDL")
+# The save control and the page it redirects to have not been checked against the
+# live form; both are assumptions (a Laravel store action redirecting away from
+# /create) and can be overridden per environment.
+SAVE_BUTTON = os.environ.get(
+    "DOLPHIN_PURCHASE_ORDER_SAVE_BUTTON",
+    "//form//button[@type='submit' or normalize-space()='Save']")
+SAVED_URL_LEAVES = os.environ.get("DOLPHIN_PURCHASE_ORDER_CREATE_PATH", "/purchase_order/create")
+
+# Pre-flight checks for batch records (see core.validation); master data is
+# checked against the local caches only, so validation never opens a browser.
+PURCHASE_ORDER_RULES = {
+    "supplier": (required, master(get_directory("suppliers", SESSION_ENVIRONMENT))),
+    "store": (required, master(get_directory("stores", SESSION_ENVIRONMENT))),
+    "delivery_date": (iso_date,),
+    "credit_days": (integer(minimum=0, maximum=365),),
+    "payment_term": (choice(*PAYMENT_TERMS),),
+    "cc_charge": (choice("Included", "Excluded"),),
+    "discount_on": (choice("Before", "After"),),
+    "tax_on_free_active": (boolean,),
+    "catalogue": (required, master(catalogue_directory(SESSION_ENVIRONMENT))),
+    "unit_quantity": (required, integer(minimum=1)),
+    "unit_bonus": (integer(minimum=0),),
+    "tax": (percent,),
+}
+
 
 def collect_inputs(use_faker=True):
     """Collect all Purchase Order fields dynamically or generate with Faker."""
@@ -24,16 +58,19 @@ def collect_inputs(use_faker=True):
     if use_faker:
         print("[INFO] Generating fake data using Faker...")
 
-        data['supplier'] = fake.company()
+        # Real suppliers when a directory has been cached, so generated records can be saved
+        suppliers = get_directory("suppliers", SESSION_ENVIRONMENT).labels()
+        data['supplier'] = fake.random_element(elements=suppliers) if suppliers else fake.company()
         data['store'] = fake.city()
         data['delivery_date'] = fake.date_this_year().strftime("%Y-%m-%d")
         data['prepared_by'] = fake.name()
         data['credit_days'] = str(fake.random_element(elements=("30", "60", "90", "120")))
-        data['payment_term'] = fake.random_element(elements=("CASH", "BT", "AFDL"))
+        data['payment_term'] = fake.random_element(elements=PAYMENT_TERMS)
         data['cc_charge'] = fake.random_element(elements=("Included", "Excluded"))
         data['discount_on'] = fake.random_element(elements=("Before", "After"))
         data['tax_on_free_active'] = fake.boolean(chance_of_getting_true=50)
-        data['catalogue'] = fake.word().capitalize()
+        items = catalogue_directory(SESSION_ENVIRONMENT).labels()
+        data['catalogue'] = fake.random_element(elements=items) if items else fake.word().capitalize()
         data['unit_quantity'] = str(fake.random_int(min=1, max=50))
         data['unit_bonus'] = str(fake.random_int(min=0, max=10))
         data['tax'] = f"{round(random.uniform(0, 13), 1)}%"
@@ -66,32 +103,143 @@ def collect_inputs(use_faker=True):
         print(f"  {key}: {val}")
 
     return data
-class PurchaseOrder(BaseCanteenAutomation):
 
-    def load_dashboard(self, input_data=None):
-        """Load dashboard and fill Purchase Order dynamically from input_data dict."""
+# ----------------------------------------------------------------------
+#  Bulk header fill
+# ----------------------------------------------------------------------
+# (input key, target, kind, per-field fallback method). Multiselects are not
+# plain inputs and keep going through VueMultiselect.
+HEADER_FIELDS = [
+    ("delivery_date", {"id": "delivery_date", "enter": True}, "input", "delivery_date_fun"),
+    ("prepared_by", {"id": "prepared_by", "enter": True}, "input", "prepared_by_fun"),
+    ("credit_days", {"id": "credit_days"}, "select", "Credit_days_fun"),
+    ("payment_term", {"id": "payment_term"}, "select_text", "Payment_term_fun"),
+    ("tax_on_free_active", {"id": "tax_on_free_active"}, "checkbox", "tick_checkbox"),
+]
+# The footer textareas are only filled after the item line is added, as in the
+# per-field flow, so they go in a second call after click_add_btn.
+FOOTER_FIELDS = [
+    ("terms_condition", {"label": "Terms And Conditions"}, "textarea", "terms_condition"),
+    ("last_remarks", {"label": "Remarks"}, "textarea", "last_remarks"),
+]
+
+# Sets every field, dispatches the input/change events v-model listens to, lets
+# Vue flush its update queue, then reads all values back. Returns
+# {key: {"ok": bool, "value": ..., "error": ...}}.
+BULK_FILL_SCRIPT = """
+const fields = arguments[0], done = arguments[arguments.length - 1];
+const results = {};
+
+function find(target) {
+    if (target.id) { return document.getElementById(target.id); }
+    for (const label of document.querySelectorAll('label')) {
+        if (label.textContent.indexOf(target.label) === -1) { continue; }
+        let el = label.nextElementSibling;
+        while (el && el.tagName !== 'TEXTAREA') { el = el.nextElementSibling; }
+        if (el) { return el; }
+    }
+    return null;
+}
+
+function fire(el, names) {
+    names.forEach(n => el.dispatchEvent(new Event(n, {bubbles: true})));
+}
+
+const found = [];
+for (const f of fields) {
+    const el = find(f.target);
+    if (!el) { results[f.key] = {ok: false, error: 'element not found'}; continue; }
+    if (f.kind === 'checkbox') {
+        if (!el.checked) { el.click(); }
+    } else if (f.kind === 'select_text') {
+        const opt = Array.from(el.options).find(o => o.text.trim().toUpperCase() === String(f.value).toUpperCase());
+        if (!opt) { results[f.key] = {ok: false, error: 'no matching option'}; continue; }
+        el.value = opt.value;
+        fire(el, ['input', 'change']);
+    } else {
+        el.value = f.value;
+        fire(el, ['input', 'change']);
+        if (f.target.enter) { el.dispatchEvent(new KeyboardEvent('keydown', {key: 'Enter', bubbles: true})); }
+    }
+    found.push([f, el]);
+}
+
+setTimeout(function () {
+    for (const [f, el] of found) {
+        let value, ok;
+        if (f.kind === 'checkbox') { value = el.checked; ok = value === true; }
+        else if (f.kind === 'select_text') {
+            value = el.selectedIndex >= 0 ? el.options[el.selectedIndex].text.trim() : '';
+            ok = value.toUpperCase() === String(f.value).toUpperCase();
+        } else { value = el.value; ok = value === String(f.value); }
+        results[f.key] = {ok: ok, value: value};
+    }
+    done(results);
+}, 0);
+"""
+
+
+class PurchaseOrder(BaseAutomation):
+
+    def load_dashboard(self, input_data=None, bulk_fill=False):
+        """
+        Load dashboard and fill Purchase Order dynamically from input_data dict.
+        With bulk_fill=True the plain header fields, and after Add the footer textareas,
+        are each set in one script call (see bulk_fill_fields).
+        Returns True when every step completed without logging an error.
+        """
+        self.errors = []
         try:
             self.init_driver()
             self.login()
             self.log("Dashboard loaded.")
-            time.sleep(2)
-            self.go_to_purchase_order()
-            self.open_add_purchase_order_page()
-            time.sleep(3)
+            self.pause(2)
+            self.create_purchase_order(input_data, bulk_fill)
+
+        except Exception as e:
+            self.log_error(f"Error loading dashboard: {e}")
+            traceback.print_exc()
+        finally:
+            self.pause(2)
+            self.quit()
+        return not self.errors
+
+
+    def create_purchase_order(self, input_data=None, bulk_fill=False):
+        """
+        Open a blank Purchase Order form, fill it and save it, on an already logged-in
+        bot. When a previous job already reached the PO form, the form is reloaded by
+        URL instead of going through the sidebar and the list page again.
+        Returns True only when every step, including the save, completed without an error.
+        """
+        self.errors = []
+        try:
+            if self.page_state.get("page") == "purchase_order_form":
+                self.driver.get(PURCHASE_ORDER_CREATE_URL)
+                self.log("Reloaded a blank Purchase Order form.")
+            else:
+                self.go_to_purchase_order()
+                self.open_add_purchase_order_page()
+            self.wait_until(input_enabled((By.ID, "delivery_date")), timeout=15)
+            self.page_state = {"page": "purchase_order_form"}
+            self.pause(3)
 
             if input_data:
                 self.select_supplier(input_data.get('supplier'))
                 self.select_store(input_data.get('store'))
-                time.sleep(1)
-                self.delivery_date_fun(input_data.get('delivery_date'))
-                self.prepared_by_fun(input_data.get('prepared_by'))
-                self.Credit_days_fun(input_data.get('credit_days'))
-                self.Payment_term_fun(input_data.get('payment_term'))
+                self.pause(1)
+                if bulk_fill:
+                    self.bulk_fill_header(input_data)
+                else:
+                    self.delivery_date_fun(input_data.get('delivery_date'))
+                    self.prepared_by_fun(input_data.get('prepared_by'))
+                    self.Credit_days_fun(input_data.get('credit_days'))
+                    self.Payment_term_fun(input_data.get('payment_term'))
                 self.select_cc_charge(input_data.get('cc_charge'))
                 self.select_discount_on(input_data.get('discount_on'))
 
                 # Handle checkbox
-                if input_data.get('tax_on_free_active'):
+                if input_data.get('tax_on_free_active') and not bulk_fill:
                     self.tick_checkbox("tax_on_free_active")
 
                 self.select_catalogue(input_data.get('catalogue'))
@@ -100,17 +248,68 @@ class PurchaseOrder(BaseCanteenAutomation):
                 self.tax(input_data.get('tax'))
                 self.remarks(input_data.get('remarks'))
                 self.click_add_btn()
-                self.terms_condition(input_data.get('terms_condition'))
-                self.last_remarks(input_data.get('last_remarks'))
+                if bulk_fill:
+                    self.bulk_fill_footer(input_data)
+                else:
+                    self.terms_condition(input_data.get('terms_condition'))
+                    self.last_remarks(input_data.get('last_remarks'))
+                if not self.errors:
+                    self.save_purchase_order()
             else:
                 self.log("No input_data provided; skipping dynamic form filling.")
 
         except Exception as e:
-            self.log(f"Error loading dashboard: {e}")
+            self.log_error(f"Error creating purchase order: {e}")
             traceback.print_exc()
-        finally:
-            time.sleep(2)
-            self.quit()
+        return not self.errors
+
+
+    def bulk_fill_header(self, input_data):
+        """
+        Set delivery date, prepared by, credit days, payment term and the tax-on-free
+        checkbox in one script call (see bulk_fill_fields).
+        """
+        return self.bulk_fill_fields(input_data, HEADER_FIELDS, "Header")
+
+
+    def bulk_fill_footer(self, input_data):
+        """Set both footer textareas in one script call, after the item line was added."""
+        return self.bulk_fill_fields(input_data, FOOTER_FIELDS, "Footer")
+
+
+    def bulk_fill_fields(self, input_data, spec, section):
+        """
+        Set the fields of `spec` in one script call, then fall back to the per-field
+        method for any field that is missing or did not read back as sent.
+        Returns the keys that needed the fallback.
+        """
+        fields = [
+            {"key": key, "target": target, "kind": kind, "value": input_data.get(key)}
+            for key, target, kind, _ in spec
+            if input_data.get(key) not in (None, "", False)
+        ]
+        self.log(f"Bulk filling {len(fields)} {section.lower()} fields.")
+        try:
+            results = self.driver.execute_async_script(BULK_FILL_SCRIPT, fields)
+        except Exception as e:
+            self.log(f"Bulk fill failed, filling fields one by one: {e}", level="warning")
+            results = {}
+
+        fallbacks = {key: method for key, _, _, method in spec}
+        retried = []
+        for field in fields:
+            result = results.get(field["key"], {"ok": False, "error": "not attempted"})
+            if result.get("ok"):
+                continue
+            self.log(f"Bulk fill mismatch for '{field['key']}' ({result.get('error') or result.get('value')!r}); "
+                     f"retrying with {fallbacks[field['key']]}.", level="warning")
+            retried.append(field["key"])
+            if field["kind"] == "checkbox":
+                self.tick_checkbox(field["target"]["id"])
+            else:
+                getattr(self, fallbacks[field["key"]])(field["value"])
+        self.log(f"{section} filled ({len(fields) - len(retried)} in bulk, {len(retried)} per field).")
+        return retried
 
 
 
@@ -124,7 +323,7 @@ class PurchaseOrder(BaseCanteenAutomation):
                 if toggle_button.get_attribute("aria-expanded") == "false":
                     toggle_button.click()
                     self.log("Sidebar expanded.")
-                    time.sleep(1)
+                    self.pause(1)
             except Exception:
                 self.log("Sidebar toggle not found or already expanded.")
             purchase_order_link = WebDriverWait(self.driver, 15).until(
@@ -132,10 +331,10 @@ class PurchaseOrder(BaseCanteenAutomation):
             )
             purchase_order_link.click()
             self.log("Navigated to Purchase Order page.")
-            time.sleep(3)
+            self.pause(3)
 
         except Exception as e:
-            self.log(f"Error navigating to Purchase Order: {e}")
+            self.log_error(f"Error navigating to Purchase Order: {e}")
             traceback.print_exc()
 
 
@@ -154,77 +353,38 @@ class PurchaseOrder(BaseCanteenAutomation):
                 EC.url_contains("/phar/pharmacy/purchase_order/create")
             )
             self.log("Purchase Order page loaded successfully.")
-            time.sleep(1)
+            self.pause(1)
 
         except Exception as e:
-            self.log(f"Error opening Add Purchase Order page: {e}")
+            self.log_error(f"Error opening Add Purchase Order page: {e}")
             traceback.print_exc()
 
 
     def select_supplier(self, supplier_name):
-        """Select a supplier by typing and pressing ENTER."""
+        """Resolve the exact supplier label from the supplier directory, then select it."""
         try:
             self.log(f"Selecting supplier: {supplier_name}")
-            multiselect_span = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable(
-                    (By.XPATH, "//div[@class='multiselect custom-widthed-multiselect']//div[@class='multiselect__tags']")
-                )
-            )
-            multiselect_span.click()
-            self.log("Clicked multiselect span to activate input.")
-            time.sleep(0.5)
-            input_field = self.driver.find_element(
-                By.XPATH,
-                "//div[@class='multiselect custom-widthed-multiselect']//input[@name='supplier']"
-            )
-            self.driver.execute_script("arguments[0].focus();", input_field)
-            time.sleep(0.2)
-            input_field.send_keys(supplier_name)
-            time.sleep(0.5)
-
-            input_field.send_keys(Keys.ENTER)
-            self.log(f"Supplier '{supplier_name}' selected successfully via typing.")
-            time.sleep(0.5)
+            label = self.resolve_option("suppliers", SUPPLIER_TARGET, supplier_name)
+            VueMultiselect(self.driver).select(SUPPLIER_TARGET, label)
+            self.log(f"Supplier '{label}' selected successfully.")
+            self.pause(0.5)
 
         except Exception as e:
-            self.log(f"Error selecting supplier: {e}")
+            self.log_error(f"Error selecting supplier: {e}")
             traceback.print_exc()
 
 
     def select_store(self, store_name):
-        """Select a store from the multiselect dropdown."""
+        """Resolve the exact store label from the store directory, then select it."""
         try:
             self.log(f"Selecting store: {store_name}")
-
-            wait = WebDriverWait(self.driver, 10)
-
-            store_dropdown = wait.until(
-                EC.element_to_be_clickable((
-                    By.XPATH,
-                    "//label[contains(., 'Store')]/following::div[contains(@class, 'multiselect')][1]"
-                ))
-            )
-            store_dropdown.click()
-            self.log("Clicked on store dropdown to open options.")
-            time.sleep(0.5)
-
-            store_input = wait.until(
-                EC.presence_of_element_located((
-                    By.XPATH,
-                    "//input[@class='multiselect__input' and @placeholder='Select Store']"
-                ))
-            )
-            self.driver.execute_script("arguments[0].focus();", store_input)
-            time.sleep(0.2)
-
-            store_input.send_keys(store_name)
-            time.sleep(0.5)
-            store_input.send_keys(Keys.ENTER)
-            self.log(f"Store '{store_name}' selected successfully.")
-            time.sleep(0.5)
+            label = self.resolve_option("stores", STORE_TARGET, store_name)
+            VueMultiselect(self.driver).select(STORE_TARGET, label)
+            self.log(f"Store '{label}' selected successfully.")
+            self.pause(0.5)
 
         except Exception as e:
-            self.log(f"Error selecting store: {e}")
+            self.log_error(f"Error selecting store: {e}")
             traceback.print_exc()
 
 
@@ -250,10 +410,10 @@ class PurchaseOrder(BaseCanteenAutomation):
                 delivery_input
             )
             self.log(f"Delivery date set to: {delivery_date}")
-            time.sleep(0.5)
+            self.pause(0.5)
 
         except Exception as e:
-            self.log(f"Error selecting delivery date: {e}")
+            self.log_error(f"Error selecting delivery date: {e}")
             traceback.print_exc()
 
 
@@ -274,7 +434,7 @@ class PurchaseOrder(BaseCanteenAutomation):
                 el.dispatchEvent(new Event('input', { bubbles: true }));
                 el.dispatchEvent(new Event('change', { bubbles: true }));
             """, prepared_input)
-            time.sleep(0.2)
+            self.pause(0.2)
 
             # Type the new value
             prepared_input.send_keys(prepared_name)
@@ -283,14 +443,14 @@ class PurchaseOrder(BaseCanteenAutomation):
                 el.dispatchEvent(new Event('input', { bubbles: true }));
                 el.dispatchEvent(new Event('change', { bubbles: true }));
             """, prepared_input)
-            time.sleep(0.2)
+            self.pause(0.2)
 
             # Press Enter
             prepared_input.send_keys(Keys.ENTER)
             self.log(f"'Prepared By' set successfully: {prepared_name}")
 
         except Exception as e:
-            self.log(f"Error setting 'Prepared By': {e}")
+            self.log_error(f"Error setting 'Prepared By': {e}")
             traceback.print_exc()
 
 
@@ -306,9 +466,9 @@ class PurchaseOrder(BaseCanteenAutomation):
 
             # Scroll into view and click
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", select_element)
-            time.sleep(0.2)
+            self.pause(0.2)
             select_element.click()  # ensures focus and dropdown opens
-            time.sleep(0.2)
+            self.pause(0.2)
 
             # Set value via JS for Vue reactivity
             self.driver.execute_script("""
@@ -322,7 +482,7 @@ class PurchaseOrder(BaseCanteenAutomation):
             self.log(f"Credit days successfully set to: {Credit_days}")
 
         except Exception as e:
-            self.log(f"Error selecting credit days: {e}")
+            self.log_error(f"Error selecting credit days: {e}")
             traceback.print_exc()
 
 
@@ -340,7 +500,7 @@ class PurchaseOrder(BaseCanteenAutomation):
 
             # Scroll into view
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", select_element)
-            time.sleep(0.2)
+            self.pause(0.2)
 
             # Map visible text to option value
             options = select_element.find_elements(By.TAG_NAME, "option")
@@ -364,10 +524,10 @@ class PurchaseOrder(BaseCanteenAutomation):
 
             self.log(f"Payment Term successfully set to: {visible_text}")
 
-            time.sleep(0.3)
+            self.pause(0.3)
 
         except Exception as e:
-            self.log(f"Error setting Payment Term: {e}")
+            self.log_error(f"Error setting Payment Term: {e}")
             traceback.print_exc()
 
 
@@ -375,77 +535,25 @@ class PurchaseOrder(BaseCanteenAutomation):
         """Select a CC Charge from the multiselect dropdown."""
         try:
             self.log(f"Selecting CC Charge: {cc_value}")
-
-            wait = WebDriverWait(self.driver, 10)
-
-            # Step 1: Click the multiselect container
-            cc_dropdown = wait.until(
-                EC.element_to_be_clickable((
-                    By.XPATH,
-                    "//label[contains(., 'CC Charge')]/following::div[contains(@class, 'multiselect')][1]"
-                ))
-            )
-            cc_dropdown.click()
-            time.sleep(0.3)
-
-            # Step 2: Locate the input inside the container
-            cc_input = cc_dropdown.find_element(By.CSS_SELECTOR, "input.multiselect__input")
-            self.driver.execute_script("arguments[0].focus();", cc_input)
-            time.sleep(0.2)
-
-            # Step 3: Type value and press Enter
-            cc_input.send_keys(cc_value)
-            time.sleep(0.5)
-            cc_input.send_keys(Keys.ENTER)
-
+            VueMultiselect(self.driver).select({"label": "CC Charge"}, cc_value)
             self.log(f"CC Charge '{cc_value}' selected successfully.")
-            time.sleep(0.5)
+            self.pause(0.5)
 
         except Exception as e:
-            self.log(f"Error selecting CC Charge: {e}")
+            self.log_error(f"Error selecting CC Charge: {e}")
             traceback.print_exc()
 
 
     def select_discount_on(self, discount_value):
-        """Select a value from the 'Discount On' multiselect dropdown (Vue version)."""
+        """Select a value from the 'Discount On' multiselect dropdown (case-insensitive contains match)."""
         try:
             self.log(f"Selecting Discount On: {discount_value}")
-
-            wait = WebDriverWait(self.driver, 10)
-
-            # Step 1: Click the input field directly (instead of parent span)
-            discount_input = wait.until(
-                EC.element_to_be_clickable((By.ID, "discount_on"))
-            )
-            self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", discount_input)
-            discount_input.click()
-            time.sleep(0.3)
-
-            # Step 2: Type the desired value
-            discount_input.clear()
-            discount_input.send_keys(discount_value)
-            time.sleep(0.5)
-
-            # Step 3: Wait for dropdown options and pick match
-            options = wait.until(
-                EC.presence_of_all_elements_located((By.XPATH, "//span[contains(@class,'multiselect__option')]"))
-            )
-
-            matched = False
-            for opt in options:
-                if discount_value.lower() in opt.text.strip().lower():
-                    opt.click()
-                    matched = True
-                    break
-
-            if not matched:
-                raise Exception(f"Discount On option '{discount_value}' not found.")
-
+            VueMultiselect(self.driver).select({"input_id": "discount_on"}, discount_value, match="contains")
             self.log(f"Discount On '{discount_value}' selected successfully.")
-            time.sleep(0.5)
+            self.pause(0.5)
 
         except Exception as e:
-            self.log(f"Error selecting Discount On: {e}")
+            self.log_error(f"Error selecting Discount On: {e}")
             traceback.print_exc()
 
 
@@ -473,53 +581,29 @@ class PurchaseOrder(BaseCanteenAutomation):
             else:
                 self.log(f"Checkbox '{checkbox_id}' was already ticked.")
 
-            time.sleep(0.3)
+            self.pause(0.3)
 
         except Exception as e:
-            self.log(f"Error ticking checkbox '{checkbox_id}': {e}")
+            self.log_error(f"Error ticking checkbox '{checkbox_id}': {e}")
             traceback.print_exc()
 
 
     def select_catalogue(self, catalogue_name):
-        """Select a catalogue from the Vue multiselect dropdown where Enter key is required."""
+        """
+        Resolve the catalogue item (code, name or label) from the local catalogue
+        index, type its unique code and pick the exact option as soon as it renders.
+        """
         try:
             self.log(f"Selecting catalogue: {catalogue_name}")
-
-            wait = WebDriverWait(self.driver, 10)
-
-            # Step 1: Click the multiselect container to open dropdown
-            catalogue_dropdown = wait.until(
-                EC.element_to_be_clickable((
-                    By.CSS_SELECTOR,
-                    "div.input-group.custom-widthed-multiselect div.multiselect__tags"
-                ))
-            )
-            self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", catalogue_dropdown)
-            time.sleep(1)
-            catalogue_dropdown.click()
-            self.log("Clicked on catalogue dropdown to open options.")
-            time.sleep(0.5)
-
-            # Step 2: Focus on the input field inside the dropdown
-            catalogue_input = wait.until(
-                EC.presence_of_element_located((
-                    By.CSS_SELECTOR,
-                    "div.input-group.custom-widthed-multiselect input[placeholder='Select Catalogue']"
-                ))
-            )
-            self.driver.execute_script("arguments[0].focus();", catalogue_input)
-            time.sleep(0.2)
-
-            # Step 3: Type catalogue name and press Enter
-            catalogue_input.clear()
-            catalogue_input.send_keys(catalogue_name)
-            time.sleep(2)
-
-            catalogue_input.send_keys(Keys.ENTER)
-            self.log(f"Catalogue '{catalogue_name}' selected successfully.")
-            time.sleep(0.5)
+            item = self.resolve_item(catalogue_name)
+            if item:
+                label = VueMultiselect(self.driver).select(CATALOGUE_TARGET, item.label, query=item.code or item.label)
+            else:
+                label = VueMultiselect(self.driver).select(CATALOGUE_TARGET, catalogue_name, match="prefix")
+            self.log(f"Catalogue '{label}' selected successfully.")
+            self.wait_for_network_idle()  # item details (unit, rate) load after selection
         except Exception as e:
-            self.log(f"Error selecting catalogue: {e}")
+            self.log_error(f"Error selecting catalogue: {e}")
             traceback.print_exc()
 
 
@@ -539,16 +623,15 @@ class PurchaseOrder(BaseCanteenAutomation):
                 EC.presence_of_element_located((By.ID, "selected_in_box"))
             )
             self.driver.execute_script("arguments[0].focus();", unit_input)
-
-
+            unit_input.clear()
             unit_input.send_keys(unit_value)
-            time.sleep(0.5)
+            self.wait_until(input_value((By.ID, "selected_in_box"), unit_value), timeout=5, poll=0.1)
             unit_input.send_keys(Keys.ENTER)
 
             self.log(f"Unit '{unit_value}' selected successfully.")
-            time.sleep(0.5)
+            self.pause(0.5)
         except Exception as e:
-            self.log(f"Error setting unit: {e}")
+            self.log_error(f"Error setting unit: {e}")
             traceback.print_exc()
 
 
@@ -568,12 +651,12 @@ class PurchaseOrder(BaseCanteenAutomation):
             self.driver.execute_script("arguments[0].focus();", unit_input)
             unit_input.clear()
             unit_input.send_keys(unit_bonus_value)
-            time.sleep(2)
+            self.wait_until(input_value((By.ID, "selected_unit_bonus"), unit_bonus_value), timeout=5, poll=0.1)
             unit_input.send_keys(Keys.ENTER)
             self.log(f"Unit '{unit_bonus_value}' selected successfully.")
-            time.sleep(2)
+            self.pause(2)
         except Exception as e:
-            self.log(f"Error setting unit: {e}")
+            self.log_error(f"Error setting unit: {e}")
             traceback.print_exc()
 
 
@@ -593,12 +676,12 @@ class PurchaseOrder(BaseCanteenAutomation):
             self.driver.execute_script("arguments[0].focus();", tax_input)
             tax_input.clear() 
             tax_input.send_keys(tax_value)
-            time.sleep(0.5)
+            self.wait_until(input_value((By.ID, "selected_item_tax"), tax_value), timeout=5, poll=0.1)
             tax_input.send_keys(Keys.ENTER)
             self.log(f"Tax '{tax_value}' selected successfully.")
-            time.sleep(0.5)
+            self.pause(0.5)
         except Exception as e:
-            self.log(f"Error setting tax: {e}")
+            self.log_error(f"Error setting tax: {e}")
             traceback.print_exc()
 
 
@@ -614,11 +697,11 @@ class PurchaseOrder(BaseCanteenAutomation):
             self.driver.execute_script("arguments[0].focus();", remarks_input)
             remarks_input.clear()
             remarks_input.send_keys(remarks_value)
-            time.sleep(0.5)
+            self.pause(0.5)
             self.log(f"Remarks '{remarks_value}' entered successfully.")
-            time.sleep(0.5)
+            self.pause(0.5)
         except Exception as e:
-            self.log(f"Error setting remarks: {e}")
+            self.log_error(f"Error setting remarks: {e}")
             traceback.print_exc()
 
 
@@ -634,9 +717,27 @@ class PurchaseOrder(BaseCanteenAutomation):
             )
             add_button.click()
             self.log("Add button clicked successfully.")
-            time.sleep(1)
+            self.pause(1)
+        except Exception as e:
+            self.log_error(f"Error clicking Add button: {e}")
+            traceback.print_exc()
+
+
+    def save_purchase_order(self):
+        """
+        Click Save and wait for the store request to redirect away from the create
+        page. A form that stays on /create (validation errors) is logged as an error.
+        """
+        try:
+            self.log("Saving purchase order.")
+            wait = WebDriverWait(self.driver, 5)
+            save_button = wait.until(EC.element_to_be_clickable((By.XPATH, SAVE_BUTTON)))
+            self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", save_button)
+            save_button.click()
+            self.wait_until(url_left(SAVED_URL_LEAVES), timeout=20)
+            self.log("Purchase order saved.")
         except Exception as e:
-            self.log(f"Error clicking Add button: {e}")
+            self.log_error(f"Error saving purchase order: {e}")
             traceback.print_exc()
 
 
@@ -657,12 +758,12 @@ class PurchaseOrder(BaseCanteenAutomation):
             self.driver.execute_script("arguments[0].focus();", terms_input)
             terms_input.clear()
             terms_input.send_keys(terms_value)
-            time.sleep(0.5)
+            self.pause(0.5)
             self.log(f"Terms and Conditions entered successfully.")
-            time.sleep(0.5)
+            self.pause(0.5)
 
         except Exception as e:
-            self.log(f"Error setting Terms and Conditions: {e}")
+            self.log_error(f"Error setting Terms and Conditions: {e}")
             traceback.print_exc()
             
 
@@ -683,12 +784,12 @@ class PurchaseOrder(BaseCanteenAutomation):
             self.driver.execute_script("arguments[0].focus();", remarks_input)
             remarks_input.clear()
             remarks_input.send_keys(remarks_value)
-            time.sleep(0.5)
+            self.pause(0.5)
             self.log(f"Remarks entered successfully.")
-            time.sleep(0.5)
+            self.pause(0.5)
 
         except Exception as e:
-            self.log(f"Error setting Remarks: {e}")
+            self.log_error(f"Error setting Remarks: {e}")
             traceback.print_exc()
 
 
@@ -699,11 +800,12 @@ if __name__ == "__main__":
     bot = PurchaseOrder(username, password)
 
     # ✅ Choose whether to use Faker or manual input
-    choice = input("Use Faker data? (yes/no): ").strip().lower()
-    use_faker = choice in ['yes', 'y']
+    answer = input("Use Faker data? (yes/no): ").strip().lower()
+    use_faker = answer in ['yes', 'y']
 
     # ✅ Collect input data
     input_data = collect_inputs(use_faker=use_faker)
 
     # ✅ Run dashboard with input data
-    bot.load_dashboard(input_data)
\ No newline at end of file
+    bot.load_dashboard(input_data)
+    print(METRICS.format_summary())
@@ -0,0 +1,277 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Adjust system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.core_setup import BASE_URL, create_driver_pool
+from core.metrics import METRICS
+from core.session_store import SessionStore
+from Purchase_Order.purchase_order_filter import PurchaseOrder
+from Purchase_Order.sharded_query import query_purchase_orders
+
+PURCHASE_ORDER_DETAIL_URL = f"{BASE_URL}/phar/pharmacy/purchase_order/{{id}}"
+DETAIL_CACHE = "po_details.sqlite"
+DEFAULT_TABS = 4
+
+
+# ----------------------------------------------------------------------
+#  Detail Cache: parsed PO details keyed by po_number + last-modified marker
+# ----------------------------------------------------------------------
+class DetailCache:
+    def __init__(self, path=DETAIL_CACHE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS purchase_order_details (
+                po_number TEXT PRIMARY KEY,
+                updated_at TEXT,
+                detail TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS crawl_meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        self._db.commit()
+
+    def markers(self):
+        """{po_number: updated_at} for every cached PO."""
+        with self._lock:
+            return dict(self._db.execute("SELECT po_number, updated_at FROM purchase_order_details"))
+
+    def get(self, po_number):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT detail FROM purchase_order_details WHERE po_number = ?", (po_number,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, po_number, updated_at, detail):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO purchase_order_details VALUES (?, ?, ?, ?)",
+                (po_number, updated_at, json.dumps(detail, default=str), time.time()))
+            self._db.commit()
+
+    @property
+    def watermark(self):
+        """Newest last-modified marker stored so far."""
+        with self._lock:
+            row = self._db.execute("SELECT value FROM crawl_meta WHERE key = 'watermark'").fetchone()
+        return row[0] if row else None
+
+    def advance_watermark(self):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO crawl_meta "
+                "SELECT 'watermark', MAX(updated_at) FROM purchase_order_details")
+            self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+def marker(row):
+    """Last-modified marker of a list row as text ('' when the table has none)."""
+    value = row.get("updated_at")
+    return str(value) if value is not None else ""
+
+
+def listing_start(from_date, watermark):
+    """
+    First order date to list: `from_date`, or the watermark's date when that is
+    later, so a repeat crawl only pages through POs from the last crawl onwards.
+    """
+    if not watermark:
+        return from_date
+    return max(from_date, str(watermark)[:10])
+
+
+def needs_fetch(row, markers):
+    """New POs, and cached ones whose list row shows a newer last-modified marker."""
+    cached = markers.get(row.get("po_number"))
+    if cached is None:
+        return True
+    return marker(row) > (cached or "")
+
+
+# ----------------------------------------------------------------------
+#  Tab fetcher: open a batch of detail pages in parallel tabs of one driver
+# ----------------------------------------------------------------------
+# Two-column th/td rows become fields; tables with a <thead> become lists
+# of row dicts keyed by header text.
+DETAIL_SCRIPT = """
+const out = {url: location.href, name: window.name, fields: {}, tables: []};
+document.querySelectorAll('table').forEach(function (t) {
+    const head = t.querySelector('thead');
+    if (head) {
+        const keys = Array.from(head.querySelectorAll('th')).map(th => th.textContent.trim());
+        out.tables.push(Array.from(t.querySelectorAll('tbody tr')).map(function (tr) {
+            const row = {};
+            Array.from(tr.children).forEach((td, i) => row[keys[i] || ('column_' + i)] = td.textContent.trim());
+            return row;
+        }));
+    } else {
+        t.querySelectorAll('tr').forEach(function (tr) {
+            const th = tr.querySelector('th'), td = tr.querySelector('td');
+            if (th && td) { out.fields[th.textContent.trim()] = td.textContent.trim(); }
+        });
+    }
+});
+return out;
+"""
+
+
+def fetch_details(driver, rows, timeout=30):
+    """
+    Open every row's detail page in its own tab at once, then parse each tab.
+    Returns {id: detail or None}; None means the page did not load as a PO
+    (including a tab that timed out). Every opened tab is closed and the driver
+    is always switched back to the main window.
+    """
+    main = driver.current_window_handle
+    before = set(driver.window_handles)
+    names = {f"po-detail-{i}": row for i, row in enumerate(rows)}
+    results = {row["id"]: None for row in rows}
+    try:
+        driver.execute_script(
+            "for (const [name, url] of arguments[0]) { window.open(url, name); }",
+            [[name, PURCHASE_ORDER_DETAIL_URL.format(id=row["id"])] for name, row in names.items()])
+        for handle in [h for h in driver.window_handles if h not in before]:
+            driver.switch_to.window(handle)
+            try:
+                WebDriverWait(driver, timeout).until(lambda d: d.execute_script(
+                    "return location.href !== 'about:blank' && document.readyState === 'complete'"))
+                page = driver.execute_script(DETAIL_SCRIPT)
+                row = names.get(page["name"])
+                if row and "login" not in page["url"]:
+                    results[row["id"]] = {"fields": page["fields"], "tables": page["tables"]}
+            except (TimeoutException, WebDriverException):
+                pass  # left as None: the row is counted as failed and retried on the next crawl
+            finally:
+                driver.close()
+    finally:
+        driver.switch_to.window(main)
+    return results
+
+
+# ----------------------------------------------------------------------
+#  Crawler
+# ----------------------------------------------------------------------
+class DetailCrawler:
+    """Fetch details for new/changed POs on `workers` sessions, `tabs` pages at a time each."""
+
+    def __init__(self, username, password, cache, workers=2, tabs=DEFAULT_TABS, pacing="fast", profile="lean",
+                 session_dir=".sessions"):
+        self.username = username
+        self.password = password
+        self.cache = cache
+        self.workers = workers
+        self.tabs = tabs
+        self.pacing = pacing
+        self.profile = profile
+        self.session_dir = session_dir
+        self.stats = {"listed": 0, "skipped": 0, "fetched": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+
+    def crawl(self, pages):
+        """Crawl the rows of `pages` (from query_purchase_orders) and return the stats."""
+        markers = self.cache.markers()
+        todo = []
+        for rows in pages:
+            for row in rows:
+                self.stats["listed"] += 1
+                # the cache is keyed by po_number, so rows without one cannot be stored
+                if row.get("id") is None or not row.get("po_number") or not needs_fetch(row, markers):
+                    self.stats["skipped"] += 1
+                else:
+                    todo.append({"id": row["id"], "po_number": row.get("po_number"), "updated_at": marker(row)})
+        print(f"{self.stats['listed']} listed, {len(todo)} new or changed since watermark {self.cache.watermark}")
+        if todo:
+            pool = create_driver_pool(min(self.workers, len(todo)), self.profile)
+            store = SessionStore(self.session_dir)
+            try:
+                with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                    futures = [executor.submit(self._work, todo[w::self.workers], pool, store, w)
+                               for w in range(self.workers)]
+                    for future in futures:
+                        future.result()
+            finally:
+                pool.close()
+                self.cache.advance_watermark()  # details stored before a failure still count
+        return self.stats
+
+    def _work(self, rows, pool, store, worker):
+        """One session working through its share of rows, `tabs` at a time."""
+        if not rows:
+            return
+        bot = PurchaseOrder(self.username, self.password, driver_pool=pool, session_store=store,
+                            pacing=self.pacing, profile=self.profile, job_id=f"detail-{worker}")
+        try:
+            bot.init_driver()
+            bot.login()
+            for i in range(0, len(rows), self.tabs):
+                batch = rows[i:i + self.tabs]
+                started = time.perf_counter()
+                results = fetch_details(bot.driver, batch)
+                METRICS.record("DetailCrawler", "fetch_details", time.perf_counter() - started)
+                for row in batch:
+                    detail = results.get(row["id"])
+                    if detail is None:
+                        bot.log(f"Detail page for {row['po_number']} did not load.", level="warning")
+                    else:
+                        self.cache.put(row["po_number"], row["updated_at"], detail)
+                    with self._stats_lock:
+                        self.stats["fetched" if detail is not None else "failed"] += 1
+        finally:
+            bot.quit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cache Purchase Order details, fetching only new or changed POs.")
+    parser.add_argument("from_date", help="YYYY-MM-DD")
+    parser.add_argument("to_date", help="YYYY-MM-DD")
+    parser.add_argument("--cache", default=DETAIL_CACHE, help="SQLite cache file.")
+    parser.add_argument("--status", default="All", help="Requisition status filter.")
+    parser.add_argument("-w", "--workers", type=int, default=2, help="Parallel browser sessions.")
+    parser.add_argument("--tabs", type=int, default=DEFAULT_TABS, help="Detail pages opened at once per session.")
+    parser.add_argument("--shard-days", type=int, default=0, help="Query the list as parallel date shards.")
+    parser.add_argument("--full", action="store_true",
+                        help="List the whole date range instead of starting at the cache watermark "
+                             "(picks up edits to POs ordered before the last crawl).")
+    parser.add_argument("--pacing", default="fast", help="Pacing profile (demo/fast).")
+    parser.add_argument("--profile", default="lean", help="Chrome profile (default/lean).")
+    parser.add_argument("--username", default=os.environ.get("DOLPHIN_USERNAME"))
+    parser.add_argument("--password", default=os.environ.get("DOLPHIN_PASSWORD"))
+    args = parser.parse_args()
+    if args.shard_days < 0:
+        parser.error("--shard-days must be 0 (no sharding) or at least 1")
+
+    username = args.username or input("Enter your username: ")
+    password = args.password or input("Enter your password: ")
+
+    cache = DetailCache(args.cache)
+    started = time.perf_counter()
+    try:
+        from_date = args.from_date if args.full else listing_start(args.from_date, cache.watermark)
+        if from_date != args.from_date:
+            print(f"Listing from {from_date} (cache watermark {cache.watermark}); use --full for the whole range.")
+        pages = query_purchase_orders(username, password, args.status, from_date, args.to_date,
+                                      shard_days=args.shard_days, workers=args.workers, pacing=args.pacing,
+                                      profile=args.profile)
+        crawler = DetailCrawler(username, password, cache, workers=args.workers, tabs=args.tabs,
+                                pacing=args.pacing, profile=args.profile)
+        stats = crawler.crawl(pages)
+    finally:
+        cache.close()
+    print(f"\nCrawl finished in {time.perf_counter() - started:.1f}s: {stats['fetched']} fetched, "
+          f"{stats['skipped']} skipped as unchanged or without a detail link/PO number, "
+          f"{stats['failed']} failed (of {stats['listed']} listed)")
+    print(METRICS.format_summary())
@@ -0,0 +1,108 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+# Adjust system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.datatables import DEFAULT_PAGE_LENGTH
+from core.metrics import METRICS
+from Purchase_Order.sharded_query import query_purchase_orders
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+
+# -----------------------
+# Writers: one page in, one page out, nothing kept
+# -----------------------
+class ExportWriter:
+    """Streams record dicts to CSV or JSONL. The CSV header comes from the first record."""
+
+    def __init__(self, path, fmt=None):
+        self.path = path
+        self.fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+        if self.fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{self.fmt}'. Choose from: {', '.join(EXPORT_FORMATS)}")
+        self.count = 0
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._csv = None
+
+    def write(self, records):
+        for record in records:
+            if self.fmt == "jsonl":
+                self._file.write(json.dumps(record, default=str) + "\n")
+            else:
+                if self._csv is None:
+                    self._csv = csv.DictWriter(self._file, fieldnames=list(record), extrasaction="ignore")
+                    self._csv.writeheader()
+                self._csv.writerow(record)
+            self.count += 1
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_pages(pages, writer, report=print):
+    """Write every page as it arrives, reporting running rows/sec. Returns (rows, seconds)."""
+    started = time.perf_counter()
+    for rows in pages:
+        writer.write(rows)
+        elapsed = time.perf_counter() - started
+        report(f"{writer.count} rows written ({writer.count / elapsed if elapsed else 0:.0f} rows/s)")
+    return writer.count, time.perf_counter() - started
+
+
+def export_purchase_orders(username, password, requisition_status, from_date, to_date, output, fmt=None,
+                           search_term="", page_length=DEFAULT_PAGE_LENGTH, pacing="fast", profile="lean",
+                           session_dir=".sessions", shard_days=0, workers=4):
+    """
+    Filter the purchase order list and stream every matching row to `output`.
+    With shard_days the range is queried as parallel date shards (see sharded_query);
+    rows still stream page by page with a bounded read-ahead per shard.
+    """
+    with ExportWriter(output, fmt) as writer:
+        pages = query_purchase_orders(username, password, requisition_status, from_date, to_date, search_term,
+                                      shard_days, workers, page_length, pacing, profile, session_dir)
+        rows, elapsed = export_pages(pages, writer)
+    print(f"\nExported {rows} purchase orders to {output} in {elapsed:.1f}s "
+          f"({rows / elapsed if elapsed else 0:.0f} rows/s)")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export filtered Purchase Orders to CSV or JSONL.")
+    parser.add_argument("from_date", help="YYYY-MM-DD")
+    parser.add_argument("to_date", help="YYYY-MM-DD")
+    parser.add_argument("-o", "--output", default="purchase_orders.csv", help="Output file (.csv or .jsonl).")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, help="Defaults to the output file's extension.")
+    parser.add_argument("--status", default="All", help="Requisition status filter.")
+    parser.add_argument("--search", default="", help="Optional table search term.")
+    parser.add_argument("--page-length", type=int, default=DEFAULT_PAGE_LENGTH, help="Rows read per page.")
+    parser.add_argument("--shard-days", type=int, default=0,
+                        help="Split the range into shards of this many days and query them in parallel.")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Parallel sessions for --shard-days.")
+    parser.add_argument("--pacing", default="fast", help="Pacing profile (demo/fast).")
+    parser.add_argument("--profile", default="lean", help="Chrome profile (default/lean).")
+    parser.add_argument("--username", default=os.environ.get("DOLPHIN_USERNAME"))
+    parser.add_argument("--password", default=os.environ.get("DOLPHIN_PASSWORD"))
+    args = parser.parse_args()
+    if args.shard_days < 0:
+        parser.error("--shard-days must be 0 (no sharding) or at least 1")
+
+    username = args.username or input("Enter your username: ")
+    password = args.password or input("Enter your password: ")
+
+    export_purchase_orders(username, password, args.status, args.from_date, args.to_date, args.output,
+                           fmt=args.format, search_term=args.search, page_length=args.page_length,
+                           pacing=args.pacing, profile=args.profile, shard_days=args.shard_days,
+                           workers=args.workers)
+    print(METRICS.format_summary())
@@ -1,9 +1,22 @@
-import time
+import datetime
 import traceback
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from core.core_setup import BaseAutomation
+from core.datatables import DEFAULT_PAGE_LENGTH, iter_table_pages, search_table
+from core.metrics import METRICS
+from core.waits import TableRedraw
+
+PURCHASE_ORDER_TABLE = "#purchase-order-table"
+
+# Column converters for purchase order rows; anything that fails stays as text
+PO_FIELD_TYPES = {
+    "id": int,
+    "total_amount": lambda v: float(str(v).replace(",", "")),
+    "order_date": datetime.date.fromisoformat,
+    "updated_at": lambda v: datetime.datetime.strptime(v, "%Y-%m-%d %H:%M:%S"),
+}
 
 
 class PurchaseOrder(BaseAutomation):
@@ -12,7 +25,7 @@ class PurchaseOrder(BaseAutomation):
             self.init_driver()
             self.login()
             self.log("Dashboard loaded.")
-            time.sleep(2)
+            self.pause(2)
 
             self.go_to_purchase_order()
 
@@ -24,11 +37,11 @@ class PurchaseOrder(BaseAutomation):
             )
 
         except Exception as e:
-            self.log(f"Error loading dashboard: {e}")
+            self.log_error(f"Error loading dashboard: {e}")
             traceback.print_exc()
         finally:
             # small delay before quitting, so browser doesn’t close too soon
-            time.sleep(2)
+            self.pause(2)
             self.quit()
 
 
@@ -43,7 +56,7 @@ class PurchaseOrder(BaseAutomation):
                 if toggle_button.get_attribute("aria-expanded") == "false":
                     toggle_button.click()
                     self.log("Sidebar expanded.")
-                    time.sleep(1)
+                    self.pause(1)
             except Exception:
                 self.log("Sidebar toggle not found or already expanded.")
 
@@ -53,69 +66,80 @@ class PurchaseOrder(BaseAutomation):
             )
             purchase_order_link.click()
             self.log("Navigated to Purchase Order page.")
-            time.sleep(3)
+            self.pause(3)
 
         except Exception as e:
-            self.log(f"Error navigating to Purchase Order: {e}")
+            self.log_error(f"Error navigating to Purchase Order: {e}")
             traceback.print_exc()
 
-    def filter_purchase_order(self, requisition_status: str, from_date: str, to_date: str, search_term: str = ""):
-        """Filter Purchase Orders and optionally search, then click View Detail."""
-        try:
-            # --- Select requisition status ---
-            dropdown = WebDriverWait(self.driver, 15).until(
-                EC.element_to_be_clickable((By.ID, "requisition_status"))
-            )
-            Select(dropdown).select_by_visible_text(requisition_status)
-            self.log(f"Selected requisition_status: {requisition_status}")
-            time.sleep(0.5)
-
-            # --- Fill From date ---
-            from_input = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.ID, "date-range-from"))
+    def apply_filter(self, requisition_status: str, from_date: str, to_date: str, search_term: str = ""):
+        """Run the main search (and optional table search). Returns True when the table has rows."""
+        # --- Select requisition status ---
+        dropdown = WebDriverWait(self.driver, 15).until(
+            EC.element_to_be_clickable((By.ID, "requisition_status"))
+        )
+        Select(dropdown).select_by_visible_text(requisition_status)
+        self.log(f"Selected requisition_status: {requisition_status}")
+        self.pause(0.5)
+
+        # --- Fill From date ---
+        from_input = WebDriverWait(self.driver, 10).until(
+            EC.element_to_be_clickable((By.ID, "date-range-from"))
+        )
+        from_input.clear()
+        from_input.send_keys(from_date)
+        self.log(f"From date set to: {from_date}")
+        self.pause(0.5)
+
+        # --- Fill To date ---
+        to_input = WebDriverWait(self.driver, 10).until(
+            EC.element_to_be_clickable((By.ID, "date-range-to"))
+        )
+        to_input.clear()
+        to_input.send_keys(to_date)
+        self.log(f"To date set to: {to_date}")
+        self.pause(0.5)
+
+        # --- Click main Search button ---
+        search_button = WebDriverWait(self.driver, 10).until(
+            EC.element_to_be_clickable((By.XPATH, "//button[contains(@class,'btn-success') and .//span[@class='fa fa-search']]"))
+        )
+        redraw = TableRedraw(self.driver, PURCHASE_ORDER_TABLE)
+        search_button.click()
+        self.log("Main Search button clicked.")
+        self.wait_until(redraw, timeout=30)
+        self.wait_for_network_idle()  # row renderers may still be fetching
+
+        # --- Optional search in table ---
+        if search_term:
+            search_input = WebDriverWait(self.driver, 10).until(
+                EC.visibility_of_element_located((By.CSS_SELECTOR, "#purchase-order-table_filter input[type='search']"))
             )
-            from_input.clear()
-            from_input.send_keys(from_date)
-            self.log(f"From date set to: {from_date}")
-            time.sleep(0.5)
-
-            # --- Fill To date ---
-            to_input = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.ID, "date-range-to"))
+            search_input.clear()
+            redraw = TableRedraw(self.driver, PURCHASE_ORDER_TABLE)
+            search_input.send_keys(search_term)
+            self.driver.execute_script(
+                "arguments[0].dispatchEvent(new Event('input', { bubbles: true }));",
+                search_input
             )
-            to_input.clear()
-            to_input.send_keys(to_date)
-            self.log(f"To date set to: {to_date}")
-            time.sleep(0.5)
-
-            # --- Click main Search button ---
-            search_button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(@class,'btn-success') and .//span[@class='fa fa-search']]"))
-            )
-            search_button.click()
-            self.log("Main Search button clicked.")
-            time.sleep(3)  # wait for table to refresh
-
-            # --- Optional search in table ---
-            if search_term:
-                search_input = WebDriverWait(self.driver, 10).until(
-                    EC.visibility_of_element_located((By.CSS_SELECTOR, "#purchase-order-table_filter input[type='search']"))
-                )
-                search_input.clear()
-                search_input.send_keys(search_term)
-                self.driver.execute_script(
-                    "arguments[0].dispatchEvent(new Event('input', { bubbles: true }));",
-                    search_input
-                )
-                self.log(f"Searched table with term: '{search_term}'")
-                time.sleep(2)
+            self.log(f"Searched table with term: '{search_term}'")
+            self.wait_until(redraw)
+            self.wait_for_network_idle()
 
-            # --- Check if table has data ---
-            table_empty = self.driver.find_elements(By.CSS_SELECTOR, "#purchase-order-table .dataTables_empty")
-            if table_empty and "No data available" in table_empty[0].text:
+        # --- Check if table has data ---
+        table_empty = self.driver.find_elements(By.CSS_SELECTOR, "#purchase-order-table .dataTables_empty")
+        return not table_empty
+
+    def filter_purchase_order(self, requisition_status: str, from_date: str, to_date: str, search_term: str = "",
+                              open_detail=True):
+        """Filter Purchase Orders and optionally search, then click View Detail (unless open_detail=False)."""
+        try:
+            if not self.apply_filter(requisition_status, from_date, to_date, search_term):
                 self.log("No data available in the table. Quitting Chrome.")
                 self.quit()  # Immediately close the browser
-                return  # Exit the function
+                return False
+            if not open_detail:
+                return True
 
             # --- Click first "View Detail" button ---
             view_detail_btn = WebDriverWait(self.driver, 10).until(
@@ -123,11 +147,40 @@ class PurchaseOrder(BaseAutomation):
             )
             view_detail_btn.click()
             self.log("Clicked 'View Detail' button successfully.")
-            time.sleep(2)
+            self.pause(2)
+            return True
 
         except Exception as e:
-            self.log(f"Error filtering purchase order or clicking buttons: {e}")
+            self.log_error(f"Error filtering purchase order or clicking buttons: {e}")
             traceback.print_exc()
+            return False
+
+    def iter_purchase_order_pages(self, page_length=DEFAULT_PAGE_LENGTH):
+        """
+        Yield the loaded purchase order table page by page as lists of typed
+        records (one script call per page, read from the DataTables data model).
+        """
+        total = 0
+        for rows in iter_table_pages(self.driver, PURCHASE_ORDER_TABLE, page_length, PO_FIELD_TYPES):
+            total += len(rows)
+            self.log(f"Read {len(rows)} purchase orders ({total} so far).")
+            yield rows
+
+    def search_terms(self, terms):
+        """
+        Run every term against the loaded table via table.search(term).draw() in the
+        page and return {term: [typed records]}, without re-running the main search.
+        """
+        matches = search_table(self.driver, PURCHASE_ORDER_TABLE, terms, PO_FIELD_TYPES)
+        found = sum(1 for rows in matches.values() if rows)
+        self.log(f"Searched {len(matches)} terms in the loaded table; {found} had matches.")
+        return matches
+
+    def scrape_purchase_orders(self, requisition_status, from_date, to_date, search_term="",
+                               page_length=DEFAULT_PAGE_LENGTH):
+        """apply_filter() then yield every matching row page by page; yields nothing when empty."""
+        if self.apply_filter(requisition_status, from_date, to_date, search_term):
+            yield from self.iter_purchase_order_pages(page_length)
 
 
 # Entry point
@@ -137,3 +190,4 @@ if __name__ == "__main__":
 
     bot = PurchaseOrder(username, password)
     bot.load_dashboard()
+    print(METRICS.format_summary())
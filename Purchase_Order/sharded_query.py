@@ -0,0 +1,143 @@
+import datetime
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Adjust system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.core_setup import create_driver_pool
+from core.datatables import DEFAULT_PAGE_LENGTH
+from core.session_store import SessionStore
+from Purchase_Order.purchase_order_filter import PurchaseOrder
+
+DEFAULT_SHARD_DAYS = 7
+SHARD_BUFFER_PAGES = 2  # pages a shard may read ahead of the consumer, so memory stays bounded
+_SHARD_DONE = object()
+
+
+class ShardError(RuntimeError):
+    """A date shard could not be queried; its rows would be missing from the result."""
+
+
+def date_shards(from_date, to_date, days=DEFAULT_SHARD_DAYS):
+    """Split an inclusive YYYY-MM-DD range into consecutive (from, to) sub-ranges of `days` days."""
+    if days < 1:
+        raise ValueError(f"shard days must be at least 1 (got {days})")
+    start = datetime.date.fromisoformat(from_date)
+    end = datetime.date.fromisoformat(to_date)
+    if end < start:
+        raise ValueError(f"to_date {to_date} is before from_date {from_date}")
+    shards = []
+    while start <= end:
+        stop = min(start + datetime.timedelta(days=days - 1), end)
+        shards.append((start.isoformat(), stop.isoformat()))
+        start = stop + datetime.timedelta(days=1)
+    return shards
+
+
+def put_page(pages, page, stop):
+    """Block until `page` fits in the bounded queue; False when the consumer stopped first."""
+    while not stop.is_set():
+        try:
+            pages.put(page, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def run_shard(shard, username, password, driver_pool, session_store, requisition_status, search_term,
+              page_length, pacing, profile, pages, stop):
+    """
+    Query one date shard on its own session, putting each page on the bounded
+    `pages` queue as it is read and _SHARD_DONE when the shard ends (also on error).
+    """
+    from_date, to_date = shard
+    bot = PurchaseOrder(username, password, driver_pool=driver_pool, session_store=session_store,
+                        pacing=pacing, profile=profile, job_id=f"shard-{from_date}")
+    try:
+        bot.init_driver()
+        bot.login()
+        bot.go_to_purchase_order()
+        if bot.errors:
+            raise ShardError(f"Shard {from_date}..{to_date}: {bot.errors[0]}")
+        for page in bot.scrape_purchase_orders(requisition_status, from_date, to_date, search_term, page_length):
+            if not put_page(pages, page, stop):
+                return
+    finally:
+        put_page(pages, _SHARD_DONE, stop)
+        bot.quit()
+
+
+def query_sharded(username, password, requisition_status, from_date, to_date, search_term="",
+                  shard_days=DEFAULT_SHARD_DAYS, workers=4, page_length=DEFAULT_PAGE_LENGTH,
+                  pacing="fast", profile="lean", session_dir=".sessions"):
+    """
+    Run the purchase order query as date shards on `workers` parallel sessions.
+
+    Yields pages in date order as they are read. Each shard buffers at most
+    SHARD_BUFFER_PAGES pages ahead of the consumer, so memory stays bounded by
+    workers x buffered pages however large a shard is. Rows already seen (same
+    po_number) are dropped, so overlapping shards or rows that move between
+    pages do not repeat.
+    """
+    shards = date_shards(from_date, to_date, shard_days)
+    pool = create_driver_pool(min(workers, len(shards)), profile)
+    store = SessionStore(session_dir)
+    stop = threading.Event()
+    seen = set()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Shards start in date order, so the one being consumed is always running
+            streams = [queue.Queue(maxsize=SHARD_BUFFER_PAGES) for _ in shards]
+            futures = [
+                executor.submit(run_shard, shard, username, password, pool, store, requisition_status,
+                                search_term, page_length, pacing, profile, pages, stop)
+                for shard, pages in zip(shards, streams)
+            ]
+            try:
+                for shard, pages, future in zip(shards, streams, futures):
+                    for rows in iter(pages.get, _SHARD_DONE):
+                        page = []
+                        for row in rows:
+                            key = row.get("po_number")
+                            if key is not None:
+                                if key in seen:
+                                    continue
+                                seen.add(key)
+                            page.append(row)
+                        if page:
+                            yield page
+                    try:
+                        future.result()
+                    except ShardError:
+                        raise
+                    except Exception as e:
+                        raise ShardError(f"Shard {shard[0]}..{shard[1]} failed: {e}") from e
+            finally:
+                stop.set()  # release shards blocked on a full queue if the caller gave up or a shard failed
+                for future in futures:
+                    future.cancel()
+    finally:
+        pool.close()
+
+
+def query_purchase_orders(username, password, requisition_status, from_date, to_date, search_term="",
+                          shard_days=0, workers=4, page_length=DEFAULT_PAGE_LENGTH, pacing="fast",
+                          profile="lean", session_dir=".sessions"):
+    """Yield purchase order pages from one session, or from parallel date shards when shard_days is set."""
+    if shard_days:
+        yield from query_sharded(username, password, requisition_status, from_date, to_date, search_term,
+                                 shard_days, workers, page_length, pacing, profile, session_dir)
+        return
+    bot = PurchaseOrder(username, password, session_store=SessionStore(session_dir), pacing=pacing,
+                        profile=profile, job_id="po-query")
+    try:
+        bot.init_driver()
+        bot.login()
+        bot.go_to_purchase_order()
+        yield from bot.scrape_purchase_orders(requisition_status, from_date, to_date, search_term, page_length)
+    finally:
+        bot.quit()
@@ -0,0 +1,132 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+# Adjust system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.batch import invalid_result, read_records
+from core.core_setup import create_driver_pool
+from core.metrics import METRICS
+from core.scheduler import affinity_key, plan_affinity, run_queues, switches
+from core.session_store import SessionStore
+from core.validation import format_report, validate_records
+from Stock_Transfer.create_stock_transfer import STOCK_TRANSFER_RULES, StockTransfer
+
+AFFINITY_FIELDS = ("store",)
+
+
+def open_worker(n, username, password, driver_pool, session_store, pacing, profile):
+    bot = StockTransfer(username, password, driver_pool=driver_pool, session_store=session_store,
+                        pacing=pacing, profile=profile, job_id=f"transfer-{n}")
+    try:
+        bot.init_driver()
+        bot.login()
+    except Exception:
+        bot.quit()  # give the driver back before run_queues fails this queue's jobs
+        raise
+    return bot
+
+
+def store_groups(queue):
+    """Consecutive lines of a queue sharing a store, as one job each: (indices, [(index, record)])."""
+    groups = []
+    for index, record in queue:
+        key = affinity_key(record, AFFINITY_FIELDS)
+        if groups and groups[-1][0] == key:
+            groups[-1][1].append((index, record))
+        else:
+            groups.append((key, [(index, record)]))
+    return [(tuple(index for index, _ in lines), lines) for _, lines in groups]
+
+
+def run_group(bot, indices, lines):
+    """
+    Add every line of one store group on a long-lived bot and save them as one
+    transfer. Returns one result row per line; a line is ok only once saved.
+    """
+    results = []
+    for index, record in lines:
+        start = time.perf_counter()
+        bot.job_id = f"transfer-line-{index}"
+        ok = bot.add_transfer_line(record)
+        results.append({
+            "index": index,
+            "status": "ok" if ok else "failed",
+            "duration": round(time.perf_counter() - start, 3),
+            "error": bot.errors[0] if bot.errors else None,
+        })
+    added = [r for r in results if r["status"] == "ok"]
+    if added:
+        bot.job_id = f"transfer-save-{indices[0]}"
+        if not bot.save_transfer():
+            for result in added:
+                result.update(status="failed", error=f"transfer not saved: {bot.errors[0]}")
+    return results
+
+
+def run_transfer_batch(records, username, password, workers=2, pacing="fast", profile="lean", output=None,
+                       session_dir=".sessions", validate=True):
+    """
+    Validate the records, group them by store across `workers` logged-in sessions
+    and add every line, so each session selects a store once per group instead
+    of once per line; each group is saved as one transfer. Results are written
+    to `output` (JSONL) and returned.
+    """
+    results = []
+    started = time.perf_counter()
+    jobs = list(enumerate(records))
+    if validate:
+        report = validate_records(records, STOCK_TRANSFER_RULES)
+        print(format_report(report))
+        jobs = report.valid
+        results.extend(invalid_result(index, errors) for index, _, errors in report.rejected)
+
+    queues = plan_affinity(jobs, workers, AFFINITY_FIELDS)
+    print(f"Affinity plan: {len(queues)} sessions, {sum(switches(q, AFFINITY_FIELDS) for q in queues)} "
+          f"store groups (transfers) for {len(jobs)} lines")
+
+    def collect(result):
+        results.append(result)
+        print(f"[{len(results)}/{len(records)}] line {result['index']}: {result['status']} "
+              f"in {result['duration']}s" + (f" - {result['error']}" if result["error"] else ""))
+
+    if queues:
+        pool = create_driver_pool(len(queues), profile)
+        store = SessionStore(session_dir)
+        try:
+            run_queues([store_groups(queue) for queue in queues],
+                       lambda n: open_worker(n, username, password, pool, store, pacing, profile),
+                       run_group, on_result=collect)
+        finally:
+            pool.close()
+
+    if output:
+        with open(output, "w", encoding="utf-8") as out:
+            for result in sorted(results, key=lambda r: r["index"]):
+                out.write(json.dumps(result) + "\n")
+    ok = sum(1 for r in results if r["status"] == "ok")
+    print(f"\nTransfer batch finished: {ok} ok, {len(results) - ok} not added in {time.perf_counter() - started:.1f}s")
+    print(METRICS.format_summary())
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add Stock Transfer lines in bulk, grouped by store.")
+    parser.add_argument("input", help="CSV or JSONL file with store, item and quantity per row/line.")
+    parser.add_argument("-o", "--output", default="transfer_batch_results.jsonl", help="Per-line results (JSONL).")
+    parser.add_argument("-w", "--workers", type=int, default=2, help="Parallel browser sessions.")
+    parser.add_argument("--no-validate", action="store_true", help="Skip the pre-flight record check.")
+    parser.add_argument("--pacing", default="fast", help="Pacing profile (demo/fast).")
+    parser.add_argument("--profile", default="lean", help="Chrome profile (default/lean).")
+    parser.add_argument("--username", default=os.environ.get("DOLPHIN_USERNAME"))
+    parser.add_argument("--password", default=os.environ.get("DOLPHIN_PASSWORD"))
+    args = parser.parse_args()
+
+    username = args.username or input("Enter your username: ")
+    password = args.password or input("Enter your password: ")
+
+    run_transfer_batch(list(read_records(args.input)), username, password, workers=args.workers,
+                       pacing=args.pacing, profile=args.profile, output=args.output,
+                       validate=not args.no_validate)
@@ -1,15 +1,28 @@
 import sys
 import os
-import time
 import traceback
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 # Adjust system path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from core.core_setup import BaseAutomation, STOCK_TRANSFER_URL
+from core.core_setup import BaseAutomation, STOCK_TRANSFER_URL, SESSION_ENVIRONMENT
+from core.catalogue import catalogue_directory
+from core.metrics import METRICS
+from core.multiselect import VueMultiselect
+from core.validation import integer, master, required
+
+# Pre-flight checks for batch records (store, item, quantity); see core.validation
+STOCK_TRANSFER_RULES = {
+    "store": (required,),
+    "item": (required, master(catalogue_directory(SESSION_ENVIRONMENT))),
+    "quantity": (required, integer(minimum=1)),
+}
+# id of the button that stores the added lines as one transfer. Not checked against
+# the live page (the stand-in's button mirrors this assumption), so it can be
+# overridden per environment.
+SAVE_BUTTON = os.environ.get("DOLPHIN_STOCK_TRANSFER_SAVE_BUTTON", "save")
+
 
 class StockTransfer(BaseAutomation):
 
@@ -19,113 +32,109 @@ class StockTransfer(BaseAutomation):
             self.init_driver()
             self.login()
             self.log("Dashboard loaded.")
-            time.sleep(2)
+            self.pause(2)
             
             self.driver.get(STOCK_TRANSFER_URL)
             self.log("Navigated to Stock Transfer page.")
-            time.sleep(2)
+            self.pause(2)
             self.select_vue_multiselect("Select a Store", "ER DISPENSARY")
-            time.sleep(1)
+            self.pause(1)
             self.select_item("Select Item", "DIC10")
-            time.sleep(1)
+            self.pause(1)
             self.enter_quantity("transfer_quantity", 50)
-            time.sleep(1)
+            self.pause(1)
             self.click_button("add")
 
 
         except Exception as e:
-            self.log(f"[ERROR] Exception during load_dashboard: {e}")
+            self.log_error(f"[ERROR] Exception during load_dashboard: {e}")
             self.log(traceback.format_exc())
         finally:
-            if self.driver:
-                self.driver.quit()
-                self.log("Driver closed.")
+            self.quit()
 
-    def select_vue_multiselect(self, placeholder_text, option_text):
+    def add_transfer_line(self, record):
         """
-        Select an option from a Vue multiselect dropdown reliably.
+        Add one store/item/quantity line on an already logged-in bot. The page and
+        the selected store are reused when the previous line left them in place.
+        Lines stay on the form until save_transfer() is called.
+        Returns True when every step completed without logging an error.
         """
+        self.errors = []
         try:
-            self.log(f"Selecting '{option_text}' from Vue multiselect with placeholder '{placeholder_text}'")
-            wait = WebDriverWait(self.driver, 20)
-
-            # STEP 1: Wait for the placeholder span to appear
-            placeholder_span = wait.until(
-                lambda d: d.find_element(
-                    By.XPATH,
-                    f"//span[contains(@class,'multiselect__single') and normalize-space(text())='{placeholder_text}']"
-                )
-            )
-
-            # STEP 2: Get the ancestor multiselect container
-            multiselect_box = placeholder_span.find_element(By.XPATH, "./ancestor::div[contains(@class,'multiselect')]")
-
-            # Scroll into view and click to open
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", multiselect_box)
-            time.sleep(0.3)
-            multiselect_box.click()
-            time.sleep(0.5)
-
-            # STEP 3: Wait for the input inside the dropdown
-            search_input = wait.until(
-                lambda d: multiselect_box.find_element(
-                    By.XPATH,
-                    ".//input[contains(@class,'multiselect__input')]"
-                )
-            )
+            if self.page_state.get("page") != "stock_transfer":
+                self.driver.get(STOCK_TRANSFER_URL)
+                self.log("Navigated to Stock Transfer page.")
+                self.page_state = {"page": "stock_transfer"}
+
+            store = record.get("store")
+            if self.page_state.get("store") == store:
+                self.log(f"Store '{store}' already selected.")
+            else:
+                # The widget shows the current store (or the placeholder) in .multiselect__single
+                label = self.select_vue_multiselect(self.page_state.get("store") or "Select a Store", store)
+                if self.errors:
+                    return False
+                self.page_state["store"] = label
+
+            self.select_item("Select Item", record.get("item"))
+            self.enter_quantity("transfer_quantity", record.get("quantity"))
+            self.click_button("add")
 
-            # Make input visible if hidden
-            self.driver.execute_script("arguments[0].style.display='block';", search_input)
-            search_input.clear()
-            search_input.send_keys(option_text)
-            time.sleep(0.5)
+        except Exception as e:
+            self.log_error(f"[ERROR] Exception in add_transfer_line: {e}")
+            self.log(traceback.format_exc())
+        return not self.errors
 
-            # Press Enter to select the option
-            search_input.send_keys(Keys.ENTER)
-            time.sleep(0.3)
+    def save_transfer(self):
+        """
+        Save the lines added since the page was opened as one transfer. The form is
+        reloaded for the next group. Returns True when the save completed without an error.
+        """
+        self.errors = []
+        try:
+            self.click_button(SAVE_BUTTON)
+            self.wait_for_network_idle()
+            self.log("Stock transfer saved.")
+        except Exception as e:
+            self.log_error(f"[ERROR] Exception in save_transfer: {e}")
+            self.log(traceback.format_exc())
+        self.page_state = {}
+        return not self.errors
 
-            self.log(f"Option '{option_text}' selected successfully from '{placeholder_text}'")
+    def select_vue_multiselect(self, placeholder_text, option_text):
+        """
+        Select an option from a Vue multiselect whose current text is `placeholder_text`.
+        Returns the rendered label of the selected option (None on error).
+        """
+        try:
+            self.log(f"Selecting '{option_text}' from Vue multiselect with placeholder '{placeholder_text}'")
+            label = VueMultiselect(self.driver, timeout=20).select({"single": placeholder_text}, option_text)
+            self.pause(0.3)
+            self.log(f"Option '{label}' selected successfully from '{placeholder_text}'")
+            return label
 
         except Exception as e:
-            self.log(f"[ERROR] Exception in select_vue_multiselect: {e}")
+            self.log_error(f"[ERROR] Exception in select_vue_multiselect: {e}")
             traceback.print_exc()
 
     def select_item(self, placeholder_text, item_name):
-        """Select an item from a Vue multiselect using placeholder and typing."""
+        """
+        Select an item (code, name or label) from a Vue multiselect found by placeholder.
+        The item is resolved from the local catalogue index and searched by its code.
+        """
         try:
             self.log(f"Selecting item '{item_name}' from multiselect with placeholder '{placeholder_text}'")
-
-            wait = WebDriverWait(self.driver, 10)
-
-            # Step 1: Locate the multiselect container by input placeholder
-            multiselect_container = wait.until(
-                lambda d: d.find_element(
-                    By.XPATH,
-                    f"//input[@placeholder='{placeholder_text}']/ancestor::div[contains(@class,'multiselect')]"
-                )
-            )
-
-            # Step 2: Click on the tags area to open dropdown
-            tags_div = multiselect_container.find_element(By.CLASS_NAME, "multiselect__tags")
-            self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", tags_div)
-            time.sleep(3)
-            tags_div.click()
-            time.sleep(3)
-
-            # Step 3: Find the input field and make it visible
-            input_field = multiselect_container.find_element(By.XPATH, f".//input[@placeholder='{placeholder_text}']")
-            self.driver.execute_script("arguments[0].style.display='block';", input_field)
-            input_field.clear()
-            input_field.send_keys(item_name)
-            time.sleep(3)
-
-            # Step 4: Press Enter to select
-            input_field.send_keys(Keys.ENTER)
-            self.log(f"Item '{item_name}' selected successfully from '{placeholder_text}'")
-            time.sleep(3)
+            target = {"placeholder": placeholder_text}
+            item = self.resolve_item(item_name)
+            if item:
+                label = VueMultiselect(self.driver).select(target, item.label, query=item.code or item.label)
+            else:
+                label = VueMultiselect(self.driver).select(target, item_name, match="prefix")
+            self.log(f"Item '{label}' selected successfully from '{placeholder_text}'")
+            self.wait_for_network_idle()  # batch and stock details load after selection
 
         except Exception as e:
-            self.log(f"[ERROR] Exception in select_item: {e}")
+            self.log_error(f"[ERROR] Exception in select_item: {e}")
             traceback.print_exc()
 
     def enter_quantity(self, field_id, quantity):
@@ -148,17 +157,17 @@ class StockTransfer(BaseAutomation):
 
             # Scroll into view
             self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", input_field)
-            time.sleep(0.2)
+            self.pause(0.2)
 
             # Clear any existing value and enter new quantity
             input_field.clear()
             input_field.send_keys(str(quantity))
-            time.sleep(0.2)
+            self.pause(0.2)
 
             self.log(f"Quantity '{quantity}' entered successfully in '{field_id}'")
 
         except Exception as e:
-            self.log(f"[ERROR] Exception in enter_quantity: {e}")
+            self.log_error(f"[ERROR] Exception in enter_quantity: {e}")
             traceback.print_exc()
 
     def click_button(self, button_id):
@@ -180,17 +189,18 @@ class StockTransfer(BaseAutomation):
 
             # Scroll into view and click
             self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", button)
-            time.sleep(0.2)
+            self.pause(0.2)
             button.click()
-            time.sleep(0.3)
+            self.pause(0.3)
 
             self.log(f"Button '{button_id}' clicked successfully")
 
         except Exception as e:
-            self.log(f"[ERROR] Exception in click_button: {e}")
+            self.log_error(f"[ERROR] Exception in click_button: {e}")
             traceback.print_exc()
 
 
 if __name__ == "__main__":
     automation = StockTransfer("rachit", "Rachit@123")
     automation.load_dashboard()
+    print(METRICS.format_summary())
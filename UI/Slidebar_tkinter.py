@@ -8,6 +8,7 @@ import threading
 
 # Import your PurchaseOrder automation class
 from Purchase_Order.create_purchase_order import PurchaseOrder 
+from UI.log_bridge import TkEventBridge
 class AutomationDashboard(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -35,6 +36,12 @@ class AutomationDashboard(tk.Tk):
         self.create_sidebar()
         self.create_main_area()
 
+        # Worker threads report back through the bridge, never touching Tk directly
+        self.bridge = TkEventBridge(self)
+        self.bridge.on("info", messagebox.showinfo)
+        self.bridge.on("error", messagebox.showerror)
+        self.bridge.start()
+
     def get_colors(self):
         return {
             'sidebar_bg': '#0A1929', 'sidebar_active': '#1E3A5F', 'sidebar_hover': '#132F4C',
@@ -333,10 +340,12 @@ class AutomationDashboard(tk.Tk):
     def run_purchase_order_bot(self, username, password):
         try:
             bot = PurchaseOrder(username, password)
-            bot.load_dashboard()
-            messagebox.showinfo("Success", "Purchase Order automation completed successfully!")
+            if bot.load_dashboard():
+                self.bridge.post("info", "Success", "Purchase Order automation completed successfully!")
+            else:
+                self.bridge.post("error", "Error", f"Automation failed:\n{bot.errors[0]}")
         except Exception as e:
-            messagebox.showerror("Error", f"Automation failed:\n{e}")
+            self.bridge.post("error", "Error", f"Automation failed:\n{e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,58 @@
+import queue
+
+
+# ----------------------------------------------------------------------
+#  Tk Event Bridge: worker threads post, the Tk main loop drains
+# ----------------------------------------------------------------------
+class TkEventBridge:
+    """
+    Tk widgets and messageboxes must only be touched from the main loop.
+    Workers call post(kind, *args) from any thread; the bridge drains the
+    queue on an after() timer and dispatches to the handler registered for
+    that kind. Consecutive "log" events are delivered as one list so the
+    text widget is updated once per tick instead of once per line.
+    """
+
+    def __init__(self, root, interval_ms=100, max_batch=1000):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+        self.handlers = {}
+        self._queue = queue.Queue()
+
+    def on(self, kind, handler):
+        """Register handler(*args) for kind; the "log" handler receives a list of lines."""
+        self.handlers[kind] = handler
+        return self
+
+    def post(self, kind, *args):
+        """Thread-safe: queue an event for the main loop."""
+        self._queue.put((kind, args))
+
+    def start(self):
+        self.root.after(self.interval_ms, self._drain)
+
+    def _drain(self):
+        lines = []
+        try:
+            for _ in range(self.max_batch):
+                try:
+                    kind, args = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == "log":
+                    lines.append(args[0])
+                    continue
+                # Keep ordering: flush pending log lines before any other event
+                self._flush_lines(lines)
+                lines = []
+                handler = self.handlers.get(kind)
+                if handler:
+                    handler(*args)
+            self._flush_lines(lines)
+        finally:
+            self.root.after(self.interval_ms, self._drain)
+
+    def _flush_lines(self, lines):
+        if lines and "log" in self.handlers:
+            self.handlers["log"](lines)
@@ -0,0 +1,142 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Adjust system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.standin_server import start_server
+
+BENCH_USERNAME = "bench@standin.local"
+BENCH_PASSWORD = "bench"
+
+BENCH_PO_RECORD = {
+    "supplier": "Asian Pharmaceuticals",
+    "store": "ICU A",
+    "delivery_date": "2025-12-01",
+    "prepared_by": "Bench Runner",
+    "credit_days": "30",
+    "payment_term": "CASH",
+    "cc_charge": "Included",
+    "discount_on": "Before",
+    "tax_on_free_active": True,
+    "catalogue": "PAR50",
+    "unit_quantity": "10",
+    "unit_bonus": "1",
+    "tax": "13%",
+    "remarks": "benchmark line",
+    "terms_condition": "Standard terms.",
+    "last_remarks": "benchmark",
+}
+
+
+def build_workflows():
+    """Import the workflows only after DOLPHIN_BASE_URL points at the stand-in."""
+    from Purchase_Order.create_purchase_order import PurchaseOrder
+    from Purchase_Order.purchase_order_filter import PurchaseOrder as PurchaseOrderFilter
+    from Purchase_Return.create_return import PurchaseReturn
+    from Stock_Transfer.create_stock_transfer import StockTransfer
+    from Stock_Consumption.create_stock_consumption import StockConsumption
+    from test_canteen_ui import EmployeeMealTest
+
+    def core_job(cls, *args):
+        def job(options):
+            bot = cls(BENCH_USERNAME, BENCH_PASSWORD, **options)
+            bot.load_dashboard(*args)
+            return not bot.errors
+        return job
+
+    def employee_meal_job(options):
+        options = {k: v for k, v in options.items() if k != "driver_pool"}  # canteen has no pool support
+        bot = EmployeeMealTest(BENCH_USERNAME, BENCH_PASSWORD, **options)
+        return bot.run("2025-12-01", ["Lunch"], ["Nursing"], ["EMP0001"])
+
+    http_backends = []
+    http_lock = threading.Lock()
+
+    def purchase_order_http_job(options):
+        with http_lock:  # log in through the browser once, then reuse the session
+            if not http_backends:
+                bot = PurchaseOrder(BENCH_USERNAME, BENCH_PASSWORD, **options)
+                try:
+                    bot.init_driver()
+                    bot.login()
+                    http_backends.append(bot.http_backend())
+                finally:
+                    bot.quit()
+        return bool(http_backends[0].create_purchase_order(BENCH_PO_RECORD).get("id"))
+
+    return {
+        "purchase_order": core_job(PurchaseOrder, BENCH_PO_RECORD),
+        "purchase_order_bulk": core_job(PurchaseOrder, BENCH_PO_RECORD, True),  # bulk_fill=True
+        "purchase_order_http": purchase_order_http_job,
+        "purchase_order_filter": core_job(PurchaseOrderFilter),
+        "purchase_return": core_job(PurchaseReturn),
+        "stock_transfer": core_job(StockTransfer),
+        "stock_consumption": core_job(StockConsumption),
+        "employee_meal": employee_meal_job,
+    }
+
+
+def run_workflow(job, jobs, workers, options):
+    """Run `jobs` copies of a workflow over `workers` threads; returns (ok, elapsed)."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda _: _safe(job, options), range(jobs)))
+    return sum(results), time.perf_counter() - started
+
+
+def _safe(job, options):
+    try:
+        return bool(job(options))
+    except Exception as e:
+        print(f"  job failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every workflow against the local stand-in.")
+    parser.add_argument("workflows", nargs="*", help="Subset of workflows to run (default: all).")
+    parser.add_argument("-n", "--jobs", type=int, default=10, help="Jobs per workflow.")
+    parser.add_argument("-w", "--workers", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stand-in latency per request (seconds).")
+    parser.add_argument("--pacing", default="fast")
+    parser.add_argument("--profile", default="lean")
+    args = parser.parse_args()
+
+    server, base_url = start_server(latency=args.latency)
+    os.environ["DOLPHIN_BASE_URL"] = base_url
+    print(f"Stand-in at {base_url} (latency {args.latency * 1000:.0f} ms)")
+
+    from core.core_setup import create_driver_pool
+    from core.metrics import METRICS
+    from core.session_store import SessionStore
+
+    workflows = build_workflows()
+    selected = args.workflows or list(workflows)
+    pool = create_driver_pool(args.workers, args.profile)
+    pool.warm()
+    options = {
+        "driver_pool": pool,
+        "session_store": SessionStore(os.path.join(".sessions", "bench")),
+        "pacing": args.pacing,
+        "profile": args.profile,
+    }
+
+    rows = []
+    try:
+        for name in selected:
+            print(f"Running {name} x{args.jobs} on {args.workers} workers...")
+            ok, elapsed = run_workflow(workflows[name], args.jobs, args.workers, options)
+            rows.append((name, ok, args.jobs, elapsed, args.jobs / elapsed * 60 if elapsed else 0.0))
+    finally:
+        pool.close()
+        server.shutdown()
+
+    print(f"\n{'workflow':<24} {'ok':>7} {'seconds':>9} {'jobs/min':>9}")
+    for name, ok, jobs, elapsed, per_minute in rows:
+        print(f"{name:<24} {f'{ok}/{jobs}':>7} {elapsed:>9.1f} {per_minute:>9.1f}")
+    print()
+    print(METRICS.format_summary())
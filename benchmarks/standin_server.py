@@ -0,0 +1,570 @@
+import argparse
+import datetime
+import html
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+SESSION_COOKIE = "dolphin_session"
+CSRF_TOKEN = "standin-csrf-token"
+
+SUPPLIERS = ["ABC Pharma Pvt. Ltd.", "Asian Pharmaceuticals", "Deurali-Janta Pharmaceuticals",
+             "Lomus Pharmaceuticals", "Nepal Pharmaceuticals Lab", "Quest Pharmaceuticals",
+             "Siddhartha Pharmaceuticals", "Time Pharmaceuticals"]
+STORES = ["CENTRAL STORE", "ER DISPENSARY", "ICU A", "ICU B", "MAIN PHARMACY", "OPD PHARMACY"]
+ITEMS = [
+    ("DIC10", "Diclofenac 50mg Tablet", "Strip"), ("PAR50", "Paracetamol 500mg Tablet", "Strip"),
+    ("AMX25", "Amoxicillin 250mg Capsule", "Strip"), ("OME20", "Omeprazole 20mg Capsule", "Strip"),
+    ("NS500", "Normal Saline 500ml", "Bottle"), ("CEF1G", "Ceftriaxone 1g Injection", "Vial"),
+    ("MET50", "Metformin 500mg Tablet", "Strip"), ("ATO10", "Atorvastatin 10mg Tablet", "Strip"),
+    ("SYR05", "Syringe 5ml", "Piece"), ("GLV07", "Surgical Gloves 7.0", "Pair"),
+]
+REQUISITIONERS = ["Astha Bhandari (Mavorion)", "Bikash Thapa", "Sita Sharma", "Ram Karki", "Anita Gurung"]
+STATUSES = ["Pending", "Approved", "Received", "Cancelled"]
+MEAL_SCHEDULES = ["Breakfast", "Lunch", "Snacks", "Dinner"]
+DEPARTMENTS = ["Nursing", "Pharmacy", "Radiology", "Administration", "Laboratory"]
+
+
+def item_label(code, name, unit):
+    return f"{code} - {name} ({unit})"
+
+
+# ----------------------------------------------------------------------
+#  In-memory application state
+# ----------------------------------------------------------------------
+class StandinState:
+    def __init__(self, purchase_orders=500, employees=50, seed=7):
+        rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.sessions = set()
+        self.purchase_orders = []
+        start = datetime.date(2025, 1, 1)
+        for i in range(1, purchase_orders + 1):
+            order_date = start + datetime.timedelta(days=rng.randrange(365))
+            updated = datetime.datetime.combine(order_date, datetime.time(9)) + datetime.timedelta(
+                hours=rng.randrange(24 * 30))
+            self.purchase_orders.append({
+                "id": i,
+                "po_number": f"PO-{order_date.year}-{i:05d}",
+                "supplier": rng.choice(SUPPLIERS),
+                "store": rng.choice(STORES),
+                "requisitioner": rng.choice(REQUISITIONERS),
+                "order_date": order_date.isoformat(),
+                "status": rng.choice(STATUSES),
+                "total_amount": round(rng.uniform(500, 250000), 2),
+                "updated_at": updated.strftime("%Y-%m-%d %H:%M:%S"),
+                "items": [
+                    {"code": code, "name": name, "unit": unit, "quantity": rng.randint(1, 50),
+                     "rate": round(rng.uniform(5, 900), 2)}
+                    for code, name, unit in rng.sample(ITEMS, rng.randint(1, 4))
+                ],
+            })
+        self.employees = [
+            {"employee_id": f"EMP{i:04d}", "name": f"Employee {i}", "department": rng.choice(DEPARTMENTS)}
+            for i in range(1, employees + 1)
+        ]
+        self.stock_transfers = []
+        self.meal_schedules = []
+
+    def add_purchase_order(self, payload):
+        """Store a PO posted by the HTTP fast path and return its id/number."""
+        today = datetime.date.today()
+        with self.lock:
+            po_id = len(self.purchase_orders) + 1
+            po = {
+                "id": po_id,
+                "po_number": f"PO-{today.year}-{po_id:05d}",
+                "supplier": payload.get("supplier"),
+                "store": payload.get("store"),
+                "requisitioner": payload.get("prepared_by"),
+                "order_date": today.isoformat(),
+                "status": "Pending",
+                "total_amount": 0.0,
+                "updated_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "items": payload.get("items") or [],
+            }
+            self.purchase_orders.append(po)
+        return {"id": po["id"], "po_number": po["po_number"]}
+
+    def purchase_order_rows(self, status="All", date_from="", date_to=""):
+        rows = []
+        for po in self.purchase_orders:
+            if status not in ("", "All") and po["status"] != status:
+                continue
+            if date_from and po["order_date"] < date_from:
+                continue
+            if date_to and po["order_date"] > date_to:
+                continue
+            rows.append({
+                "id": po["id"],
+                "po_number": po["po_number"],
+                "supplier": po["supplier"],
+                "requisitioner": po["requisitioner"],
+                "order_date": po["order_date"],
+                "status": po["status"],
+                "total_amount": f"{po['total_amount']:.2f}",
+                "updated_at": po["updated_at"],
+                "action": f'<button type="button" class="btn btn-primary btn-sm view-detail" '
+                          f'data-id="{po["id"]}">View Detail</button>',
+            })
+        return rows
+
+
+# ----------------------------------------------------------------------
+#  HTML helpers
+# ----------------------------------------------------------------------
+def page(title, body, script=""):
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>
+<meta name="csrf-token" content="{CSRF_TOKEN}">
+<style>
+  .multiselect {{ position: relative; min-height: 30px; border: 1px solid #ccc; margin-bottom: 8px; }}
+  .multiselect__tags {{ min-height: 30px; padding: 4px; cursor: pointer; }}
+  .multiselect__input {{ width: 1px; position: absolute; padding: 0; border: 0; }}
+  .multiselect__content-wrapper {{ display: none; border-top: 1px solid #ccc; max-height: 240px; overflow: auto; }}
+  .multiselect__content {{ list-style: none; margin: 0; padding: 0; }}
+  .multiselect__option {{ display: block; padding: 4px 8px; cursor: pointer; }}
+  .multiselect__option--highlight {{ background: #41b883; color: #fff; }}
+  .modal {{ display: none; }}
+  .modal.fixed {{ display: block; position: fixed; top: 0; left: 0; right: 0; background: #fff; }}
+</style>
+<script src="/static/standin.js"></script>
+</head><body>
+{body}
+<script>{script}</script>
+</body></html>"""
+
+
+def multiselect(placeholder, options=None, remote=None, name=None, input_id=None, css="multiselect",
+                single=None, multiple=False):
+    """vue-multiselect markup; `single` shows placeholder text in a .multiselect__single span."""
+    attrs = [f'class="{css}"', 'tabindex="-1"', 'data-standin="multiselect"']
+    if options is not None:
+        attrs.append(f"data-options='{html.escape(json.dumps(options), quote=True)}'")
+    if remote:
+        attrs.append(f'data-remote="{remote}"')
+    if multiple:
+        attrs.append('data-multiple="true"')
+    input_attrs = ['type="text"', 'autocomplete="off"', f'placeholder="{placeholder}"', 'class="multiselect__input"']
+    if name:
+        input_attrs.append(f'name="{name}"')
+    if input_id:
+        input_attrs.append(f'id="{input_id}"')
+    shown = (f'<span class="multiselect__single">{html.escape(single)}</span>' if single
+             else f'<span class="multiselect__placeholder">{html.escape(placeholder)}</span>')
+    return f"""<div {' '.join(attrs)}>
+  <div class="multiselect__select"></div>
+  <div class="multiselect__tags">{shown}<input {' '.join(input_attrs)}></div>
+  <div class="multiselect__content-wrapper"><ul class="multiselect__content"></ul></div>
+</div>"""
+
+
+def sidebar():
+    return """<nav><button class="sidebar-toggle" aria-expanded="false"
+  onclick="this.setAttribute('aria-expanded', this.getAttribute('aria-expanded') === 'true' ? 'false' : 'true')">Menu</button>
+<ul>
+  <li><a href="/phar/pharmacy/purchase_order"><span>Purchase Order</span></a></li>
+  <li><a href="/phar/pharmacy/issuestock/create"><span>Stock Transfer</span></a></li>
+  <li><a href="/phar/pharmacy/stockconsumption/create"><span>Stock Consumption</span></a></li>
+  <li><a href="/phar/pharmacy/purchases_return/purchase_return"><span>Purchase Return</span></a></li>
+</ul></nav>"""
+
+
+def login_page(action, user_field):
+    if user_field == "email":
+        fields = '<input id="email" name="email" type="text"><input id="password" name="password" type="password">'
+        button = '<button type="submit">Sign in</button>'
+    else:
+        fields = '<input name="username" type="text"><input name="password" type="password">'
+        button = '<button type="submit">Login</button>'
+    return page("Login", f'<form method="post" action="{action}">{fields}{button}</form>')
+
+
+def dashboard_page():
+    return page("Dashboard", sidebar() + "<h1>Dashboard</h1>")
+
+
+def purchase_order_list_page():
+    columns = [
+        {"title": "PO Number", "data": "po_number"}, {"title": "Supplier", "data": "supplier"},
+        {"title": "Requisitioner", "data": "requisitioner"}, {"title": "Order Date", "data": "order_date"},
+        {"title": "Status", "data": "status"}, {"title": "Total Amount", "data": "total_amount"},
+        {"title": "Last Updated", "data": "updated_at"}, {"title": "Action", "data": "action"},
+    ]
+    head = "".join(f"<th>{c['title']}</th>" for c in columns)
+    body = sidebar() + f"""
+<h1>Purchase Order</h1>
+<button id="addPurchaseOrder" onclick="location.href='/phar/pharmacy/purchase_order/create'">Add New</button>
+<select id="requisition_status">
+  <option>All</option>{''.join(f'<option>{s}</option>' for s in STATUSES)}
+</select>
+<input id="date-range-from" type="text"><input id="date-range-to" type="text">
+<button class="btn btn-success" id="search"><span class="fa fa-search"></span> Search</button>
+<div id="purchase-order-table_filter"><label>Search:<input type="search"></label></div>
+<div id="purchase-order-table_processing" style="display:none">Processing...</div>
+<table id="purchase-order-table"><thead><tr>{head}</tr></thead><tbody></tbody></table>
+<div id="purchase-order-table_info"></div>"""
+    script = f"""
+const table = $('#purchase-order-table').DataTable({{columns: {json.dumps(columns)}, pageLength: 10}});
+document.getElementById('search').addEventListener('click', function () {{
+  const q = new URLSearchParams({{
+    status: document.getElementById('requisition_status').value,
+    from: document.getElementById('date-range-from').value,
+    to: document.getElementById('date-range-to').value,
+  }});
+  const processing = document.getElementById('purchase-order-table_processing');
+  processing.style.display = 'block';
+  fetch('/api/purchase_orders?' + q).then(r => r.json()).then(rows => {{
+    table.clear().rows.add(rows).draw();
+    processing.style.display = 'none';
+  }});
+}});
+const filter = document.querySelector('#purchase-order-table_filter input');
+['input', 'keyup'].forEach(e => filter.addEventListener(e, () => table.search(filter.value).draw()));
+document.getElementById('purchase-order-table').addEventListener('click', function (e) {{
+  if (e.target.classList.contains('view-detail')) {{
+    location.href = '/phar/pharmacy/purchase_order/' + e.target.dataset.id;
+  }}
+}});"""
+    return page("Purchase Order", body, script)
+
+
+def purchase_order_create_page():
+    body = sidebar() + f"""
+<h1>Create Purchase Order</h1>
+<form id="purchase-order-form" onsubmit="return false">
+<label>Supplier</label>
+{multiselect("Select Supplier", SUPPLIERS, name="supplier", css="multiselect custom-widthed-multiselect")}
+<label>Store</label>
+{multiselect("Select Store", STORES, name="store")}
+<label>Delivery Date</label><input id="delivery_date" type="text">
+<label>Prepared By</label><input id="prepared_by" type="text">
+<label>Credit Days</label>
+<select id="credit_days"><option value="">--</option>{''.join(f'<option value="{d}">{d}</option>' for d in (30, 60, 90, 120))}</select>
+<label>Payment Term</label>
+<select id="payment_term"><option value="">--</option><option value="1">CASH</option><option value="2">BT</option><option value="3">AFDL</option></select>
+<label>CC Charge</label>
+{multiselect("Select CC Charge", ["Included", "Excluded"], name="cc_charge")}
+<label>Discount On</label>
+{multiselect("Select Discount On", ["Before", "After"], input_id="discount_on")}
+<label><input id="tax_on_free_active" type="checkbox"> Tax On Free</label>
+<div class="input-group custom-widthed-multiselect">
+  {multiselect("Select Catalogue", remote="/api/catalogue?q=", name="catalogue")}
+</div>
+<input id="selected_in_box" type="text"><input id="selected_unit_bonus" type="text">
+<input id="selected_item_tax" type="text"><input id="selected_item_remarks" type="text">
+<button id="add_item" type="button">Add</button>
+<table id="items-table"><tbody></tbody></table>
+<label>Terms And Conditions</label><textarea name="terms_condition"></textarea>
+<label>Remarks</label><textarea name="remarks"></textarea>
+<button id="save_purchase_order" type="submit">Save</button>
+</form>"""
+    script = """
+document.getElementById('add_item').addEventListener('click', function () {
+  const row = document.createElement('tr');
+  const catalogue = document.querySelector('[name=catalogue]').closest('.multiselect').dataset.value || '';
+  row.innerHTML = '<td></td><td></td>';
+  row.children[0].textContent = catalogue;
+  row.children[1].textContent = document.getElementById('selected_in_box').value;
+  document.querySelector('#items-table tbody').appendChild(row);
+});
+document.getElementById('save_purchase_order').addEventListener('click', function () {
+  const picked = name => document.querySelector('[name=' + name + ']').closest('.multiselect').dataset.value || '';
+  const items = Array.from(document.querySelectorAll('#items-table tbody tr'))
+    .map(tr => ({name: tr.children[0].textContent, quantity: tr.children[1].textContent}));
+  fetch('/phar/pharmacy/purchase_order/store', {method: 'POST', headers: {'Content-Type': 'application/json',
+    'X-CSRF-TOKEN': document.querySelector('meta[name=csrf-token]').content},
+    body: JSON.stringify({supplier: picked('supplier'), store: picked('store'),
+      prepared_by: document.getElementById('prepared_by').value, items: items})})
+    .then(response => { if (response.ok) { location.href = '/phar/pharmacy/purchase_order'; } });
+});"""
+    return page("Create Purchase Order", body, script)
+
+
+def purchase_order_detail_page(po):
+    fields = [("PO Number", po["po_number"]), ("Supplier", po["supplier"]), ("Store", po["store"]),
+              ("Requisitioner", po["requisitioner"]), ("Order Date", po["order_date"]),
+              ("Status", po["status"]), ("Total Amount", f"{po['total_amount']:.2f}"),
+              ("Last Updated", po["updated_at"])]
+    summary = "".join(f"<tr><th>{k}</th><td>{html.escape(str(v))}</td></tr>" for k, v in fields)
+    items = "".join(
+        f"<tr><td>{i['code']}</td><td>{html.escape(i['name'])}</td><td>{i['unit']}</td>"
+        f"<td>{i['quantity']}</td><td>{i['rate']:.2f}</td></tr>" for i in po["items"])
+    body = sidebar() + f"""
+<h1>Purchase Order Detail</h1>
+<table class="detail-table">{summary}</table>
+<table class="items-table"><thead><tr><th>Code</th><th>Item</th><th>Unit</th><th>Quantity</th><th>Rate</th></tr></thead>
+<tbody>{items}</tbody></table>"""
+    return page("Purchase Order Detail", body)
+
+
+def stock_page(title, quantity_id, save_url=None):
+    body = sidebar() + f"""
+<h1>{title}</h1>
+{multiselect("Select Store", STORES, single="Select a Store")}
+{multiselect("Select Item", remote="/api/items?q=")}
+<input id="{quantity_id}" type="number">
+<button id="add" type="button">Add</button>
+<table id="items-table"><tbody></tbody></table>
+<button id="save" type="button">Save</button>"""
+    script = f"""
+const lines = [];
+document.getElementById('add').addEventListener('click', function () {{
+  const store = document.querySelector('.multiselect__single').textContent.trim();
+  const item = document.querySelector('input[placeholder="Select Item"]').closest('.multiselect').dataset.value || '';
+  const quantity = document.getElementById('{quantity_id}').value;
+  lines.push({{store: store, item: item, quantity: quantity}});
+  const row = document.createElement('tr');
+  row.innerHTML = '<td></td><td></td><td></td>';
+  [store, item, quantity].forEach((v, i) => row.children[i].textContent = v);
+  document.querySelector('#items-table tbody').appendChild(row);
+}});
+document.getElementById('save').addEventListener('click', function () {{
+  if (!{json.dumps(save_url)}) {{ return; }}
+  fetch({json.dumps(save_url)}, {{method: 'POST', headers: {{'Content-Type': 'application/json',
+    'X-CSRF-TOKEN': document.querySelector('meta[name=csrf-token]').content}}, body: JSON.stringify({{lines: lines}})}})
+    .then(() => {{ lines.length = 0; document.querySelector('#items-table tbody').innerHTML = ''; }});
+}});"""
+    return page(title, body, script)
+
+
+def purchase_return_page():
+    body = sidebar() + f"""
+<h1>Purchase Return</h1>
+<label>Supplier</label>
+{multiselect("Select Supplier", SUPPLIERS, name="supplier", css="multiselect custom-widthed-multiselect")}"""
+    return page("Purchase Return", body)
+
+
+def employee_page(state):
+    body = f"""
+<h1>Employees</h1>
+<button type="button" id="create">Create</button>
+<input type="search" id="employee-search">
+<table id="employees"><tbody></tbody></table>
+<div id="employee-modal" class="modal">
+  <input id="employee_id" type="text">
+  <span class="text-red-500 text-[12px] error-message"></span>
+  <input class="First name" type="text"><input class="Middle name" type="text"><input class="Last name" type="text">
+  {multiselect("Select Department", DEPARTMENTS, multiple=True)}
+  <input id="is_active" type="checkbox" checked>
+  <button type="button" id="save">Save</button>
+</div>"""
+    script = f"""
+let employees = {json.dumps(state.employees)};
+const modal = document.getElementById('employee-modal');
+function renderEmployees() {{
+  const q = document.getElementById('employee-search').value.toLowerCase();
+  const rows = employees.filter(e => !q || e.employee_id.toLowerCase().includes(q) || e.name.toLowerCase().includes(q));
+  document.querySelector('#employees tbody').innerHTML = rows.length
+    ? rows.map(e => '<tr><td>' + e.employee_id + '</td><td>' + e.name + '</td><td>' + e.department + '</td></tr>').join('')
+    : '<tr><td>No Employee Found</td></tr>';
+}}
+renderEmployees();
+document.getElementById('employee-search').addEventListener('input', renderEmployees);
+document.getElementById('create').addEventListener('click', () => modal.className = 'modal fixed top-0 z-10');
+document.getElementById('employee_id').addEventListener('input', function () {{
+  const taken = employees.some(e => e.employee_id === this.value);
+  document.querySelector('.error-message').textContent = taken ? 'Employee id already assigned' : '';
+}});
+document.getElementById('save').addEventListener('click', function () {{
+  const first = document.getElementsByClassName('First name')[0].value;
+  const last = document.getElementsByClassName('Last name')[0].value;
+  const employee = {{employee_id: document.getElementById('employee_id').value, name: first + ' ' + last, department: ''}};
+  fetch('/api/employees', {{method: 'POST', headers: {{'Content-Type': 'application/json'}}, body: JSON.stringify(employee)}})
+    .then(() => {{ employees.push(employee); modal.className = 'modal'; renderEmployees(); }});
+}});"""
+    return page("Employees", body, script)
+
+
+def meal_schedule_page(state):
+    employees = [f"{e['employee_id']} - {e['name']}" for e in state.employees]
+    body = f"""
+<h1>User Meal Schedule</h1>
+<button type="button" id="create">Create</button>
+<div id="meal-modal" class="modal">
+  <input class="calendar-input" type="text"><button type="button" class="calendar-clear-input">x</button>
+  {multiselect("Select Meal Schedule", MEAL_SCHEDULES, multiple=True)}
+  {multiselect("Select Department", DEPARTMENTS, multiple=True)}
+  {multiselect("Search by employee id or name", employees, multiple=True)}
+  <button type="button" id="add">Add</button>
+</div>"""
+    script = """
+const modal = document.getElementById('meal-modal');
+document.getElementById('create').addEventListener('click', () => modal.className = 'modal fixed top-0 z-10');
+document.querySelector('.calendar-clear-input').addEventListener('click', () => document.querySelector('.calendar-input').value = '');
+document.getElementById('add').addEventListener('click', function () {
+  const values = Array.from(modal.querySelectorAll('[data-standin=multiselect]')).map(m => m.__vue__.value);
+  const payload = {dates: document.querySelector('.calendar-input').value.split(',').map(s => s.trim()).filter(Boolean),
+                   meal_schedules: values[0], departments: values[1], employees: values[2]};
+  fetch('/api/meal_schedules', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify(payload)})
+    .then(() => { modal.className = 'modal'; });
+});"""
+    return page("User Meal Schedule", body, script)
+
+
+# ----------------------------------------------------------------------
+#  HTTP handler
+# ----------------------------------------------------------------------
+class StandinHandler(BaseHTTPRequestHandler):
+    state = None
+    latency = 0.0
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # keep benchmark output clean
+
+    # -----------------------
+    # Helpers
+    # -----------------------
+    def _session(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        token = cookie.get(SESSION_COOKIE)
+        return token.value if token and token.value in self.state.sessions else None
+
+    def _send(self, status, body=b"", content_type="text/html; charset=utf-8", headers=None):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, payload, status=200):
+        self._send(status, json.dumps(payload), "application/json")
+
+    def _redirect(self, location, headers=None):
+        self._send(302, b"", headers=dict(headers or {}, Location=location))
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length).decode("utf-8") if length else ""
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            return json.loads(raw or "{}")
+        return {k: v[0] for k, v in parse_qs(raw).items()}
+
+    # -----------------------
+    # Routing
+    # -----------------------
+    def do_GET(self):
+        time.sleep(self.latency)
+        url = urlparse(self.path)
+        path, query = url.path.rstrip("/") or "/", {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if path.startswith("/static/"):
+            name = os.path.basename(path)
+            try:
+                with open(os.path.join(STATIC_DIR, name), "rb") as f:
+                    return self._send(200, f.read(), "application/javascript")
+            except OSError:
+                return self._send(404, "Not found")
+        if path == "/login":
+            return self._send(200, login_page("/login", "email"))
+        if path == "/canteen/login":
+            return self._send(200, login_page("/canteen/login", "username"))
+
+        if not self._session():
+            return self._redirect("/canteen/login" if path.startswith("/canteen") else "/login")
+
+        if path == "/":
+            return self._send(200, dashboard_page())
+        if path == "/phar/pharmacy/purchase_order":
+            return self._send(200, purchase_order_list_page())
+        if path == "/phar/pharmacy/purchase_order/create":
+            return self._send(200, purchase_order_create_page())
+        match = re.fullmatch(r"/phar/pharmacy/purchase_order/(\d+)", path)
+        if match:
+            po = next((p for p in self.state.purchase_orders if p["id"] == int(match.group(1))), None)
+            return self._send(200, purchase_order_detail_page(po)) if po else self._send(404, "Not found")
+        if path == "/phar/pharmacy/issuestock/create":
+            return self._send(200, stock_page("Stock Transfer", "transfer_quantity",
+                                                    "/phar/pharmacy/issuestock/store"))
+        if path == "/phar/pharmacy/stockconsumption/create":
+            return self._send(200, stock_page("Stock Consumption", "consumption_quantity"))
+        if path == "/phar/pharmacy/purchases_return/purchase_return":
+            return self._send(200, purchase_return_page())
+        if path == "/canteen/employee":
+            return self._send(200, employee_page(self.state))
+        if path == "/canteen/user-meal-schedule":
+            return self._send(200, meal_schedule_page(self.state))
+
+        if path == "/api/purchase_orders":
+            return self._json(self.state.purchase_order_rows(
+                query.get("status", "All"), query.get("from", ""), query.get("to", "")))
+        if path in ("/api/catalogue", "/api/items"):
+            q = query.get("q", "").lower()
+            return self._json([item_label(*i) for i in ITEMS if q in item_label(*i).lower()])
+        if path == "/api/employees":
+            return self._json(self.state.employees)
+        return self._send(404, "Not found")
+
+    def do_POST(self):
+        time.sleep(self.latency)
+        path = urlparse(self.path).path.rstrip("/")
+        body = self._body()
+
+        if path in ("/login", "/canteen/login"):
+            if body.get("password"):
+                token = uuid.uuid4().hex
+                with self.state.lock:
+                    self.state.sessions.add(token)
+                return self._redirect("/canteen/employee" if path.startswith("/canteen") else "/", {
+                    "Set-Cookie": f"{SESSION_COOKIE}={token}; Path=/; HttpOnly"})
+            return self._redirect(path)
+
+        if not self._session():
+            return self._json({"message": "Unauthenticated."}, 401)
+        if path == "/api/employees":
+            with self.state.lock:
+                self.state.employees.append(body)
+            return self._json(body, 201)
+        if path in ("/phar/pharmacy/purchase_order/store", "/phar/pharmacy/issuestock/store") \
+                and self.headers.get("X-CSRF-TOKEN") != CSRF_TOKEN:
+            return self._json({"message": "CSRF token mismatch."}, 419)
+        if path == "/phar/pharmacy/purchase_order/store":
+            return self._json(self.state.add_purchase_order(body), 201)
+        if path == "/phar/pharmacy/issuestock/store":
+            with self.state.lock:
+                self.state.stock_transfers.append(body)
+                body["id"] = len(self.state.stock_transfers)
+            return self._json(body, 201)
+        if path == "/api/meal_schedules":
+            with self.state.lock:
+                self.state.meal_schedules.append(body)
+            return self._json(body, 201)
+        return self._send(404, "Not found")
+
+
+def start_server(host="127.0.0.1", port=0, latency=0.0, state=None):
+    """Start the stand-in on a background thread. Returns (server, base_url)."""
+    handler = type("Handler", (StandinHandler,), {"state": state or StandinState(), "latency": latency})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="standin-server", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local stand-in of the Dolphin pages.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.host, args.port, args.latency)
+    print(f"Stand-in running at {base_url} (set DOLPHIN_BASE_URL={base_url})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
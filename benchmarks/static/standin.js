@@ -0,0 +1,317 @@
+/*
+ * Minimal stand-ins for the widgets the Dolphin pages use: vue-multiselect
+ * and jQuery DataTables. Only the DOM structure and API surface the
+ * automation relies on are reproduced.
+ */
+(function () {
+    "use strict";
+
+    // ------------------------------------------------------------------
+    //  vue-multiselect
+    // ------------------------------------------------------------------
+    function initMultiselect(root) {
+        const tags = root.querySelector(".multiselect__tags");
+        const input = root.querySelector(".multiselect__input");
+        const wrapper = root.querySelector(".multiselect__content-wrapper");
+        const list = root.querySelector(".multiselect__content");
+        const placeholder = root.querySelector(".multiselect__placeholder");
+        const multiple = root.dataset.multiple === "true";
+        const remote = root.dataset.remote || "";
+        const options = JSON.parse(root.dataset.options || "[]");
+        const selected = [];
+        let current = [];
+        let highlighted = 0;
+        let seq = 0;
+
+        root.__vue__ = {
+            get options() { return options; },
+            get value() { return multiple ? selected.slice() : (selected[0] || null); },
+        };
+
+        function render(items) {
+            current = items;
+            list.innerHTML = "";
+            if (!items.length) {
+                const li = document.createElement("li");
+                li.innerHTML = '<span class="multiselect__option">' +
+                    (remote ? "No elements found" : "List is empty") + "</span>";
+                list.appendChild(li);
+                return;
+            }
+            items.forEach(function (label, i) {
+                const li = document.createElement("li");
+                li.className = "multiselect__element";
+                const span = document.createElement("span");
+                span.className = "multiselect__option" + (i === highlighted ? " multiselect__option--highlight" : "");
+                span.textContent = label;
+                span.addEventListener("mousedown", function (e) { e.preventDefault(); });
+                span.addEventListener("click", function (e) { e.stopPropagation(); select(label); });
+                li.appendChild(span);
+                list.appendChild(li);
+            });
+        }
+
+        function search(q) {
+            highlighted = 0;
+            if (remote) {
+                if (!q) { render([]); return; }
+                const token = ++seq;
+                fetch(remote + encodeURIComponent(q)).then(function (r) { return r.json(); }).then(function (items) {
+                    if (token === seq) { render(items); }
+                });
+                return;
+            }
+            const needle = q.toLowerCase();
+            render(options.filter(function (o) { return o.toLowerCase().indexOf(needle) !== -1; }));
+        }
+
+        function open() {
+            if (root.dataset.open) { return; }
+            root.dataset.open = "true";
+            wrapper.style.display = "block";
+            input.style.width = "100%";
+            input.style.position = "static";
+            search(input.value);
+            input.focus();
+        }
+
+        function close() {
+            delete root.dataset.open;
+            wrapper.style.display = "none";
+            input.value = "";
+            input.style.width = "1px";
+            input.style.position = "absolute";
+        }
+
+        function showSelection() {
+            if (placeholder) { placeholder.style.display = selected.length ? "none" : ""; }
+            if (multiple) {
+                root.querySelectorAll(".multiselect__tag").forEach(function (t) { t.remove(); });
+                selected.forEach(function (label) {
+                    const tag = document.createElement("span");
+                    tag.className = "multiselect__tag";
+                    tag.innerHTML = "<span></span>";
+                    tag.firstChild.textContent = label;
+                    tags.insertBefore(tag, input);
+                });
+                return;
+            }
+            let single = root.querySelector(".multiselect__single");
+            if (!single) {
+                single = document.createElement("span");
+                single.className = "multiselect__single";
+                tags.insertBefore(single, input);
+            }
+            single.textContent = selected[0] || "";
+        }
+
+        function select(label) {
+            if (multiple) {
+                if (selected.indexOf(label) === -1) { selected.push(label); }
+            } else {
+                selected.splice(0, selected.length, label);
+            }
+            root.dataset.value = multiple ? JSON.stringify(selected) : label;
+            showSelection();
+            root.dispatchEvent(new CustomEvent("ms:select", { detail: label, bubbles: true }));
+            if (multiple) {
+                input.value = "";
+                search("");
+            } else {
+                close();
+                input.blur();
+            }
+        }
+
+        tags.addEventListener("click", open);
+        root.addEventListener("click", function (e) { if (e.target === root) { open(); } });
+        input.addEventListener("focus", open);
+        input.addEventListener("input", function () { search(input.value); });
+        input.addEventListener("keydown", function (e) {
+            if (e.key === "Enter") {
+                e.preventDefault();
+                if (current.length) { select(current[highlighted]); }
+            } else if (e.key === "ArrowDown") {
+                highlighted = Math.min(highlighted + 1, current.length - 1);
+                render(current);
+            } else if (e.key === "ArrowUp") {
+                highlighted = Math.max(highlighted - 1, 0);
+                render(current);
+            }
+        });
+        document.addEventListener("mousedown", function (e) {
+            if (root.dataset.open && !root.contains(e.target)) { close(); }
+        });
+    }
+
+    // ------------------------------------------------------------------
+    //  jQuery / DataTables (tiny subset)
+    // ------------------------------------------------------------------
+    const tables = new WeakMap();
+
+    function stripHtml(value) {
+        return String(value === null || value === undefined ? "" : value).replace(/<[^>]*>/g, "");
+    }
+
+    function DataTableApi(table, options) {
+        const api = this;
+        const columns = options.columns || [];
+        let data = [];
+        let term = "";
+        let start = 0;
+        let length = options.pageLength || 10;
+
+        function filtered() {
+            const needle = term.toLowerCase();
+            if (!needle) { return data; }
+            return data.filter(function (row) {
+                return columns.some(function (c) {
+                    return stripHtml(row[c.data]).toLowerCase().indexOf(needle) !== -1;
+                });
+            });
+        }
+
+        function selectRows(opts) {
+            opts = opts || {};
+            let rows = opts.search === "applied" ? filtered() : data;
+            if (opts.page === "current") { rows = rows.slice(start, start + length); }
+            return rows;
+        }
+
+        this.rows = function (opts) {
+            const rows = selectRows(opts);
+            return {
+                data: function () {
+                    const out = rows.slice();
+                    out.toArray = function () { return rows.slice(); };
+                    return out;
+                },
+                count: function () { return rows.length; },
+            };
+        };
+        this.rows.add = function (newRows) { data = data.concat(newRows); return api; };
+        this.clear = function () { data = []; start = 0; return api; };
+        this.data = function () { const out = data.slice(); out.toArray = function () { return data.slice(); }; return out; };
+
+        this.search = function (value) {
+            if (value === undefined) { return term; }
+            term = String(value);
+            start = 0;
+            return api;
+        };
+
+        this.page = function (n) {
+            const total = filtered().length;
+            const pages = Math.max(1, Math.ceil(total / length));
+            if (n === undefined) { return Math.floor(start / length); }
+            if (n === "next") { n = Math.min(api.page() + 1, pages - 1); }
+            else if (n === "previous") { n = Math.max(api.page() - 1, 0); }
+            else if (n === "first") { n = 0; }
+            else if (n === "last") { n = pages - 1; }
+            start = Math.max(0, Math.min(n, pages - 1)) * length;
+            return api;
+        };
+        this.page.info = function () {
+            const total = filtered().length;
+            return {
+                page: Math.floor(start / length),
+                pages: Math.ceil(total / length),
+                start: start,
+                end: Math.min(start + length, total),
+                length: length,
+                recordsTotal: data.length,
+                recordsDisplay: total,
+                serverSide: false,
+            };
+        };
+        this.page.len = function (n) {
+            if (n === undefined) { return length; }
+            length = n < 0 ? Math.max(1, data.length) : n;
+            start = 0;
+            return api;
+        };
+
+        this.settings = function () {
+            return [{
+                aoColumns: columns.map(function (c) { return { sTitle: c.title, mData: c.data }; }),
+                oFeatures: { bServerSide: false },
+                _iDisplayStart: start,
+                _iDisplayLength: length,
+            }];
+        };
+
+        this.draw = function () {
+            const tbody = table.querySelector("tbody");
+            const rows = selectRows({ search: "applied", page: "current" });
+            tbody.innerHTML = "";
+            if (!rows.length) {
+                tbody.innerHTML = '<tr class="odd"><td valign="top" colspan="' + columns.length +
+                    '" class="dataTables_empty">' + (term ? "No matching records found" : "No data available in table") +
+                    "</td></tr>";
+            }
+            rows.forEach(function (row, i) {
+                const tr = document.createElement("tr");
+                tr.className = i % 2 ? "even" : "odd";
+                columns.forEach(function (c) {
+                    const td = document.createElement("td");
+                    td.innerHTML = row[c.data] === null || row[c.data] === undefined ? "" : row[c.data];
+                    tr.appendChild(td);
+                });
+                tbody.appendChild(tr);
+            });
+            const info = document.getElementById(table.id + "_info");
+            if (info) {
+                const i = api.page.info();
+                info.textContent = "Showing " + (i.recordsDisplay ? i.start + 1 : 0) + " to " + i.end +
+                    " of " + i.recordsDisplay + " entries";
+            }
+            trigger(table, "draw.dt");
+            return api;
+        };
+
+        this.draw();
+    }
+
+    function handlers(el, name) {
+        el.__handlers = el.__handlers || {};
+        el.__handlers[name] = el.__handlers[name] || [];
+        return el.__handlers[name];
+    }
+
+    function trigger(el, name) {
+        handlers(el, name).slice().forEach(function (h) { h.call(el, { type: name }); });
+    }
+
+    function jQuery(selector) {
+        const el = typeof selector === "string" ? document.querySelector(selector) : selector;
+        return {
+            0: el,
+            length: el ? 1 : 0,
+            on: function (name, fn) { handlers(el, name).push(fn); return this; },
+            one: function (name, fn) {
+                const list = handlers(el, name);
+                const wrapped = function (e) { list.splice(list.indexOf(wrapped), 1); fn.call(el, e); };
+                list.push(wrapped);
+                return this;
+            },
+            off: function (name) { if (el.__handlers) { delete el.__handlers[name]; } return this; },
+            DataTable: function (options) {
+                if (!tables.has(el)) { tables.set(el, new DataTableApi(el, options || {})); }
+                return tables.get(el);
+            },
+        };
+    }
+    jQuery.fn = {
+        dataTable: {
+            isDataTable: function (selector) {
+                const el = typeof selector === "string" ? document.querySelector(selector) : selector;
+                return tables.has(el);
+            },
+        },
+    };
+    window.jQuery = window.$ = jQuery;
+
+    document.addEventListener("DOMContentLoaded", function () {
+        document.querySelectorAll("[data-standin='multiselect']").forEach(initMultiselect);
+    });
+})();
@@ -0,0 +1,31 @@
+import csv
+import json
+
+from core.validation import TRUE_VALUES
+
+
+# ----------------------------------------------------------------------
+#  Batch input and result rows shared by the batch runners
+# ----------------------------------------------------------------------
+def read_records(path, boolean_fields=()):
+    """
+    Yield records from a .csv or .jsonl file. CSV cells are strings, so the
+    `boolean_fields` present in a row are converted to True/False.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            for row in csv.DictReader(f):
+                for field in boolean_fields:
+                    if field in row:
+                        row[field] = str(row[field]).strip().lower() in TRUE_VALUES
+                yield row
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def invalid_result(index, errors):
+    """Result row for a record rejected by pre-flight validation (no job was run)."""
+    return {"index": index, "status": "invalid", "duration": 0, "error": "; ".join(errors)}
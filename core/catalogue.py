@@ -0,0 +1,93 @@
+import os
+import re
+from collections import namedtuple
+
+from core.master_data import MASTER_DATA_DIR, MasterDataIndex, ResolutionError, get_directory
+
+CATALOGUE_TTL = 6 * 60 * 60  # items change more often than suppliers
+# Remote-search endpoint behind the catalogue/item multiselects; an empty query lists every item
+CATALOGUE_ENDPOINT = os.environ.get("DOLPHIN_CATALOGUE_ENDPOINT", "/api/catalogue?q=")
+ITEM_LABEL = re.compile(r"^(?P<code>\S+) - (?P<name>.+?)(?: \((?P<unit>[^()]+)\))?$")
+
+CatalogueItem = namedtuple("CatalogueItem", "code name unit label")
+
+
+def parse_item_label(label):
+    """Split an option label such as 'DIC10 - Diclofenac 50mg Tablet (Strip)' into a CatalogueItem."""
+    match = ITEM_LABEL.match(label)
+    if not match:
+        return CatalogueItem(None, label, None, label)
+    return CatalogueItem(match.group("code"), match.group("name"), match.group("unit"), label)
+
+
+def item_label(entry):
+    """Option label for an endpoint entry: a label string or a {code, name, unit} object."""
+    if isinstance(entry, str):
+        return entry
+    label = f"{entry.get('code')} - {entry.get('name')}" if entry.get("code") else str(entry.get("name"))
+    return f"{label} ({entry['unit']})" if entry.get("unit") else label
+
+
+# ----------------------------------------------------------------------
+#  Catalogue Index: option labels plus code and name lookup
+# ----------------------------------------------------------------------
+class CatalogueIndex(MasterDataIndex):
+    def __init__(self, labels):
+        super().__init__(labels)
+        self.items = {label: parse_item_label(label) for label in self.labels}
+        self._codes = {}
+        self._by_name = {}
+        for item in self.items.values():
+            if item.code:
+                self._codes.setdefault(item.code.casefold(), item)
+            self._by_name.setdefault(item.name.casefold(), []).append(item)
+        self._names = MasterDataIndex(item.name for item in self.items.values())
+
+    def item(self, label):
+        return self.items.get(label) or parse_item_label(label)
+
+    def by_code(self, code):
+        """Item with exactly this code (case-insensitive), or None."""
+        return self._codes.get(code.strip().casefold())
+
+    def resolve(self, text, name="catalogue items"):
+        """
+        Label for a code, a label (exact or unique prefix) or an item name (same
+        rules); names shared by several units are ambiguous.
+        """
+        item = self.by_code(text)
+        if item:
+            return item.label
+        try:
+            return super().resolve(text, name)
+        except ResolutionError as error:
+            try:
+                items = self._by_name[self._names.resolve(text, name).casefold()]
+            except ResolutionError:
+                raise error from None
+            if len(items) > 1:
+                raise ResolutionError(name, text, [i.label for i in items]) from None
+            return items[0].label
+
+
+FETCH_SCRIPT = """
+const url = arguments[0], done = arguments[arguments.length - 1];
+fetch(url, {credentials: 'same-origin', headers: {'Accept': 'application/json', 'X-Requested-With': 'XMLHttpRequest'}})
+    .then(r => r.ok ? r.json() : Promise.reject(new Error('HTTP ' + r.status)))
+    .then(items => done({items: Array.isArray(items) ? items : (items.data || [])}))
+    .catch(e => done({error: String(e)}));
+"""
+
+
+def fetch_catalogue(driver, endpoint=CATALOGUE_ENDPOINT, timeout=60):
+    """Every catalogue item label, fetched inside the page so the browser session authenticates it."""
+    driver.set_script_timeout(timeout)
+    result = driver.execute_async_script(FETCH_SCRIPT, endpoint)
+    if result.get("error"):
+        raise RuntimeError(f"Catalogue fetch from {endpoint} failed: {result['error']}")
+    return [item_label(entry) for entry in result["items"]]
+
+
+def catalogue_directory(environment, directory=MASTER_DATA_DIR):
+    """Process-wide catalogue directory for `environment`."""
+    return get_directory("catalogue items", environment, directory, CATALOGUE_TTL, CatalogueIndex)
@@ -0,0 +1,89 @@
+import os
+from selenium.webdriver.chrome.options import Options
+from core.network_idle import PERF_LOGGING_PREFS, PERFORMANCE_LOGGING
+
+# --- Chrome profiles ---
+# "default" is the visible, maximised browser used when watching a run.
+# "lean" is for throughput runs: headless, eager page loads, no images,
+# fonts or analytics, and fewer background processes per worker.
+DEFAULT_PROFILE = os.environ.get("AUTOMATION_PROFILE", "default")
+
+PASSWORD_MANAGER_PREFS = {
+    "credentials_enable_service": False,
+    "profile.password_manager_enabled": False,
+    "profile.password_manager_leak_detection": False
+}
+
+LEAN_ARGUMENTS = [
+    "--headless=new",
+    "--window-size=1920,1080",  # headless has no maximise; keep the desktop layout
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--metrics-recording-only",
+    "--no-first-run",
+    "--mute-audio",
+    "--renderer-process-limit=2",
+]
+
+LEAN_BLOCKED_URLS = [
+    # images
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp",
+    # fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    # analytics / tracking
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*hotjar.com*", "*clarity.ms*", "*facebook.net*",
+]
+
+CHROME_PROFILES = {
+    "default": {
+        "arguments": ["--start-maximized"],
+        "page_load_strategy": "normal",
+        "blocked_urls": [],
+    },
+    "lean": {
+        "arguments": LEAN_ARGUMENTS,
+        "page_load_strategy": "eager",
+        "blocked_urls": LEAN_BLOCKED_URLS,
+    },
+}
+
+
+def get_profile(name):
+    try:
+        return CHROME_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown Chrome profile '{name}'. Choose from: {', '.join(CHROME_PROFILES)}")
+
+
+def build_chrome_options(name=DEFAULT_PROFILE):
+    """Chrome Options for the named profile."""
+    profile = get_profile(name)
+    chrome_options = Options()
+    for argument in profile["arguments"]:
+        chrome_options.add_argument(argument)
+    chrome_options.page_load_strategy = profile["page_load_strategy"]
+    prefs = dict(PASSWORD_MANAGER_PREFS)
+    if name == "lean":
+        prefs["profile.managed_default_content_settings.images"] = 2
+    chrome_options.add_experimental_option("prefs", prefs)
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    # CDP Network events in the performance log feed core.network_idle. Every profile
+    # needs them (all bots use wait_for_network_idle); DriverPool.reset drains the
+    # log between leases so it does not build up in a long-lived driver.
+    chrome_options.set_capability("goog:loggingPrefs", PERFORMANCE_LOGGING)
+    chrome_options.add_experimental_option("perfLoggingPrefs", PERF_LOGGING_PREFS)
+    return chrome_options
+
+
+def apply_profile_cdp(driver, name=DEFAULT_PROFILE):
+    """Apply the CDP side of a profile. Network.enable must already be on."""
+    blocked_urls = get_profile(name)["blocked_urls"]
+    if blocked_urls:
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_urls})
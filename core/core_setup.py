@@ -1,77 +1,233 @@
 import base64
+import os
+import threading
 import time
+import uuid
+from collections import deque
+from urllib.parse import urlparse
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException
+from core.catalogue import catalogue_directory, fetch_catalogue
+from core.chrome_profiles import DEFAULT_PROFILE, apply_profile_cdp, build_chrome_options
+from core.driver_pool import DriverPool
+from core.driver_resolver import resolve_chromedriver
+from core.http_backend import HttpBackend
+from core.log_sink import get_sink
+from core.master_data import ResolutionError, get_directory
+from core.metrics import METRICS, instrument_class, record_wait
+from core.multiselect import VueMultiselect
+from core.network_idle import NETWORK_POLL, QUIET_WINDOW, network_idle
+from core.session_store import restore_session
+from core.waits import DEFAULT_PACING, input_enabled, pause
 
 # --- Constants ---
 AUTH_USER = "mav"
 AUTH_PASS = "mavsecret"
-LOGIN_URL = "https://uattuth.dolphin.com.np/login"
-PURCHASE_RETURN_URL = "https://uattuth.dolphin.com.np/phar/pharmacy/purchases_return/purchase_return"
-STOCK_TRANSFER_URL = "https://uattuth.dolphin.com.np/phar/pharmacy/issuestock/create"
-STOCK_CONSUMPTION_URL = "https://uattuth.dolphin.com.np/phar/pharmacy/stockconsumption/create"
-LOG_FILE = "core_test_result.log"
+BASE_URL = os.environ.get("DOLPHIN_BASE_URL", "https://uattuth.dolphin.com.np").rstrip("/")
+LOGIN_URL = f"{BASE_URL}/login"
+DASHBOARD_URL = f"{BASE_URL}/"
+PURCHASE_RETURN_URL = f"{BASE_URL}/phar/pharmacy/purchases_return/purchase_return"
+PURCHASE_ORDER_CREATE_URL = f"{BASE_URL}/phar/pharmacy/purchase_order/create"
+STOCK_TRANSFER_URL = f"{BASE_URL}/phar/pharmacy/issuestock/create"
+STOCK_CONSUMPTION_URL = f"{BASE_URL}/phar/pharmacy/stockconsumption/create"
+SESSION_ENVIRONMENT = urlparse(BASE_URL).netloc
+LOG_FILE = "core_test_result.jsonl"
+LOG_TAIL = 200  # lines kept in memory per job; the full log lives in LOG_FILE
+
+
+def create_driver(profile=DEFAULT_PROFILE):
+    """Start Chrome for the given profile with the Basic Auth header applied via CDP."""
+    chrome_options = build_chrome_options(profile)
+    driver = webdriver.Chrome(service=Service(resolve_chromedriver().path), options=chrome_options)
+
+    auth_header = base64.b64encode(f"{AUTH_USER}:{AUTH_PASS}".encode()).decode()
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setExtraHTTPHeaders", {"headers": {"Authorization": f"Basic {auth_header}"}})
+    apply_profile_cdp(driver, profile)
+    return driver
+
+
+def create_driver_pool(size, profile=DEFAULT_PROFILE):
+    """Build a DriverPool whose drivers come from create_driver()."""
+    return DriverPool(size, lambda: create_driver(profile))
 
 
 # ----------------------------------------------------------------------
 #  Base Class: Handles driver setup, login, and cleanup
 # ----------------------------------------------------------------------
 class BaseAutomation:
-    def __init__(self, username, password, log_callback=None):
+    def __init_subclass__(cls, **kwargs):
+        # Every public workflow step is timed automatically (see core.metrics)
+        super().__init_subclass__(**kwargs)
+        instrument_class(cls)
+
+    def __init__(self, username, password, log_callback=None, driver_pool=None, session_store=None,
+                 pacing=DEFAULT_PACING, profile=DEFAULT_PROFILE, job_id=None):
         self.username = username
         self.password = password
         self.driver = None
-        self.logs = []
+        self.logs = deque(maxlen=LOG_TAIL)
+        self.errors = []
         self.log_callback = log_callback
+        self.driver_pool = driver_pool
+        self.session_store = session_store
+        self.pacing = pacing
+        self.profile = profile
+        self.job_id = job_id or uuid.uuid4().hex[:8]
+        self.current_step = None
+        self.in_workflow = False  # set by the outermost job entry point, see core.metrics
+        self.page_state = {}  # what the open page already shows (page, store, ...), reused by affinity batches
 
-    def log(self, msg):
+    def log(self, msg, level="info"):
         # timestamp = time.strftime("[%Y-%m-%d %H:%M:%S] ")
         line =  msg
         self.logs.append(line)
         if self.log_callback:
             self.log_callback(line)
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        get_sink(LOG_FILE).emit(
+            line,
+            worker=f"{os.getpid()}:{threading.current_thread().name}",
+            job=self.job_id,
+            step=self.current_step,
+            level=level,
+        )
+
+    def log_error(self, msg):
+        """Log a step failure and remember it so callers can report the job status."""
+        self.errors.append(msg)
+        self.log(msg, level="error")
+
+    def pause(self, seconds):
+        """Unconditional delay, scaled by the pacing profile ("fast" skips it)."""
+        start = time.perf_counter()
+        pause(seconds, self.pacing)
+        elapsed = time.perf_counter() - start
+        if elapsed:
+            METRICS.record(type(self).__name__, "pause", elapsed)
+
+    def wait_until(self, condition, timeout=10, poll=0.5):
+        """Block until a condition from core.waits (or any EC) holds."""
+        start = time.perf_counter()
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=poll).until(condition)
+        finally:
+            record_wait(self, condition, time.perf_counter() - start)
+
+    def wait_for_network_idle(self, quiet=QUIET_WINDOW, timeout=30):
+        """Block until no XHR/fetch has been in flight for `quiet` seconds."""
+        return self.wait_until(network_idle(quiet), timeout=timeout, poll=NETWORK_POLL)
 
     def init_driver(self):
-        chrome_options = Options()
-        chrome_options.add_argument("--start-maximized")
-        prefs = {
-            "credentials_enable_service": False,
-            "profile.password_manager_enabled": False,
-            "profile.password_manager_leak_detection": False
-        }
-        chrome_options.add_experimental_option("prefs", prefs)
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-
-        auth_header = base64.b64encode(f"{AUTH_USER}:{AUTH_PASS}".encode()).decode()
-        self.driver.execute_cdp_cmd("Network.enable", {})
-        self.driver.execute_cdp_cmd("Network.setExtraHTTPHeaders", {"headers": {"Authorization": f"Basic {auth_header}"}})
-        self.log("Chrome driver initialized with Basic Auth")
-        time.sleep(2)  #  Wait to visually confirm browser opened
+        if self.driver_pool:
+            # Pooled drivers are already running with Basic Auth applied
+            self.driver = self.driver_pool.acquire()
+            self.log("Chrome driver leased from pool")
+            return
+        self.driver = create_driver(self.profile)
+        resolution = resolve_chromedriver()
+        self.log(f"chromedriver for Chrome {resolution.chrome_version} resolved from "
+                 f"{resolution.source} in {resolution.seconds * 1000:.1f} ms")
+        self.log(f"Chrome driver initialized with Basic Auth ({self.profile} profile)")
+        self.pause(2)  #  Wait to visually confirm browser opened
 
     def login(self):
+        if self.session_store:
+            if self.restore_saved_session():
+                return
+            # Only one worker per user logs in; the rest pick up its saved session
+            with self.session_store.lock(self.username, SESSION_ENVIRONMENT):
+                if self.restore_saved_session():
+                    return
+                self.submit_login()
+                if "login" not in self.driver.current_url:
+                    self.session_store.save(self.driver, self.username, SESSION_ENVIRONMENT)
+                    self.log("Session saved for reuse.")
+            return
+        self.submit_login()
+
+    def restore_saved_session(self):
+        """Try to land on the dashboard with a saved session; False means log in again."""
+        state = self.session_store.load(self.username, SESSION_ENVIRONMENT)
+        if not state:
+            return False
+        if restore_session(self.driver, state, DASHBOARD_URL):
+            self.log("Restored saved session, skipping login.")
+            return True
+        self.log("Saved session rejected by server; logging in again.")
+        self.session_store.invalidate(self.username, SESSION_ENVIRONMENT)
+        return False
+
+    def submit_login(self):
         self.log("Logging in...")
         self.driver.get(LOGIN_URL)
-        WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.ID, "email")))
-        time.sleep(1)  #  Wait for login page to fully load
+        self.wait_until(input_enabled((By.ID, "email")))
+        self.pause(1)  #  Wait for login page to fully load
 
         self.driver.find_element(By.ID, "email").send_keys(self.username)
-        time.sleep(0.5)
+        self.pause(0.5)
         self.driver.find_element(By.ID, "password").send_keys(self.password)
-        time.sleep(0.5)
+        self.pause(0.5)
         self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
         self.log("Login submitted.")
-        time.sleep(4)  #  Pause to see post-login transition
+        try:
+            self.wait_until(lambda d: "login" not in d.current_url)
+        except TimeoutException:
+            self.log("Still on the login page after submitting credentials.")
+        self.pause(4)  #  Pause to see post-login transition
+
+    def http_backend(self, pool_size=10):
+        """HttpBackend that reuses this bot's logged-in session (call after login())."""
+        return HttpBackend.from_driver(self.driver, BASE_URL, auth=(AUTH_USER, AUTH_PASS), pool_size=pool_size)
+
+    def master_data(self, name):
+        """Cached option directory (see core.master_data) for this environment."""
+        return get_directory(name, SESSION_ENVIRONMENT)
+
+    def resolve_option(self, name, target, text):
+        """
+        Exact label of the `target` multiselect option meant by `text`, looked up in
+        the `name` directory; the option list is pulled from the widget only when
+        the cache is missing, expired or does not know the text.
+        """
+        label = self.master_data(name).resolve(text, fetch=lambda: VueMultiselect(self.driver).options(target))
+        if label != text:
+            self.log(f"Resolved {name} '{text}' to '{label}'.")
+        return label
+
+    def resolve_item(self, text):
+        """
+        CatalogueItem (code, name, unit, label) for a code, name or label, from the
+        cached catalogue index. Returns None when the index cannot be pulled, so
+        callers can fall back to searching the widget; unknown items still raise.
+        """
+        directory = catalogue_directory(SESSION_ENVIRONMENT)
+        try:
+            label = directory.resolve(text, fetch=lambda: fetch_catalogue(self.driver))
+        except ResolutionError:
+            raise
+        except Exception as e:
+            self.log(f"Catalogue index unavailable, searching the widget instead: {e}", level="warning")
+            return None
+        if label != text:
+            self.log(f"Resolved catalogue item '{text}' to '{label}'.")
+        return directory.index().item(label)
 
     def quit(self):
-        if self.driver:
-            time.sleep(2)  #  Pause before closing
-            self.driver.quit()
-            self.log("Browser closed.")
\ No newline at end of file
+        self.page_state = {}
+        if not self.driver:
+            return
+        if self.driver_pool:
+            self.driver_pool.release(self.driver)
+            self.driver = None
+            self.log("Browser returned to pool.")
+            return
+        self.pause(2)  #  Pause before closing
+        self.driver.quit()
+        self.driver = None
+        self.log("Browser closed.")
+
+
+instrument_class(BaseAutomation)
@@ -0,0 +1,167 @@
+import html
+import re
+
+DEFAULT_PAGE_LENGTH = 100
+TAG = re.compile(r"<[^>]*>")
+DETAIL_ID = re.compile(r'data-id="(\d+)"')
+
+
+class DataTableError(RuntimeError):
+    """The selector is not an initialised DataTable (or jQuery is missing)."""
+
+
+# ----------------------------------------------------------------------
+#  DataTables page reader: one script call per page
+# ----------------------------------------------------------------------
+# Reads rows from the DataTables data model instead of the rendered cells.
+# Client-side tables are sliced in the page without redrawing; server-side
+# tables are paged with page(n).draw('page') and answered on the next draw.
+PAGE_SCRIPT = """
+const sel = arguments[0], pageIndex = arguments[1], pageLength = arguments[2],
+      done = arguments[arguments.length - 1];
+const $ = window.jQuery;
+if (!$ || !$.fn.dataTable || !$.fn.dataTable.isDataTable(sel)) {
+    done({error: 'Not an initialised DataTable: ' + sel});
+    return;
+}
+const api = $(sel).DataTable();
+const settings = api.settings()[0];
+const columns = settings.aoColumns.map(c => ({
+    title: String(c.sTitle || '').replace(/<[^>]*>/g, '').trim(),
+    data: (typeof c.mData === 'string' || typeof c.mData === 'number') ? c.mData : null,
+}));
+
+if (settings.oFeatures.bServerSide) {
+    $(sel).one('draw.dt', function () {
+        const info = api.page.info();
+        done({columns: columns, rows: api.rows({page: 'current'}).data().toArray(),
+              pages: info.pages, total: info.recordsDisplay});
+    });
+    api.page.len(pageLength);
+    api.page(pageIndex).draw('page');
+} else {
+    const all = api.rows({search: 'applied'}).data().toArray();
+    done({columns: columns, rows: all.slice(pageIndex * pageLength, (pageIndex + 1) * pageLength),
+          pages: Math.ceil(all.length / pageLength), total: all.length});
+}
+"""
+
+
+# Runs table.search(term).draw() for every term in the page and collects the
+# matching rows, then restores the original search. Server-side tables answer
+# each search on their next draw, so terms are chained through 'draw.dt'.
+MULTI_SEARCH_SCRIPT = """
+const sel = arguments[0], terms = arguments[1], done = arguments[arguments.length - 1];
+const $ = window.jQuery;
+if (!$ || !$.fn.dataTable || !$.fn.dataTable.isDataTable(sel)) {
+    done({error: 'Not an initialised DataTable: ' + sel});
+    return;
+}
+const api = $(sel).DataTable();
+const settings = api.settings()[0];
+const serverSide = settings.oFeatures.bServerSide;
+const columns = settings.aoColumns.map(c => ({
+    title: String(c.sTitle || '').replace(/<[^>]*>/g, '').trim(),
+    data: (typeof c.mData === 'string' || typeof c.mData === 'number') ? c.mData : null,
+}));
+const original = api.search(), originalLength = api.page.len();
+const matches = {};
+
+function collect(term) {
+    matches[term] = api.rows(serverSide ? {page: 'current'} : {search: 'applied'}).data().toArray();
+}
+
+function next(i) {
+    if (i >= terms.length) {
+        api.page.len(originalLength);
+        api.search(original).draw();
+        done({columns: columns, matches: matches});
+        return;
+    }
+    if (serverSide) {
+        $(sel).one('draw.dt', function () { collect(terms[i]); next(i + 1); });
+        api.page.len(-1);
+        api.search(terms[i]).draw();
+    } else {
+        api.search(terms[i]).draw();
+        collect(terms[i]);
+        next(i + 1);
+    }
+}
+next(0);
+"""
+
+
+def snake_case(title):
+    return re.sub(r"[^a-z0-9]+", "_", title.lower()).strip("_")
+
+
+def cell_text(value):
+    """Rendered text of a cell value (HTML stripped); non-strings pass through."""
+    if not isinstance(value, str):
+        return value
+    return html.unescape(TAG.sub("", value)).strip()
+
+
+def row_record(row, columns):
+    """
+    Flat dict for one DataTables row. Object rows keep their data keys
+    (plus any extra fields such as id); array rows are keyed by the
+    snake_cased column titles. A data-id found in a cell becomes "id".
+    """
+    if isinstance(row, dict):
+        raw = dict(row)
+    else:
+        raw = {snake_case(c["title"]) or f"column_{i}": v for i, (c, v) in enumerate(zip(columns, row))}
+    record = {}
+    for key, value in raw.items():
+        if isinstance(value, str) and "id" not in raw and "id" not in record:
+            match = DETAIL_ID.search(value)
+            if match:
+                record["id"] = int(match.group(1))
+        record[key] = cell_text(value)
+    return record
+
+
+def typed_record(record, converters):
+    """Apply per-field converters; values that fail to convert are kept as text."""
+    for key, convert in converters.items():
+        value = record.get(key)
+        if value in (None, ""):
+            continue
+        try:
+            record[key] = convert(value)
+        except (TypeError, ValueError):
+            pass
+    return record
+
+
+def iter_table_pages(driver, selector, page_length=DEFAULT_PAGE_LENGTH, converters=None, timeout=30):
+    """Yield the table's rows page by page, each page a list of record dicts."""
+    driver.set_script_timeout(timeout)
+    page = 0
+    while True:
+        result = driver.execute_async_script(PAGE_SCRIPT, selector, page, page_length)
+        if result.get("error"):
+            raise DataTableError(result["error"])
+        rows = [row_record(r, result["columns"]) for r in result["rows"]]
+        if converters:
+            rows = [typed_record(r, converters) for r in rows]
+        if rows:
+            yield rows
+        page += 1
+        if page >= (result.get("pages") or 0):
+            return
+
+
+def search_table(driver, selector, terms, converters=None, timeout=60):
+    """{term: [records]} for every search term, run against the already loaded table in one call."""
+    driver.set_script_timeout(timeout)
+    result = driver.execute_async_script(MULTI_SEARCH_SCRIPT, selector, list(terms))
+    if result.get("error"):
+        raise DataTableError(result["error"])
+    matches = {}
+    for term, rows in result["matches"].items():
+        records = [row_record(r, result["columns"]) for r in rows]
+        matches[term] = [typed_record(r, converters) for r in records] if converters else records
+    return matches
@@ -0,0 +1,178 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from core.network_idle import reset_tracker
+
+
+# ----------------------------------------------------------------------
+#  Driver Pool: keeps N initialised Chrome sessions warm between jobs
+# ----------------------------------------------------------------------
+class DriverPool:
+    def __init__(self, size, factory, lease_timeout=300):
+        """
+        Args:
+            size (int): Maximum number of Chrome sessions kept alive.
+            factory (callable): Zero-argument callable returning a ready driver
+                (Basic Auth / CDP setup already applied).
+            lease_timeout (float): Seconds to wait for a free driver.
+        """
+        self.size = size
+        self.factory = factory
+        self.lease_timeout = lease_timeout
+        self._idle = []  # LIFO: the most recently used driver is leased first
+        self._all = []
+        self._lock = threading.Lock()
+        # Signalled whenever a driver is parked or a slot is freed, so a blocked
+        # acquire() can take the driver or start a new one in the free slot.
+        self._available = threading.Condition(self._lock)
+        self._closed = False
+
+    def warm(self, count=None):
+        """Start drivers up front so the first jobs don't pay the Chrome launch."""
+        count = self.size if count is None else min(count, self.size)
+        while True:
+            with self._lock:
+                if len(self._all) >= count:
+                    return
+            driver = self._create()
+            if driver is None:
+                return
+            self._park(driver)
+
+    def acquire(self):
+        """
+        Lease a driver, starting a new one if the pool isn't full yet. When every
+        driver is leased, wait up to lease_timeout for one to be released or
+        discarded; raises TimeoutError after that.
+        """
+        deadline = time.monotonic() + self.lease_timeout
+        while True:
+            with self._available:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("DriverPool is closed")
+                    if self._idle:
+                        driver = self._idle.pop()
+                        break
+                    if len(self._all) < self.size:
+                        self._all.append(None)  # reserve the slot while Chrome starts
+                        driver = None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"No Chrome driver free after {self.lease_timeout}s: "
+                            f"all {self.size} drivers in the pool are leased")
+                    self._available.wait(remaining)
+            if driver is None:
+                return self._start()
+            if self._is_alive(driver):
+                return driver
+            self._discard(driver)
+
+    def release(self, driver):
+        """Reset a leased driver and hand it back to the pool."""
+        if self._closed:
+            self._discard(driver)
+            return
+        try:
+            self.reset(driver)
+        except Exception:
+            self._discard(driver)
+            return
+        self._park(driver)
+
+    @contextmanager
+    def lease(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def reset(self, driver):
+        """
+        Clear cookies and storage, close extra tabs and park the driver on a blank page.
+        Cookies are cleared through CDP for every domain, not only the current page's,
+        and the performance log is drained (see core.network_idle.reset_tracker).
+        """
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        driver.get("about:blank")
+        reset_tracker(driver)
+
+    def close(self):
+        """Quit every driver owned by the pool."""
+        with self._available:
+            self._closed = True
+            drivers, self._all, self._idle = [d for d in self._all if d is not None], [], []
+            self._available.notify_all()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -----------------------
+    # Helpers
+    # -----------------------
+    def _create(self):
+        with self._lock:
+            if len(self._all) >= self.size:
+                return None
+            self._all.append(None)  # reserve the slot while Chrome starts
+        return self._start()
+
+    def _start(self):
+        """Fill a reserved slot with a new driver; the slot is freed again if Chrome fails to start."""
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._available:
+                self._all.remove(None)
+                self._available.notify()
+            raise
+        with self._lock:
+            if not self._closed:
+                self._all[self._all.index(None)] = driver
+                return driver
+        driver.quit()  # the pool was closed while Chrome was starting
+        raise RuntimeError("DriverPool is closed")
+
+    def _park(self, driver):
+        with self._available:
+            if not self._closed:
+                self._idle.append(driver)
+                self._available.notify()
+                return
+        driver.quit()
+
+    def _discard(self, driver):
+        with self._available:
+            if driver in self._all:
+                self._all.remove(driver)
+                self._available.notify()
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import threading
+import time
+from collections import namedtuple
+
+# --- Constants ---
+DRIVER_CACHE_DIR = os.environ.get(
+    "CHROMEDRIVER_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "dolphin-automation", "chromedriver")
+)
+INDEX_FILE = "index.json"
+DRIVER_NAME = "chromedriver.exe" if platform.system() == "Windows" else "chromedriver"
+CHROME_CANDIDATES = {
+    "Linux": ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"],
+    "Darwin": ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+               "/Applications/Chromium.app/Contents/MacOS/Chromium"],
+    "Windows": [r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+                r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"],
+}
+VERSION_RE = re.compile(r"(\d+)\.(\d+)\.(\d+)\.(\d+)")
+
+DriverResolution = namedtuple("DriverResolution", "path chrome_version source seconds")
+
+_resolved = None
+_resolve_lock = threading.Lock()
+
+
+# ----------------------------------------------------------------------
+#  Chrome version detection
+# ----------------------------------------------------------------------
+def detect_chrome_version():
+    """Return the installed Chrome version string (e.g. '142.0.7444.59') or None."""
+    if platform.system() == "Windows":
+        version = _windows_registry_version()
+        if version:
+            return version
+    candidates = [os.environ["CHROME_BINARY"]] if os.environ.get("CHROME_BINARY") else []
+    candidates += CHROME_CANDIDATES.get(platform.system(), [])
+    for candidate in candidates:
+        binary = shutil.which(candidate) or (candidate if os.path.exists(candidate) else None)
+        if not binary:
+            continue
+        version = _binary_version(binary)
+        if version:
+            return version
+    return None
+
+
+def _binary_version(binary):
+    try:
+        out = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_RE.search(out)
+    return match.group(0) if match else None
+
+
+def _windows_registry_version():
+    try:
+        import winreg
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon") as key:
+            return winreg.QueryValueEx(key, "version")[0]
+    except Exception:
+        return None
+
+
+def major(version):
+    return version.split(".")[0] if version else None
+
+
+# ----------------------------------------------------------------------
+#  Version-indexed cache
+# ----------------------------------------------------------------------
+def load_index(cache_dir=DRIVER_CACHE_DIR):
+    try:
+        with open(os.path.join(cache_dir, INDEX_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def register_driver(binary, chrome_major=None, cache_dir=DRIVER_CACHE_DIR):
+    """Copy a chromedriver binary into the cache and index it by Chrome major version."""
+    driver_version = _binary_version(binary)
+    chrome_major = chrome_major or major(driver_version)
+    if not chrome_major:
+        raise RuntimeError(f"Could not determine the version of chromedriver at '{binary}'")
+
+    target_dir = os.path.join(cache_dir, chrome_major)
+    os.makedirs(target_dir, exist_ok=True)
+    target = os.path.join(target_dir, DRIVER_NAME)
+    if os.path.abspath(binary) != os.path.abspath(target):
+        shutil.copy2(binary, target)
+    os.chmod(target, 0o755)
+
+    index = load_index(cache_dir)
+    index[chrome_major] = {"path": target, "driver_version": driver_version, "registered_at": time.time()}
+    tmp = os.path.join(cache_dir, f"{INDEX_FILE}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp, os.path.join(cache_dir, INDEX_FILE))
+    return target
+
+
+def resolve_chromedriver(offline=None, cache_dir=DRIVER_CACHE_DIR):
+    """
+    Resolve the chromedriver binary for the installed Chrome, once per process.
+
+    Order: CHROMEDRIVER_PATH env, then the local version index, then (unless
+    offline) a single download through webdriver-manager that is copied into
+    the cache for next time. Set CHROMEDRIVER_OFFLINE=1 on air-gapped runners.
+    """
+    global _resolved
+    if _resolved:
+        return _resolved
+    with _resolve_lock:
+        if _resolved:
+            return _resolved
+        if offline is None:
+            offline = os.environ.get("CHROMEDRIVER_OFFLINE", "").lower() in ("1", "true", "yes")
+        start = time.perf_counter()
+        path, chrome_version, source = _resolve(offline, cache_dir)
+        _resolved = DriverResolution(path, chrome_version, source, time.perf_counter() - start)
+        return _resolved
+
+
+def _resolve(offline, cache_dir):
+    override = os.environ.get("CHROMEDRIVER_PATH")
+    if override:
+        return override, detect_chrome_version(), "env"
+
+    chrome_version = detect_chrome_version()
+    entry = load_index(cache_dir).get(major(chrome_version) or "")
+    if entry and os.path.exists(entry["path"]):
+        return entry["path"], chrome_version, "cache"
+
+    if offline:
+        raise RuntimeError(
+            f"No cached chromedriver for Chrome {chrome_version or '(not found)'} in {cache_dir}. "
+            "Register one with `python -m core.driver_resolver --register PATH` or set CHROMEDRIVER_PATH."
+        )
+
+    from webdriver_manager.chrome import ChromeDriverManager
+    downloaded = ChromeDriverManager().install()
+    return register_driver(downloaded, major(chrome_version), cache_dir), chrome_version, "download"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resolve or pre-populate the local chromedriver cache.")
+    parser.add_argument("--register", metavar="PATH", help="Add an existing chromedriver binary to the cache.")
+    parser.add_argument("--offline", action="store_true", help="Never touch the network.")
+    args = parser.parse_args()
+
+    if args.register:
+        print(f"Registered: {register_driver(args.register)}")
+    else:
+        resolution = resolve_chromedriver(offline=args.offline)
+        print(f"Chrome {resolution.chrome_version}: {resolution.path} "
+              f"[{resolution.source}, {resolution.seconds * 1000:.1f} ms]")
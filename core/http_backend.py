@@ -0,0 +1,130 @@
+import os
+import re
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# The create forms post here; override per environment if the routes differ.
+PURCHASE_ORDER_ENDPOINT = os.environ.get("DOLPHIN_PURCHASE_ORDER_ENDPOINT", "/phar/pharmacy/purchase_order/store")
+STOCK_TRANSFER_ENDPOINT = os.environ.get("DOLPHIN_STOCK_TRANSFER_ENDPOINT", "/phar/pharmacy/issuestock/store")
+CSRF_META = re.compile(r'<meta\s+name="csrf-token"\s+content="([^"]*)"')
+CSRF_EXPIRED = 419  # Laravel's "page expired" status for a stale CSRF token
+
+
+class HttpBackendError(RuntimeError):
+    """The application rejected a request or the session is no longer valid."""
+
+
+def purchase_order_payload(record):
+    """Map a PO record (same keys as collect_inputs()) to the create form's fields."""
+    return {
+        "supplier": record.get("supplier"),
+        "store": record.get("store"),
+        "delivery_date": record.get("delivery_date"),
+        "prepared_by": record.get("prepared_by"),
+        "credit_days": record.get("credit_days"),
+        "payment_term": record.get("payment_term"),
+        "cc_charge": record.get("cc_charge"),
+        "discount_on": record.get("discount_on"),
+        "tax_on_free_active": bool(record.get("tax_on_free_active")),
+        "items": [{
+            "catalogue": record.get("catalogue"),
+            "quantity": record.get("unit_quantity"),
+            "bonus": record.get("unit_bonus"),
+            "tax": record.get("tax"),
+            "remarks": record.get("remarks"),
+        }],
+        "terms_condition": record.get("terms_condition"),
+        "remarks": record.get("last_remarks"),
+    }
+
+
+def stock_transfer_payload(record):
+    """Map a stock transfer record (store, item, quantity) to the create form's fields."""
+    return {
+        "store": record.get("store"),
+        "items": [{"item": record.get("item"), "quantity": record.get("quantity")}],
+    }
+
+
+# ----------------------------------------------------------------------
+#  HTTP Backend: submit create forms without a browser
+# ----------------------------------------------------------------------
+class HttpBackend:
+    """
+    Posts create requests straight to the application over one pooled
+    requests.Session, reusing the cookies and CSRF token of a session that
+    was authenticated once through the browser (BaseAutomation.login()).
+    """
+
+    def __init__(self, base_url, cookies, csrf_token=None, auth=None, pool_size=10, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.csrf_token = csrf_token
+        self._csrf_lock = threading.Lock()
+        self.session = requests.Session()
+        # Retry only connection failures: a retried POST could create a record twice
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                              max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.3))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.auth = auth
+        self.session.headers.update({"Accept": "application/json", "X-Requested-With": "XMLHttpRequest"})
+        for c in cookies:
+            self.session.cookies.set(c["name"], c["value"], domain=c.get("domain", ""), path=c.get("path", "/"))
+
+    @classmethod
+    def from_driver(cls, driver, base_url, **kwargs):
+        """Build a backend from a logged-in browser (cookies plus the page's csrf-token meta)."""
+        token = driver.execute_script(
+            "const m = document.querySelector('meta[name=\"csrf-token\"]'); return m ? m.content : null;")
+        return cls(base_url, driver.get_cookies(), csrf_token=token, **kwargs)
+
+    @classmethod
+    def from_state(cls, state, base_url, **kwargs):
+        """Build a backend from a SessionStore state; the CSRF token is fetched on first use."""
+        return cls(base_url, state.get("cookies", []), **kwargs)
+
+    def refresh_csrf(self):
+        """Fetch a fresh CSRF token from the landing page."""
+        response = self.session.get(f"{self.base_url}/", timeout=self.timeout)
+        if "login" in response.url:
+            raise HttpBackendError("Session expired: redirected to the login page.")
+        match = CSRF_META.search(response.text)
+        if not match:
+            raise HttpBackendError("No csrf-token meta tag on the landing page.")
+        self.csrf_token = match.group(1)
+        return self.csrf_token
+
+    def post(self, path, payload):
+        """POST JSON with the CSRF header; refreshes the token once on a 419."""
+        for attempt in range(2):
+            with self._csrf_lock:
+                token = self.csrf_token or self.refresh_csrf()
+            response = self.session.post(f"{self.base_url}{path}", json=payload, timeout=self.timeout,
+                                         headers={"X-CSRF-TOKEN": token})
+            if response.status_code == CSRF_EXPIRED and attempt == 0:
+                with self._csrf_lock:
+                    if self.csrf_token == token:
+                        self.refresh_csrf()
+                continue
+            break
+        if response.status_code == 401 or "login" in response.url:
+            raise HttpBackendError("Session expired: the application asked to log in again.")
+        if response.status_code >= 400:
+            raise HttpBackendError(f"POST {path} failed with {response.status_code}: {response.text[:200]}")
+        try:
+            return response.json()
+        except ValueError:
+            return {}
+
+    def create_purchase_order(self, record):
+        return self.post(PURCHASE_ORDER_ENDPOINT, purchase_order_payload(record))
+
+    def create_stock_transfer(self, record):
+        return self.post(STOCK_TRANSFER_ENDPOINT, stock_transfer_payload(record))
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,160 @@
+import atexit
+import gzip
+import json
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+
+# --- Constants ---
+MAX_BYTES = 10 * 1024 * 1024  # rotate once the active file reaches this size
+BACKUP_COUNT = 5              # rotated .gz files to keep
+BATCH_SIZE = 500              # records written per flush at most
+FLUSH_INTERVAL = 0.5          # seconds between flushes when the queue is quiet
+MAX_QUEUED = 100_000          # records held in memory at most; newer ones are dropped (and counted) beyond it
+ROTATE_LOCK_STALE = 60        # seconds after which a rotation lock is assumed left behind by a crashed process
+
+
+# ----------------------------------------------------------------------
+#  Log Sink: queue-backed JSONL writer running on a background thread
+# ----------------------------------------------------------------------
+class LogSink:
+    def __init__(self, path, max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue = queue.Queue(maxsize=MAX_QUEUED)
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+        self._thread.start()
+
+    def emit(self, msg, worker=None, job=None, step=None, level="info"):
+        """Queue one record; never blocks on disk I/O (drops the record when the queue is full)."""
+        try:
+            self._queue.put_nowait({
+                "ts": time.time(),
+                "level": level,
+                "worker": worker,
+                "job": job,
+                "step": step,
+                "msg": msg,
+            })
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
+    def close(self):
+        """Flush everything queued so far and stop the writer thread."""
+        if not self._thread.is_alive():
+            return  # e.g. a sink inherited through fork: its writer thread only exists in the parent
+        try:
+            self._queue.put(None, timeout=10)
+        except queue.Full:
+            return  # the writer is stuck; records still queued are lost with the process
+        self._thread.join(timeout=10)
+
+    # -----------------------
+    # Writer thread
+    # -----------------------
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                batch = [self._queue.get(timeout=FLUSH_INTERVAL)]
+            except queue.Empty:
+                continue
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stopping = True
+                batch = [record for record in batch if record is not None]
+            with self._dropped_lock:
+                dropped, self._dropped = self._dropped, 0
+            if dropped:
+                batch.append({"ts": time.time(), "level": "warning", "worker": None, "job": None, "step": None,
+                              "msg": f"log sink queue full: {dropped} records dropped"})
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    # Keep the writer alive: a dead thread would leave emit() filling the queue forever
+                    print(f"log-sink: could not write {len(batch)} records to {self.path}: {e}", file=sys.stderr)
+
+    def _write(self, batch):
+        data = "".join(json.dumps(record, ensure_ascii=False, default=str) + "\n"
+                       for record in batch).encode("utf-8")
+        # One O_APPEND write per batch keeps lines whole when several processes share the file
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+        if size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        """
+        app.jsonl -> app.jsonl.1.gz, shifting older archives up and dropping the oldest.
+        Processes sharing the file rotate one at a time under a lock file; a process
+        that finds the lock held skips rotating, the holder is already doing it.
+        """
+        lock = f"{self.path}.rotate.lock"
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            try:
+                if os.path.getmtime(lock) + ROTATE_LOCK_STALE < time.time():
+                    os.remove(lock)  # the next write that crosses max_bytes rotates
+            except OSError:
+                pass
+            return
+        os.close(fd)
+        try:
+            try:
+                if os.path.getsize(self.path) < self.max_bytes:
+                    return  # rotated by another process just before we took the lock
+            except FileNotFoundError:
+                return
+            for i in range(self.backup_count - 1, 0, -1):
+                src = f"{self.path}.{i}.gz"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}.gz")
+            rotating = f"{self.path}.{os.getpid()}.rotating"
+            os.replace(self.path, rotating)  # new writes start a fresh file immediately
+            with open(rotating, "rb") as src, gzip.open(f"{self.path}.1.gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(rotating)
+        finally:
+            os.remove(lock)
+
+
+_sinks = {}
+_sinks_lock = threading.Lock()
+
+
+def _forget_sinks():
+    """In a forked child: inherited sinks have no writer thread, so start over with fresh ones."""
+    global _sinks, _sinks_lock
+    _sinks = {}
+    _sinks_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_sinks)
+
+
+def get_sink(path):
+    """Process-wide sink per file, so every worker thread shares one writer."""
+    with _sinks_lock:
+        sink = _sinks.get(path)
+        if sink is None:
+            sink = _sinks[path] = LogSink(path)
+            atexit.register(sink.close)
+        return sink
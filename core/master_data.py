@@ -0,0 +1,180 @@
+import bisect
+import difflib
+import json
+import os
+import re
+import threading
+import time
+
+MASTER_DATA_DIR = ".master_data"
+MASTER_DATA_TTL = 24 * 60 * 60  # seconds a pulled option list is trusted before pulling it again
+SUGGESTION_CUTOFF = 0.5  # similarity needed for a label to be offered as a suggestion
+
+
+class ResolutionError(LookupError):
+    """No single option label matches the given text; `suggestions` holds the closest labels."""
+
+    def __init__(self, name, text, suggestions=()):
+        self.name = name
+        self.text = text
+        self.suggestions = list(suggestions)
+        hint = f"; did you mean: {', '.join(self.suggestions)}" if self.suggestions else ""
+        super().__init__(f"'{text}' does not match exactly one of the {name}{hint}")
+
+
+class MasterDataError(RuntimeError):
+    """An option list pulled from the app cannot be used (e.g. it came back empty)."""
+
+
+# ----------------------------------------------------------------------
+#  Index: sorted labels for bisect prefix lookup, difflib for fuzzy lookup
+# ----------------------------------------------------------------------
+class MasterDataIndex:
+    def __init__(self, labels):
+        self.labels = sorted({label.strip() for label in labels if label and label.strip()}, key=str.casefold)
+        self._keys = [label.casefold() for label in self.labels]
+        self._by_key = {}
+        for key, label in zip(self._keys, self.labels):
+            self._by_key.setdefault(key, label)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def exact(self, text):
+        """The label equal to `text` ignoring case and surrounding spaces, or None."""
+        return self._by_key.get(text.strip().casefold())
+
+    def prefix(self, text, limit=10):
+        """Labels starting with `text` (case-insensitive), in sorted order."""
+        key = text.strip().casefold()
+        found = []
+        for i in range(bisect.bisect_left(self._keys, key), len(self._keys)):
+            if not self._keys[i].startswith(key) or len(found) >= limit:
+                break
+            found.append(self.labels[i])
+        return found
+
+    def fuzzy(self, text, limit=5, cutoff=SUGGESTION_CUTOFF):
+        """Closest labels by difflib similarity, best first."""
+        keys = difflib.get_close_matches(text.strip().casefold(), self._keys, n=limit, cutoff=cutoff)
+        return [self._by_key[key] for key in keys]
+
+    def resolve(self, text, name="option"):
+        """
+        Exact label for `text`: an exact match, else the only label it is a
+        prefix of. Raises ResolutionError; close matches are only suggested,
+        never picked, so 'Shri Pharma' cannot silently become 'Shree Pharma'.
+        """
+        label = self.exact(text)
+        if label:
+            return label
+        prefixed = self.prefix(text, limit=5)
+        if len(prefixed) == 1:
+            return prefixed[0]
+        raise ResolutionError(name, text, prefixed or self.fuzzy(text))
+
+
+# ----------------------------------------------------------------------
+#  Directory: one lookup list (suppliers, stores, ...) cached per environment
+# ----------------------------------------------------------------------
+class MasterDataDirectory:
+    """
+    Option labels of one app lookup list, pulled from the app once and cached
+    on disk for `ttl` seconds. `fetch` callables return the current labels
+    (e.g. VueMultiselect.options) and are only called when the cache is
+    missing, expired, or does not know the text being resolved.
+    """
+
+    def __init__(self, name, environment, directory=MASTER_DATA_DIR, ttl=MASTER_DATA_TTL,
+                 index_factory=MasterDataIndex):
+        self.name = name
+        self.environment = environment
+        self.directory = directory
+        self.ttl = ttl
+        self.index_factory = index_factory
+        self._index = None
+        self._fetched_at = 0
+        self._pulled = False  # refreshed from the app in this process
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{self.environment}__{self.name}")
+        return os.path.join(self.directory, f"{safe}.json")
+
+    def _fresh(self):
+        return self._index is not None and self._fetched_at + self.ttl > time.time()
+
+    def _load(self):
+        if self._fresh():
+            return self._index
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get("fetched_at", 0) + self.ttl <= time.time() or not cached.get("labels"):
+            return None
+        self._index = self.index_factory(cached.get("labels", []))
+        self._fetched_at = cached["fetched_at"]
+        return self._index
+
+    def store(self, labels):
+        """Replace the cached labels and return the new index."""
+        with self._lock:
+            return self._store(labels)
+
+    def _store(self, labels):
+        index = self.index_factory(labels)
+        if not index:
+            # An empty pull means the widget had not loaded; caching it would reject every value for a day
+            raise MasterDataError(f"Pulled an empty {self.name} list for {self.environment}; not caching it")
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"name": self.name, "environment": self.environment, "fetched_at": time.time(),
+                       "labels": index.labels}, f)
+        os.replace(tmp, self.path)
+        self._index, self._fetched_at, self._pulled = index, time.time(), True
+        return index
+
+    def index(self, fetch=None):
+        """The cached index, pulled via `fetch` when missing or expired. None without cache or fetch."""
+        with self._lock:
+            index = self._load()
+            if index is None and fetch is not None:
+                index = self._store(fetch())
+            return index
+
+    def labels(self):
+        """Cached labels without touching the app ([] when nothing fresh is cached)."""
+        index = self.index()
+        return index.labels if index else []
+
+    def resolve(self, text, fetch=None):
+        """
+        Exact option label for `text` (see MasterDataIndex.resolve). A miss on an
+        older cache is retried once against a fresh pull when `fetch` is given.
+        """
+        index = self.index(fetch)
+        if index is None:
+            raise ResolutionError(self.name, text)
+        try:
+            return index.resolve(text, self.name)
+        except ResolutionError:
+            if fetch is None or self._pulled:
+                raise
+            return self.store(fetch()).resolve(text, self.name)
+
+
+_directories = {}
+_directories_guard = threading.Lock()
+
+
+def get_directory(name, environment, directory=MASTER_DATA_DIR, ttl=MASTER_DATA_TTL, index_factory=MasterDataIndex):
+    """Process-wide directory for `name`, shared by all workers so it is pulled only once."""
+    key = (name, environment, directory)
+    with _directories_guard:
+        if key not in _directories:
+            _directories[key] = MasterDataDirectory(name, environment, directory, ttl, index_factory)
+        return _directories[key]
@@ -0,0 +1,138 @@
+import functools
+import inspect
+import threading
+import time
+from collections import defaultdict
+
+WORKFLOW_TOTAL = "(workflow)"  # step name used for whole-job durations
+# Job entry points: only their outermost call counts as a workflow run (not init_driver, login, quit...)
+WORKFLOW_ENTRY_POINTS = {"load_dashboard", "create_purchase_order", "add_transfer_line", "run", "run_plan",
+                         "scrape_purchase_orders"}
+UNTIMED_METHODS = {"log", "log_error", "pause", "wait_until", "wait_for_network_idle"}  # these time themselves or are noise
+
+
+# ----------------------------------------------------------------------
+#  Step Metrics: per workflow/step latency samples with percentiles
+# ----------------------------------------------------------------------
+class StepMetrics:
+    def __init__(self):
+        self._samples = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def record(self, workflow, step, seconds):
+        with self._lock:
+            self._samples[(workflow, step)].append(seconds)
+
+    def samples(self):
+        """Flat (workflow, step, seconds) list, e.g. to ship from a worker process."""
+        with self._lock:
+            return [(w, s, v) for (w, s), values in self._samples.items() for v in values]
+
+    def merge(self, samples):
+        for workflow, step, seconds in samples:
+            self.record(workflow, step, seconds)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self):
+        """Rows of (workflow, step, count, p50, p95, p99, total), slowest total first per workflow."""
+        with self._lock:
+            items = {k: sorted(v) for k, v in self._samples.items()}
+        rows = [
+            (workflow, step, len(values), percentile(values, 50), percentile(values, 95),
+             percentile(values, 99), sum(values))
+            for (workflow, step), values in items.items()
+        ]
+        return sorted(rows, key=lambda r: (r[0], r[1] != WORKFLOW_TOTAL, -r[6]))
+
+    def format_summary(self):
+        rows = self.summary()
+        if not rows:
+            return "No step timings recorded."
+        header = f"{'workflow':<22} {'step':<34} {'n':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'total':>9}"
+        lines = ["Step latency summary (seconds)", header, "-" * len(header)]
+        for workflow, step, n, p50, p95, p99, total in rows:
+            lines.append(f"{workflow:<22} {step[:34]:<34} {n:>5} {p50:>8.3f} {p95:>8.3f} {p99:>8.3f} {total:>9.2f}")
+        return "\n".join(lines)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-pct * len(sorted_values) // 100))  # ceil without floats
+    return sorted_values[int(rank) - 1]
+
+
+METRICS = StepMetrics()
+
+
+# ----------------------------------------------------------------------
+#  Automatic instrumentation
+# ----------------------------------------------------------------------
+def timed_step(func):
+    """Time a workflow method and tag log records with it as the current step."""
+    entry_point = func.__name__ in WORKFLOW_ENTRY_POINTS
+
+    def enter(self):
+        outermost = entry_point and not getattr(self, "in_workflow", False)
+        if outermost:
+            self.in_workflow = True
+        return outermost
+
+    def record(self, outermost, elapsed):
+        workflow = type(self).__name__
+        METRICS.record(workflow, func.__name__, elapsed)
+        if outermost:
+            METRICS.record(workflow, WORKFLOW_TOTAL, elapsed)
+            self.in_workflow = False
+
+    if inspect.isgeneratorfunction(func):
+        # Generators run while the caller iterates: time from first to last item
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            outermost = enter(self)
+            start = time.perf_counter()
+            try:
+                yield from func(self, *args, **kwargs)
+            finally:
+                record(self, outermost, time.perf_counter() - start)
+    else:
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            previous = getattr(self, "current_step", None)
+            self.current_step = func.__name__
+            outermost = enter(self)
+            start = time.perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                record(self, outermost, time.perf_counter() - start)
+                self.current_step = previous
+    wrapper.__timed__ = True
+    return wrapper
+
+
+def instrument_class(cls):
+    """Wrap every public method defined directly on cls with timed_step."""
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or name in UNTIMED_METHODS:
+            continue
+        if callable(attr) and not isinstance(attr, (staticmethod, classmethod, type)) \
+                and not getattr(attr, "__timed__", False):
+            setattr(cls, name, timed_step(attr))
+    return cls
+
+
+def condition_name(condition):
+    """Readable label for a wait condition (function factory, EC predicate or object)."""
+    qualname = getattr(condition, "__qualname__", None)
+    if qualname:
+        return qualname.split(".<locals>")[0]
+    return type(condition).__name__
+
+
+def record_wait(owner, condition, seconds):
+    METRICS.record(type(owner).__name__, f"wait:{condition_name(condition)}", seconds)
@@ -0,0 +1,190 @@
+from selenium.webdriver.remote.webelement import WebElement
+
+DEFAULT_TIMEOUT = 10
+
+
+class MultiselectError(LookupError):
+    """The multiselect or the requested option could not be found."""
+
+
+# ----------------------------------------------------------------------
+#  Vue Multiselect: open, search, wait and select in one async script
+# ----------------------------------------------------------------------
+# Locates the widget, types the query, polls until an option matching the
+# label renders and clicks it, all inside the page. One WebDriver round trip
+# per call instead of locate/click/focus/send_keys/ENTER plus sleeps.
+FIND_ROOT = """
+const EMPTY = ['No elements found', 'List is empty', 'No results'];
+
+function findRoot(target) {
+    let el = null;
+    if (target.element) { el = target.element; }
+    else if (target.css) { el = document.querySelector(target.css); }
+    else if (target.input_id) { el = document.getElementById(target.input_id); }
+    else if (target.name) { el = document.querySelector('input.multiselect__input[name="' + target.name + '"]'); }
+    else if (target.placeholder) { el = document.querySelector('input.multiselect__input[placeholder="' + target.placeholder + '"]'); }
+    else if (target.single) {
+        el = Array.from(document.querySelectorAll('.multiselect__single'))
+            .find(s => s.textContent.trim() === target.single) || null;
+    } else if (target.label) {
+        el = document.evaluate("//label[contains(., '" + target.label + "')]/following::div[contains(@class,'multiselect')][1]",
+            document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    if (!el) { return null; }
+    return el.classList.contains('multiselect') ? el : (el.closest('.multiselect') || el.querySelector('.multiselect'));
+}
+
+function visibleOptions(root) {
+    return Array.from(root.querySelectorAll('.multiselect__content .multiselect__option'))
+        .filter(o => o.offsetParent !== null)
+        .map(o => ({el: o, text: o.textContent.trim()}))
+        .filter(o => o.text && !EMPTY.some(e => o.text.indexOf(e) !== -1));
+}
+
+"""
+
+SELECT_SCRIPT = """
+const target = arguments[0], labels = arguments[1], queries = arguments[2],
+      match = arguments[3], timeoutMs = arguments[4], done = arguments[arguments.length - 1];
+const deadline = Date.now() + timeoutMs;
+
+function pick(options, label) {
+    const wanted = label.trim().toLowerCase();
+    if (match === 'first') { return options[0]; }
+    if (match === 'prefix') { return options.find(o => o.text.toLowerCase().startsWith(wanted)); }
+    if (match === 'contains') { return options.find(o => o.text.toLowerCase().indexOf(wanted) !== -1); }
+    return options.find(o => o.text === label.trim());
+}
+
+function open(root, input) {
+    input.focus();
+    const wrapper = root.querySelector('.multiselect__content-wrapper');
+    if (wrapper && wrapper.offsetParent === null) {
+        const tags = root.querySelector('.multiselect__tags');
+        if (tags) { tags.click(); }
+    }
+}
+
+function selectNext(root, input, index, selected) {
+    if (index >= labels.length) { done({selected: selected}); return; }
+    open(root, input);
+    input.style.display = 'block';
+    input.value = queries[index];
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+    (function poll() {
+        const options = visibleOptions(root);
+        const option = pick(options, labels[index]);
+        if (option) {
+            option.el.dispatchEvent(new MouseEvent('mousedown', {bubbles: true}));
+            option.el.click();
+            selected.push(option.text);
+            setTimeout(() => selectNext(root, input, index + 1, selected), 0);
+        } else if (Date.now() > deadline) {
+            done({error: "No option matching '" + labels[index] + "' (" + match + ")",
+                  options: options.map(o => o.text).slice(0, 20), selected: selected});
+        } else {
+            setTimeout(poll, 25);
+        }
+    })();
+}
+
+(function waitForRoot() {
+    const root = findRoot(target);
+    const input = root && root.querySelector('.multiselect__input');
+    if (input) { selectNext(root, input, 0, []); }
+    else if (Date.now() > deadline) { done({error: 'Multiselect not found: ' + JSON.stringify(target)}); }
+    else { setTimeout(waitForRoot, 50); }
+})();
+"""
+
+# Reads every option label of a widget: from the component's `options` prop
+# when the Vue instance is reachable, otherwise by opening the dropdown and
+# collecting the rendered options. Reports an error if neither ever fills.
+OPTIONS_SCRIPT = """
+const target = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+const deadline = Date.now() + timeoutMs;
+
+function optionLabel(vm, option) {
+    if (typeof option !== 'object' || option === null) { return String(option); }
+    if (vm.getOptionLabel) { return String(vm.getOptionLabel(option)); }
+    return String(vm.label ? option[vm.label] : JSON.stringify(option));
+}
+
+(function waitForRoot() {
+    const root = findRoot(target);
+    const input = root && root.querySelector('.multiselect__input');
+    if (!input) {
+        if (Date.now() > deadline) { done({error: 'Multiselect not found: ' + JSON.stringify(target)}); }
+        else { setTimeout(waitForRoot, 50); }
+        return;
+    }
+    const vm = root.__vue__;
+    input.focus();
+    (function poll() {
+        // An empty list usually means async options have not arrived yet: keep polling, never report it
+        if (vm && Array.isArray(vm.options) && vm.options.length) {
+            input.blur();
+            done({options: vm.options.map(o => optionLabel(vm, o)), source: 'vue'});
+            return;
+        }
+        const options = visibleOptions(root);
+        if (options.length) {
+            input.blur();
+            done({options: options.map(o => o.text), source: 'rendered'});
+        } else if (Date.now() > deadline) {
+            input.blur();
+            done({error: 'No options loaded for ' + JSON.stringify(target)});
+        } else {
+            setTimeout(poll, 50);
+        }
+    })();
+})();
+"""
+
+
+class VueMultiselect:
+    """
+    Shared driver for vue-multiselect widgets.
+
+    `target` identifies the widget and may be a WebElement or a dict with one of:
+    name, placeholder, input_id, css, single (text of .multiselect__single), label
+    (text of the preceding <label>).
+
+    `match` decides which rendered option is clicked: "exact" (label text,
+    default), "prefix" or "contains" (case-insensitive) or "first".
+    """
+
+    def __init__(self, driver, timeout=DEFAULT_TIMEOUT):
+        self.driver = driver
+        self.timeout = timeout
+
+    def select(self, target, label, query=None, match="exact"):
+        """Select one option and return its rendered label."""
+        return self.select_many(target, [label], [query] if query else None, match)[0]
+
+    def select_many(self, target, labels, queries=None, match="exact"):
+        """Select several options (multi-select widgets) in the same round trip."""
+        if not labels:
+            return []
+        if isinstance(target, WebElement):
+            target = {"element": target}
+        queries = queries or labels
+        self.driver.set_script_timeout(self.timeout * len(labels) + 5)
+        result = self.driver.execute_async_script(
+            FIND_ROOT + SELECT_SCRIPT, target, list(labels), list(queries), match, int(self.timeout * 1000))
+        if result.get("error"):
+            options = result.get("options")
+            raise MultiselectError(result["error"] + (f"; rendered options: {options}" if options else ""))
+        return result["selected"]
+
+    def options(self, target):
+        """Every option label the widget currently holds (remote-search widgets only hold the last results)."""
+        if isinstance(target, WebElement):
+            target = {"element": target}
+        self.driver.set_script_timeout(self.timeout + 5)
+        result = self.driver.execute_async_script(FIND_ROOT + OPTIONS_SCRIPT, target, int(self.timeout * 1000))
+        if result.get("error"):
+            raise MultiselectError(result["error"])
+        if not result["options"]:
+            raise MultiselectError(f"Multiselect {target} holds no options")
+        return result["options"]
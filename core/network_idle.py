@@ -0,0 +1,96 @@
+import json
+import time
+from selenium.common.exceptions import WebDriverException
+
+# --- Network idle ---
+# Chrome writes CDP Network.* events to the "performance" log when the driver
+# is created with PERFORMANCE_LOGGING (see chrome_profiles.build_chrome_options).
+# Reading that log lets a wait return as soon as the page's XHR/fetch traffic
+# has been quiet for a short window instead of sleeping a fixed time.
+PERFORMANCE_LOGGING = {"performance": "ALL"}
+PERF_LOGGING_PREFS = {"enableNetwork": True, "enablePage": False}
+TRACKED_TYPES = ("XHR", "Fetch")
+QUIET_WINDOW = 0.5  # seconds without XHR/fetch activity that count as idle
+STALE_REQUEST = 15.0  # long-polls and hung requests stop blocking after this long
+NETWORK_POLL = 0.05  # how often wait_for_network_idle drains the log
+
+
+class NetworkTracker:
+    """In-flight XHR/fetch requests of one driver, fed from its performance log."""
+
+    def __init__(self, driver, types=TRACKED_TYPES):
+        self.driver = driver
+        self.types = types
+        self.inflight = {}  # requestId -> (url, started)
+        self.last_activity = time.time()
+        self.available = True
+
+    def poll(self):
+        """Drain the performance log and update the in-flight set."""
+        if not self.available:
+            return
+        try:
+            entries = self.driver.get_log("performance")
+        except WebDriverException:
+            self.available = False  # driver was created without performance logging
+            return
+        now = time.time()
+        for entry in entries:
+            at = entry.get("timestamp", now * 1000) / 1000.0  # when Chrome saw the event, not when we read it
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method, params = message.get("method"), message.get("params", {})
+            request_id = params.get("requestId")
+            if method == "Network.requestWillBeSent" and params.get("type") in self.types:
+                self.inflight[request_id] = (params.get("request", {}).get("url"), at)
+                self.last_activity = max(self.last_activity, at)
+            elif method in ("Network.loadingFinished", "Network.loadingFailed") and request_id in self.inflight:
+                del self.inflight[request_id]
+                self.last_activity = max(self.last_activity, at)
+        for request_id, (_, started) in list(self.inflight.items()):
+            if now - started > STALE_REQUEST:
+                del self.inflight[request_id]
+
+    def idle_for(self, since):
+        """Seconds the network has been quiet, counting from `since` at the earliest."""
+        if self.inflight:
+            return 0.0
+        return time.time() - max(self.last_activity, since)
+
+
+def tracker_for(driver):
+    """The driver's NetworkTracker (one per driver, since reading the log drains it)."""
+    tracker = getattr(driver, "_network_tracker", None)
+    if tracker is None:
+        tracker = driver._network_tracker = NetworkTracker(driver)
+    return tracker
+
+
+def reset_tracker(driver):
+    """
+    Drain the driver's performance log and drop its tracker, so a pooled driver
+    starts its next lease without the previous job's buffered events or requests.
+    """
+    driver.__dict__.pop("_network_tracker", None)
+    try:
+        driver.get_log("performance")
+    except WebDriverException:
+        pass  # driver was created without performance logging
+
+
+def network_idle(quiet=QUIET_WINDOW):
+    """
+    No XHR/fetch in flight and none started or finished for `quiet` seconds.
+
+    The quiet window is measured from when the condition is created at the
+    earliest, so requests fired shortly after an action are still waited for.
+    """
+    since = time.time()
+
+    def condition(driver):
+        tracker = tracker_for(driver)
+        tracker.poll()
+        return tracker.idle_for(since) >= quiet
+    return condition
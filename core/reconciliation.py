@@ -0,0 +1,173 @@
+from collections import namedtuple
+
+from core.datatables import snake_case
+
+ReconciliationReport = namedtuple("ReconciliationReport", "matched missing duplicated mismatched")
+ReconciliationReport.__doc__ = """
+matched: [ref] ledger entries found exactly as recorded
+missing: [ref] ledger entries with no row in the target list
+duplicated: [(ref, [rows])] more rows share the entry's key than the ledger created
+mismatched: [(ref, {field: (expected, actual)})] found, but compared fields differ
+"""
+
+
+# ----------------------------------------------------------------------
+#  Bulk scrape: every rendered row of a table in one script call
+# ----------------------------------------------------------------------
+TABLE_ROWS_SCRIPT = """
+const table = document.querySelector(arguments[0]);
+if (!table) { return null; }
+const head = Array.from(table.querySelectorAll('thead th')).map(th => th.textContent.trim());
+return {head: head, rows: Array.from(table.querySelectorAll('tbody tr'))
+    .map(tr => Array.from(tr.children).map(td => td.textContent.trim()))};
+"""
+
+
+def rendered_rows(driver, selector, columns=None):
+    """
+    Rows currently rendered in a plain HTML table as dicts, keyed by the
+    snake_cased header cells, else `columns` (for tables without a <thead>),
+    else column_<n>. Placeholder rows (a single cell, e.g. 'No Employee Found')
+    are skipped.
+    """
+    table = driver.execute_script(TABLE_ROWS_SCRIPT, selector)
+    if table is None:
+        raise LookupError(f"Table not found: {selector}")
+    names = [snake_case(h) for h in table["head"]] or list(columns or [])
+    rows = []
+    for cells in table["rows"]:
+        if len(cells) <= 1 < len(names):
+            continue
+        rows.append({(names[i] if i < len(names) else f"column_{i}"): cell for i, cell in enumerate(cells)})
+    return rows
+
+
+# ----------------------------------------------------------------------
+#  Full data source: every row behind a paged list in one script call
+# ----------------------------------------------------------------------
+# Fetches the list's JSON endpoint inside the page (so the browser session
+# authenticates it) and follows paginator links until the last page.
+SOURCE_ROWS_SCRIPT = """
+const url = arguments[0], done = arguments[arguments.length - 1];
+const rows = [];
+function get(next) {
+    fetch(next, {credentials: 'same-origin', headers: {'Accept': 'application/json', 'X-Requested-With': 'XMLHttpRequest'}})
+        .then(r => r.ok ? r.json() : Promise.reject(new Error('HTTP ' + r.status)))
+        .then(body => {
+            if (Array.isArray(body)) { rows.push(...body); done({rows: rows}); return; }
+            rows.push(...(body.data || []));
+            const following = body.next_page_url || (body.links && body.links.next);
+            if (following) { get(following); } else { done({rows: rows}); }
+        })
+        .catch(e => done({error: String(e)}));
+}
+get(url);
+"""
+
+
+def source_rows(driver, endpoint, timeout=60, required=()):
+    """
+    Every row of a list's JSON data source: a plain array, {data: [...]} or a
+    paginator ({data, next_page_url} / {data, links: {next}}) read to its end.
+    Raises LookupError when the request fails, or when `required` fields are given
+    and the source returns no rows or rows without them (not the list's source).
+    """
+    driver.set_script_timeout(timeout)
+    result = driver.execute_async_script(SOURCE_ROWS_SCRIPT, endpoint)
+    if result.get("error"):
+        raise LookupError(f"Data source {endpoint} failed: {result['error']}")
+    rows = result["rows"]
+    if required:
+        if not rows:
+            raise LookupError(f"Data source {endpoint} returned no rows")
+        missing = [name for name in required if any(not isinstance(row, dict) or name not in row for row in rows)]
+        if missing:
+            raise LookupError(f"Data source {endpoint} rows lack {', '.join(missing)}")
+    return rows
+
+
+# ----------------------------------------------------------------------
+#  Hash index and diff against the batch ledger
+# ----------------------------------------------------------------------
+def normalise(value):
+    return "" if value is None else " ".join(str(value).split()).casefold()
+
+
+def field_pairs(spec):
+    """('a', 'b') or {'ledger_field': 'row_field'} -> [(ledger_field, row_field)]."""
+    return list(spec.items()) if isinstance(spec, dict) else [(name, name) for name in spec]
+
+
+def build_index(rows, fields):
+    """{normalised key: [rows]} over the row-side names of `fields`."""
+    index = {}
+    for row in rows:
+        index.setdefault(tuple(normalise(row.get(name)) for name in fields), []).append(row)
+    return index
+
+
+def differences(record, row, compare_pairs):
+    """{ledger_field: (expected, actual)} for the compared fields that disagree."""
+    return {ledger_field: (record.get(ledger_field), row.get(row_field))
+            for ledger_field, row_field in compare_pairs
+            if normalise(record.get(ledger_field)) != normalise(row.get(row_field))}
+
+
+def pair_best(entries, rows, compare_pairs):
+    """
+    Pair [(ref, record)] with rows sharing their key, best agreement on the
+    compared fields first, so two entries for one supplier are not diffed
+    against each other's rows. Returns ([(ref, record, row)], [unpaired ref]).
+    """
+    scored = sorted(((len(differences(record, row, compare_pairs)), i, j)
+                     for i, (_, record) in enumerate(entries) for j, row in enumerate(rows)))
+    paired, used_entries, used_rows = [], set(), set()
+    for _, i, j in scored:
+        if i not in used_entries and j not in used_rows:
+            used_entries.add(i)
+            used_rows.add(j)
+            paired.append((entries[i][0], entries[i][1], rows[j]))
+    return paired, [ref for i, (ref, _) in enumerate(entries) if i not in used_entries]
+
+
+def reconcile(ledger, rows, key, compare=()):
+    """
+    Diff the batch ledger ([(ref, record)]) against the rows scraped from the
+    target list. `key` and `compare` name the fields to match on and to check,
+    as a tuple of shared names or a {ledger_field: row_field} dict. Entries
+    sharing a key are paired with its rows by best match (see pair_best).
+    """
+    key_pairs, compare_pairs = field_pairs(key), field_pairs(compare)
+    index = build_index(rows, [row_field for _, row_field in key_pairs])
+    expected = {}
+    for ref, record in ledger:
+        expected.setdefault(tuple(normalise(record.get(f)) for f, _ in key_pairs), []).append((ref, record))
+
+    report = ReconciliationReport([], [], [], [])
+    for k, entries in expected.items():
+        found = index.get(k, [])
+        if len(found) > len(entries):
+            report.duplicated.extend((ref, found) for ref, _ in entries)
+            continue
+        paired, unpaired = pair_best(entries, found, compare_pairs)
+        report.missing.extend(unpaired)
+        for ref, record, row in paired:
+            diffs = differences(record, row, compare_pairs)
+            if diffs:
+                report.mismatched.append((ref, diffs))
+            else:
+                report.matched.append(ref)
+    return report
+
+
+def format_reconciliation(report, name="records"):
+    lines = [f"Reconciliation of {name}: {len(report.matched)} matched, {len(report.missing)} missing, "
+             f"{len(report.duplicated)} duplicated, {len(report.mismatched)} mismatched"]
+    for ref in report.missing:
+        lines.append(f"  missing: {ref}")
+    for ref, found in report.duplicated:
+        lines.append(f"  duplicated: {ref} ({len(found)} rows)")
+    for ref, diffs in report.mismatched:
+        details = "; ".join(f"{field} expected {exp!r}, found {act!r}" for field, (exp, act) in diffs.items())
+        lines.append(f"  mismatched: {ref}: {details}")
+    return "\n".join(lines)
@@ -0,0 +1,94 @@
+import heapq
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core.reconciliation import normalise
+
+
+# ----------------------------------------------------------------------
+#  Affinity planning: keep jobs that share page state on the same worker
+# ----------------------------------------------------------------------
+def affinity_key(record, fields):
+    """Normalised values of `fields` (e.g. workflow, store, supplier) shared by jobs that can reuse a page."""
+    return tuple(normalise(record.get(field)) for field in fields)
+
+
+def plan_affinity(jobs, workers, fields):
+    """
+    Split [(index, record)] into one queue per worker. Jobs with the same
+    affinity key stay together (groups bigger than a fair share are cut into
+    fair-share chunks), chunks go to the least-loaded worker, biggest first,
+    and every queue is ordered by key so related groups run back to back.
+    """
+    groups = {}
+    for job in jobs:
+        groups.setdefault(affinity_key(job[1], fields), []).append(job)
+    share = max(1, math.ceil(len(jobs) / max(1, workers)))
+    chunks = [(key, group[i:i + share]) for key, group in groups.items() for i in range(0, len(group), share)]
+    chunks.sort(key=lambda chunk: len(chunk[1]), reverse=True)
+
+    loads = [(0, w) for w in range(max(1, workers))]
+    queues = [[] for _ in loads]
+    for key, chunk in chunks:
+        load, w = heapq.heappop(loads)
+        queues[w].append((key, chunk))
+        heapq.heappush(loads, (load + len(chunk), w))
+    return [[job for _, chunk in sorted(queue, key=lambda c: c[0]) for job in chunk] for queue in queues if queue]
+
+
+def switches(queue, fields):
+    """Number of affinity key changes along a queue (what a worker has to re-establish)."""
+    keys = [affinity_key(record, fields) for _, record in queue]
+    return sum(1 for a, b in zip(keys, keys[1:]) if a != b) + (1 if keys else 0)
+
+
+def failed_result(index, error):
+    """Result row for a job that could not run (its worker failed to open or it raised)."""
+    return {"index": index, "status": "failed", "duration": 0, "error": f"{type(error).__name__}: {error}"}
+
+
+def run_queues(queues, open_worker, run_job, on_result=None):
+    """
+    Run each queue on its own thread with one long-lived worker (e.g. a logged-in
+    bot from open_worker(n)); run_job(worker, index, record) returns a result
+    dict, passed to on_result as it completes. Workers are closed with quit().
+    A job covering several records has a tuple index and returns a list of rows.
+    A worker that fails to open fails its own queue's jobs, not the whole run.
+    """
+    results = []
+    lock = threading.Lock()
+
+    def emit(result):
+        with lock:
+            for row in (result if isinstance(result, list) else [result]):
+                results.append(row)
+                if on_result:
+                    on_result(row)
+
+    def fail(index, error):
+        emit([failed_result(i, error) for i in (index if isinstance(index, tuple) else (index,))])
+
+    def drain(n, queue):
+        try:
+            worker = open_worker(n)
+        except Exception as e:
+            for index, _ in queue:
+                fail(index, e)
+            return
+        try:
+            for index, record in queue:
+                try:
+                    emit(run_job(worker, index, record))
+                except Exception as e:
+                    fail(index, e)
+        finally:
+            try:
+                worker.quit()
+            except Exception as e:
+                print(f"Worker {n} did not quit cleanly: {e}")
+
+    with ThreadPoolExecutor(max_workers=max(1, len(queues))) as executor:
+        for future in [executor.submit(drain, n, queue) for n, queue in enumerate(queues)]:
+            future.result()
+    return results
@@ -0,0 +1,155 @@
+import json
+import os
+import re
+import threading
+import time
+
+SESSION_DIR = ".sessions"
+SESSION_TTL = 8 * 60 * 60  # seconds a saved login is trusted before logging in again
+LOCK_STALE = 120  # seconds after which a login lock file is assumed left behind by a crashed process
+LOCK_POLL = 0.2
+
+
+# ----------------------------------------------------------------------
+#  Login Lock: one login per user/environment across threads and processes
+# ----------------------------------------------------------------------
+class LoginLock:
+    """
+    Thread lock plus an O_CREAT|O_EXCL lock file next to the session file, so
+    with --mode process only one process logs in while the others wait and
+    then restore the session it saved.
+    """
+
+    def __init__(self, path, stale=LOCK_STALE):
+        self.path = path
+        self.stale = stale
+        self._thread_lock = threading.Lock()
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        try:
+            while True:
+                try:
+                    fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+                except FileExistsError:
+                    self._break_if_stale()
+                    time.sleep(LOCK_POLL)
+                    continue
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                return self
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+    def __exit__(self, *exc):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        finally:
+            self._thread_lock.release()
+
+    def _break_if_stale(self):
+        try:
+            if os.path.getmtime(self.path) + self.stale < time.time():
+                os.remove(self.path)
+        except OSError:
+            pass  # released (or broken) by someone else meanwhile
+
+
+# ----------------------------------------------------------------------
+#  Session Store: persists authenticated cookies + localStorage on disk
+# ----------------------------------------------------------------------
+class SessionStore:
+    def __init__(self, directory=SESSION_DIR, ttl=SESSION_TTL):
+        self.directory = directory
+        self.ttl = ttl
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, username, environment):
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{environment}__{username}")
+        return os.path.join(self.directory, f"{safe}.json")
+
+    def lock(self, username, environment):
+        """Per user/environment lock so parallel workers (threads or processes) log in only once."""
+        key = (username, environment)
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = LoginLock(f"{self.path(username, environment)}.lock")
+            return self._locks[key]
+
+    def load(self, username, environment):
+        """Return the saved state, or None when missing or expired."""
+        try:
+            with open(self.path(username, environment), encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("expires_at", 0) <= time.time():
+            self.invalidate(username, environment)
+            return None
+        return state
+
+    def save(self, driver, username, environment):
+        """Capture cookies (via CDP, including HttpOnly ones) and localStorage."""
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        local_storage = driver.execute_script(
+            "const out = {};"
+            "for (let i = 0; i < localStorage.length; i++) {"
+            "  const k = localStorage.key(i); out[k] = localStorage.getItem(k);"
+            "}"
+            "return out;"
+        )
+        state = {
+            "username": username,
+            "environment": environment,
+            "saved_at": time.time(),
+            "expires_at": time.time() + self.ttl,
+            "cookies": cookies,
+            "local_storage": local_storage or {},
+        }
+        path = self.path(username, environment)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, path)  # atomic, so readers never see a half-written file
+        return state
+
+    def invalidate(self, username, environment):
+        try:
+            os.remove(self.path(username, environment))
+        except OSError:
+            pass
+
+
+def restore_session(driver, state, landing_url, login_marker="login"):
+    """
+    Load a saved session into the driver and open landing_url.
+
+    Returns True when the app accepted the session, False when it bounced
+    the browser back to the login page.
+    """
+    cookies = []
+    for c in state.get("cookies", []):
+        cookie = {k: v for k, v in c.items() if k in (
+            "name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")}
+        if cookie.get("expires", 0) < 0:
+            del cookie["expires"]  # session cookie
+        cookies.append(cookie)
+    driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+
+    local_storage = state.get("local_storage") or {}
+    if local_storage:
+        # localStorage is per origin, so we need a page on the app's origin first
+        driver.get(landing_url)
+        driver.execute_script(
+            "const items = arguments[0];"
+            "for (const k in items) { localStorage.setItem(k, items[k]); }",
+            local_storage,
+        )
+    driver.get(landing_url)
+    return login_marker not in driver.current_url
@@ -0,0 +1,149 @@
+import datetime
+import math
+import re
+from collections import namedtuple
+
+from core.master_data import ResolutionError
+
+PERCENT = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*%?\s*$")
+TRUE_VALUES = ("1", "true", "yes", "y", "on")
+FALSE_VALUES = ("0", "false", "no", "n", "off", "")
+
+ValidationReport = namedtuple("ValidationReport", "valid rejected fixed")
+ValidationReport.__doc__ = """
+valid: [(index, record)] ready to schedule (fixes applied)
+rejected: [(index, record, [errors])]
+fixed: [(index, [changes])] for records that were corrected
+"""
+
+
+# ----------------------------------------------------------------------
+#  Checks: value in, normalised value out, ValueError when unusable
+# ----------------------------------------------------------------------
+def required(value):
+    if value is None or (isinstance(value, str) and not value.strip()):
+        raise ValueError("is required")
+    return value.strip() if isinstance(value, str) else value
+
+
+def choice(*options):
+    """One of `options`, matched case-insensitively and returned in its canonical spelling."""
+    canonical = {str(option).casefold(): option for option in options}
+
+    def check(value):
+        try:
+            return canonical[str(value).strip().casefold()]
+        except KeyError:
+            raise ValueError(f"must be one of {', '.join(map(str, options))} (got {value!r})") from None
+    return check
+
+
+def integer(minimum=None, maximum=None):
+    """Whole number within the bounds, returned as text the way the form fields hold it."""
+    def check(value):
+        try:
+            number = float(str(value).strip())
+        except ValueError:
+            raise ValueError(f"must be a number (got {value!r})") from None
+        if not math.isfinite(number):  # 'inf'/'nan' parse as floats but int() would raise
+            raise ValueError(f"must be a finite number (got {value!r})")
+        if number != int(number):
+            raise ValueError(f"must be a whole number (got {value!r})")
+        if minimum is not None and number < minimum:
+            raise ValueError(f"must be at least {minimum} (got {value!r})")
+        if maximum is not None and number > maximum:
+            raise ValueError(f"must be at most {maximum} (got {value!r})")
+        return str(int(number))
+    return check
+
+
+def iso_date(value):
+    """YYYY-MM-DD; dates and datetimes are formatted."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.strftime("%Y-%m-%d")
+    try:
+        return datetime.date.fromisoformat(str(value).strip()).isoformat()
+    except ValueError:
+        raise ValueError(f"must be a YYYY-MM-DD date (got {value!r})") from None
+
+
+def percent(value):
+    """Percentage between 0 and 100 as 'N%' ('13' and ' 13 % ' become '13%')."""
+    match = PERCENT.match(str(value))
+    if not match or float(match.group(1)) > 100:
+        raise ValueError(f"must be a percentage such as 13% (got {value!r})")
+    return f"{match.group(1)}%"
+
+
+def boolean(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES or text in FALSE_VALUES:
+        return text in TRUE_VALUES
+    raise ValueError(f"must be yes/no (got {value!r})")
+
+
+def master(directory):
+    """
+    Exact option label from a cached MasterDataDirectory (see core.master_data).
+    Never touches the app: with nothing (or an empty list) cached the value passes unchanged.
+    """
+    def check(value):
+        index = directory.index()
+        if not index:
+            return value
+        try:
+            return index.resolve(str(value), directory.name)
+        except ResolutionError as e:
+            raise ValueError(str(e)) from None
+    return check
+
+
+# ----------------------------------------------------------------------
+#  Record and batch validation
+# ----------------------------------------------------------------------
+def validate_record(record, rules):
+    """
+    Run `rules` ({field: (check, ...)}) over one record. Empty fields are
+    skipped unless their checks start with `required`.
+    Returns (fixed record, [changes], [errors]).
+    """
+    fixed, changes, errors = dict(record), [], []
+    for field, checks in rules.items():
+        original = value = record.get(field)
+        if (value is None or value == "") and required not in checks:
+            continue
+        try:
+            for check in checks:
+                value = check(value)
+        except ValueError as e:
+            errors.append(f"{field} {e}")
+            continue
+        if value != original:
+            fixed[field] = value
+            changes.append(f"{field}: {original!r} -> {value!r}")
+    return fixed, changes, errors
+
+
+def validate_records(records, rules):
+    """Validate a whole batch in memory before anything is scheduled."""
+    report = ValidationReport([], [], [])
+    for index, record in enumerate(records):
+        fixed, changes, errors = validate_record(record, rules)
+        if errors:
+            report.rejected.append((index, record, errors))
+            continue
+        if changes:
+            report.fixed.append((index, changes))
+        report.valid.append((index, fixed))
+    return report
+
+
+def format_report(report):
+    lines = [f"Validation: {len(report.valid)} valid ({len(report.fixed)} fixed), {len(report.rejected)} rejected"]
+    for index, changes in report.fixed:
+        lines.append(f"  record {index} fixed: {'; '.join(changes)}")
+    for index, _, errors in report.rejected:
+        lines.append(f"  record {index} rejected: {'; '.join(errors)}")
+    return "\n".join(lines)
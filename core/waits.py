@@ -0,0 +1,99 @@
+import os
+import time
+
+# --- Pacing profiles ---
+# Multiplier applied to every unconditional pause. "demo" keeps the visible
+# delays used when watching a run; "fast" drops them and relies only on the
+# condition waits below.
+PACING_PROFILES = {
+    "demo": 1.0,
+    "fast": 0.0,
+}
+DEFAULT_PACING = os.environ.get("AUTOMATION_PACING", "demo")
+
+
+def pause(seconds, profile=DEFAULT_PACING):
+    """Sleep for `seconds` scaled by the pacing profile (no-op under "fast")."""
+    try:
+        scale = PACING_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown pacing profile '{profile}'. Choose from: {', '.join(PACING_PROFILES)}")
+    if scale:
+        time.sleep(seconds * scale)
+
+
+# ----------------------------------------------------------------------
+#  Conditions: callables for WebDriverWait.until()
+# ----------------------------------------------------------------------
+def input_enabled(locator):
+    """Input is present, visible, enabled and not read-only."""
+    def condition(driver):
+        try:
+            el = driver.find_element(*locator)
+            if el.is_displayed() and el.is_enabled() and not el.get_attribute("readonly"):
+                return el
+        except Exception:
+            pass
+        return False
+    return condition
+
+
+def input_value(locator, value):
+    """Input is enabled and its value reads back as `value` (Vue has taken the keystrokes)."""
+    def condition(driver):
+        try:
+            el = driver.find_element(*locator)
+            if el.is_enabled() and el.get_attribute("value") == str(value):
+                return el
+        except Exception:
+            pass
+        return False
+    return condition
+
+
+def url_left(fragment):
+    """Current URL no longer contains `fragment` (a form submit redirected away)."""
+    def condition(driver):
+        return fragment not in driver.current_url
+    return condition
+
+
+class TableRedraw:
+    """
+    Wait for a DataTables redraw triggered by an action.
+
+        redraw = TableRedraw(driver, "#purchase-order-table")
+        search_button.click()
+        WebDriverWait(driver, 15).until(redraw)
+
+    The draw counter is read when the object is created, so create it
+    before the action that causes the redraw.
+    """
+
+    COUNTER_SCRIPT = """
+        const sel = arguments[0];
+        const table = document.querySelector(sel);
+        if (!table) { return -1; }
+        const processing = document.getElementById(table.id + '_processing');
+        const busy = processing && processing.offsetParent !== null
+            && getComputedStyle(processing).display !== 'none';
+        if (busy) { return -2; }
+        if (!window.jQuery) { return -3; }
+        if (table.__drawCount === undefined) {
+            table.__drawCount = 0;
+            jQuery(table).on('draw.dt', function () { table.__drawCount++; });
+        }
+        return table.__drawCount;
+    """
+
+    def __init__(self, driver, selector):
+        self.selector = selector
+        self.mark = driver.execute_script(self.COUNTER_SCRIPT, selector)
+
+    def __call__(self, driver):
+        count = driver.execute_script(self.COUNTER_SCRIPT, self.selector)
+        if count in (-1, -2):
+            return False  # table not rendered yet, or "Processing..." overlay showing
+        if self.mark < 0 or count < 0:
+            return True  # no draw counter to compare; overlay gone is enough
+        return count > self.mark
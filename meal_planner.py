@@ -0,0 +1,114 @@
+import argparse
+import csv
+import json
+import os
+from collections import namedtuple
+
+# One Create modal: every employee gets every meal on the date
+MealSubmission = namedtuple("MealSubmission", "date meals departments employees")
+
+
+def read_roster(path):
+    """Roster rows (employee, date, meal, optional department) from a .csv or .jsonl file."""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+    return [{k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()} for row in rows]
+
+
+def _blocks_by_meal_set(cells):
+    """Per employee, dates sharing the same set of meals; then employees sharing (meals, dates)."""
+    per_employee = {}
+    for employee, date, meal in cells:
+        per_employee.setdefault(employee, {}).setdefault(date, set()).add(meal)
+    blocks = {}
+    for employee, days in per_employee.items():
+        by_meals = {}
+        for date, meals in days.items():
+            by_meals.setdefault(frozenset(meals), set()).add(date)
+        for meals, dates in by_meals.items():
+            blocks.setdefault((meals, frozenset(dates)), set()).add(employee)
+    return [(dates, meals, employees) for (meals, dates), employees in blocks.items()]
+
+
+def _blocks_by_meal(cells):
+    """Per meal, employees sharing the same dates; then meals sharing (dates, employees)."""
+    dates_of = {}
+    for employee, date, meal in cells:
+        dates_of.setdefault((meal, employee), set()).add(date)
+    per_meal = {}
+    for (meal, employee), dates in dates_of.items():
+        per_meal.setdefault((meal, frozenset(dates)), set()).add(employee)
+    blocks = {}
+    for (meal, dates), employees in per_meal.items():
+        blocks.setdefault((dates, frozenset(employees)), set()).add(meal)
+    return [(dates, frozenset(meals), employees) for (dates, employees), meals in blocks.items()]
+
+
+def plan_meal_submissions(roster, max_employees=None):
+    """
+    Smallest set of modal submissions found that covers the roster exactly.
+
+    Each submission is one date x meals x employees block: the calendar input is
+    only known to take a single date, so only employees and meals are batched.
+    Per date two groupings are tried (employees with the same meal set, and meals
+    with the same employee set) and the one needing fewer submissions wins.
+    Employees are further split by their own departments, so a submission never
+    selects a department none of its employees belongs to. max_employees splits
+    large blocks so a single modal never carries more employees than that.
+    """
+    cells = {(row["employee"], row["date"], row["meal"]) for row in roster}
+    departments_of = {}
+    for row in roster:
+        if row.get("department"):
+            departments_of.setdefault(row["employee"], set()).add(row["department"])
+
+    plan = []
+    for date in sorted({d for _, d, _ in cells}):
+        day = {cell for cell in cells if cell[1] == date}
+        blocks = min(_blocks_by_meal_set(day), _blocks_by_meal(day), key=len)
+        for _, meals, employees in sorted(blocks, key=lambda b: (sorted(b[1]), sorted(b[2]))):
+            by_departments = {}
+            for e in sorted(employees):
+                by_departments.setdefault(tuple(sorted(departments_of.get(e, ()))), []).append(e)
+            for departments, group in sorted(by_departments.items()):
+                step = max_employees or len(group)
+                for i in range(0, len(group), step):
+                    plan.append(MealSubmission(date, tuple(sorted(meals)), departments, tuple(group[i:i + step])))
+    return plan
+
+
+def covered_cells(plan):
+    """Every (employee, date, meal) the plan would schedule."""
+    return {(e, s.date, m) for s in plan for e in s.employees for m in s.meals}
+
+
+if __name__ == "__main__":
+    from core.metrics import METRICS
+    from core.session_store import SessionStore
+    from test_canteen_ui import employee_meal_plan
+
+    parser = argparse.ArgumentParser(description="Plan and submit a monthly canteen meal roster.")
+    parser.add_argument("roster", help="CSV or JSONL with employee, date, meal[, department] per row.")
+    parser.add_argument("--max-employees", type=int, default=None, help="Employees per modal submission.")
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan without submitting it.")
+    parser.add_argument("--username", default=os.environ.get("DOLPHIN_USERNAME"))
+    parser.add_argument("--password", default=os.environ.get("DOLPHIN_PASSWORD"))
+    args = parser.parse_args()
+
+    roster = read_roster(args.roster)
+    plan = plan_meal_submissions(roster, args.max_employees)
+    cells = {(row["employee"], row["date"], row["meal"]) for row in roster}
+    assert covered_cells(plan) == cells, "plan does not cover the roster exactly"
+    print(f"{len(cells)} roster entries -> {len(plan)} modal submissions")
+    for n, s in enumerate(plan, 1):
+        print(f"  {n}: {s.date} x {', '.join(s.meals)} x {len(s.employees)} employees")
+    if not args.dry_run:
+        username = args.username or input("Enter your username: ")
+        password = args.password or input("Enter your password: ")
+        results, _ = employee_meal_plan(username, password, plan, log_callback=print,
+                                        session_store=SessionStore())
+        print(f"\n{sum(1 for _, ok in results if ok)} of {len(plan)} submissions saved")
+        print(METRICS.format_summary())
@@ -1,34 +1,59 @@
 import base64
+import os
 import time
 import traceback
+from urllib.parse import urlparse
 from selenium.webdriver.common.keys import Keys
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException
+from core.chrome_profiles import DEFAULT_PROFILE, apply_profile_cdp, build_chrome_options
+from core.driver_resolver import resolve_chromedriver
+from core.metrics import METRICS, instrument_class, record_wait
+from core.multiselect import VueMultiselect
+from core.reconciliation import format_reconciliation, reconcile, rendered_rows, source_rows
+from core.session_store import restore_session
+from core.waits import DEFAULT_PACING, pause
 
 # --- Constants ---
 AUTH_USER = "mav"
 AUTH_PASS = "mavsecret"
-LOGIN_URL = "https://uattuth.dolphin.com.np/canteen/login"
-EMPLOYEE_URL = "https://uattuth.dolphin.com.np/canteen/employee"
-EMPLOYEE_MEAL_SCHEDULE_URL = "https://uattuth.dolphin.com.np/canteen/user-meal-schedule"
+BASE_URL = os.environ.get("DOLPHIN_BASE_URL", "https://uattuth.dolphin.com.np").rstrip("/")
+LOGIN_URL = f"{BASE_URL}/canteen/login"
+EMPLOYEE_URL = f"{BASE_URL}/canteen/employee"
+EMPLOYEE_MEAL_SCHEDULE_URL = f"{BASE_URL}/canteen/user-meal-schedule"
+SESSION_ENVIRONMENT = urlparse(BASE_URL).netloc + "-canteen"
 LOG_FILE = "test_result.log"
+EMPLOYEE_TABLE = "table"
+EMPLOYEE_COLUMNS = ("employee_id", "name", "department")  # used when the table has no header row
+EMPLOYEE_ENDPOINT = os.environ.get("DOLPHIN_EMPLOYEE_ENDPOINT", "/api/employees")  # data source behind the list
+EMPLOYEE_NEXT_PAGE = "//button[(contains(., 'Next') or @aria-label='Next' or @rel='next') and not(@disabled)]"
+# The Add Employee form's only multiselect is the department picker; its placeholder
+# text is not known, so it is found as the first multiselect on the page.
+DEPARTMENT_PICKER = {"css": os.environ.get("DOLPHIN_DEPARTMENT_PICKER", ".multiselect")}
 
 
 # ----------------------------------------------------------------------
 #  Base Class for shared Selenium logic
 # ----------------------------------------------------------------------
 class BaseCanteenAutomation:
-    def __init__(self, username, password, log_callback=None):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument_class(cls)
+
+    def __init__(self, username, password, log_callback=None, session_store=None, pacing=DEFAULT_PACING,
+                 profile=DEFAULT_PROFILE):
         self.username = username
         self.password = password
         self.driver = None
         self.logs = []
         self.log_callback = log_callback
+        self.session_store = session_store
+        self.pacing = pacing
+        self.profile = profile
 
     def log(self, msg):
         timestamp = time.strftime("[%Y-%m-%d %H:%M:%S] ")
@@ -39,24 +64,59 @@ class BaseCanteenAutomation:
         with open(LOG_FILE, "a", encoding="utf-8") as f:
             f.write(line + "\n")
 
+    def pause(self, seconds):
+        start = time.perf_counter()
+        pause(seconds, self.pacing)
+        elapsed = time.perf_counter() - start
+        if elapsed:
+            METRICS.record(type(self).__name__, "pause", elapsed)
+
+    def wait_until(self, condition, timeout=10):
+        start = time.perf_counter()
+        try:
+            return WebDriverWait(self.driver, timeout).until(condition)
+        finally:
+            record_wait(self, condition, time.perf_counter() - start)
+
     def init_driver(self):
-        chrome_options = Options()
-        chrome_options.add_argument("--start-maximized")
-        prefs = {
-            "credentials_enable_service": False,
-            "profile.password_manager_enabled": False,
-            "profile.password_manager_leak_detection": False
-        }
-        chrome_options.add_experimental_option("prefs", prefs)
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+        chrome_options = build_chrome_options(self.profile)
+        resolution = resolve_chromedriver()
+        self.log(f"chromedriver for Chrome {resolution.chrome_version} resolved from "
+                 f"{resolution.source} in {resolution.seconds * 1000:.1f} ms")
+        self.driver = webdriver.Chrome(service=Service(resolution.path), options=chrome_options)
 
         auth_header = base64.b64encode(f"{AUTH_USER}:{AUTH_PASS}".encode()).decode()
         self.driver.execute_cdp_cmd("Network.enable", {})
         self.driver.execute_cdp_cmd("Network.setExtraHTTPHeaders", {"headers": {"Authorization": f"Basic {auth_header}"}})
-        self.log("Chrome driver initialized with Basic Auth")
+        apply_profile_cdp(self.driver, self.profile)
+        self.log(f"Chrome driver initialized with Basic Auth ({self.profile} profile)")
 
     def login(self):
+        if self.session_store:
+            if self.restore_saved_session():
+                return
+            with self.session_store.lock(self.username, SESSION_ENVIRONMENT):
+                if self.restore_saved_session():
+                    return
+                self.submit_login()
+                if "login" not in self.driver.current_url:
+                    self.session_store.save(self.driver, self.username, SESSION_ENVIRONMENT)
+                    self.log("Session saved for reuse.")
+            return
+        self.submit_login()
+
+    def restore_saved_session(self):
+        state = self.session_store.load(self.username, SESSION_ENVIRONMENT)
+        if not state:
+            return False
+        if restore_session(self.driver, state, EMPLOYEE_URL):
+            self.log("Restored saved session, skipping login.")
+            return True
+        self.log("Saved session rejected by server; logging in again.")
+        self.session_store.invalidate(self.username, SESSION_ENVIRONMENT)
+        return False
+
+    def submit_login(self):
         self.log("Logging in...")
         self.driver.get(LOGIN_URL)
         wait = WebDriverWait(self.driver, 10)
@@ -67,7 +127,11 @@ class BaseCanteenAutomation:
         login_button = self.driver.find_element(By.XPATH, "//button[contains(., 'Login') or contains(., 'Sign In')]")
         login_button.click()
         self.log("Login submitted.")
-        time.sleep(2)
+        try:
+            self.wait_until(lambda d: "login" not in d.current_url)
+        except TimeoutException:
+            self.log("Still on the login page after submitting credentials.")
+        self.pause(2)
 
     def wait_click(self, by, value, timeout=10):
         el = WebDriverWait(self.driver, timeout).until(EC.element_to_be_clickable((by, value)))
@@ -87,11 +151,16 @@ class BaseCanteenAutomation:
             self.log("Browser closed.")
 
 
+instrument_class(BaseCanteenAutomation)
+
+
 # ----------------------------------------------------------------------
 #  Add Employee Test Class
 # ----------------------------------------------------------------------
 class AddEmployeeTest(BaseCanteenAutomation):
-    def run(self, employee_id, first_name, last_name, middle_name="", department_list=None, is_active=True):
+    def run(self, employee_id, first_name, last_name, middle_name="", department_list=None, is_active=True,
+            verify=True):
+        """Create one employee. verify=False skips the search check (reconcile the batch afterwards instead)."""
         department_list = department_list or []
         self.log("Starting Add Employee Test...")
 
@@ -100,7 +169,7 @@ class AddEmployeeTest(BaseCanteenAutomation):
             self.login()
             self.driver.get(EMPLOYEE_URL)
             self.log("Employee page loaded.")
-            time.sleep(2)
+            self.pause(2)
 
             # Click create button
             self.wait_click(By.XPATH, "//button[contains(text(), 'Create')]")
@@ -112,9 +181,11 @@ class AddEmployeeTest(BaseCanteenAutomation):
             self.log(f"Employee ID: {employee_id}")
 
             # Check duplicate error
-            time.sleep(1)
             try:
-                error_el = self.driver.find_element(By.XPATH, "//span[@class='text-red-500 text-[12px] error-message']")
+                error_el = self.wait_until(
+                    EC.presence_of_element_located((By.XPATH, "//span[@class='text-red-500 text-[12px] error-message']")),
+                    timeout=1
+                )
                 if "Employee id already assigned" in error_el.text:
                     self.log("Duplicate Employee ID detected. Aborting.")
                     return False
@@ -128,11 +199,9 @@ class AddEmployeeTest(BaseCanteenAutomation):
 
             # Department multiselect
             try:
-                dropdown = WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable((By.CSS_SELECTOR, "span.multiselect__placeholder")))
-                dropdown.click()
-                for dept in department_list:
-                    option = WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable((By.XPATH, f"//span[contains(text(), '{dept}')]")))
-                    option.click()
+                selected = VueMultiselect(self.driver).select_many(
+                    DEPARTMENT_PICKER, department_list or [], match="contains")
+                for dept in selected:
                     self.log(f"Selected department: {dept}")
             except Exception as e:
                 self.log(f"Department selection skipped or failed: {e}")
@@ -149,12 +218,17 @@ class AddEmployeeTest(BaseCanteenAutomation):
             # Save
             self.wait_click(By.XPATH, "//button[normalize-space()='Save']")
             self.log("Clicked Save.")
-            time.sleep(2)
+            self.pause(2)
+            if not verify:
+                self.log(f"Employee '{employee_id}' submitted (verification deferred).")
+                return True
 
             # Verify creation
             search_input = WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='search']")))
             search_input.send_keys(employee_id)
-            time.sleep(1)
+            self.wait_until(lambda d: "No Employee Found" in d.page_source
+                            or d.find_elements(By.XPATH, f"//td[normalize-space()='{employee_id}']"))
+            self.pause(1)
             if "No Employee Found" in self.driver.page_source:
                 self.log(f"Add Employee Failed for {employee_id}")
                 return False
@@ -169,32 +243,129 @@ class AddEmployeeTest(BaseCanteenAutomation):
             self.quit()
 
 
+# ----------------------------------------------------------------------
+#  Employee Reconciliation: one scrape of the employee list per batch
+# ----------------------------------------------------------------------
+class EmployeeReconciliation(BaseCanteenAutomation):
+    def run(self, employees):
+        """
+        Check a batch of employee records (dicts with employee_id, first_name,
+        middle_name, last_name) against the employee list in one pass.
+        Returns a ReconciliationReport keyed by employee_id, or None on error.
+        """
+        self.log(f"Reconciling {len(employees)} employees...")
+        try:
+            self.init_driver()
+            self.login()
+            self.driver.get(EMPLOYEE_URL)
+            self.wait_until(EC.presence_of_element_located((By.CSS_SELECTOR, f"{EMPLOYEE_TABLE} tbody tr")))
+            rows = self.employee_rows()
+            self.log(f"Read {len(rows)} employees from the list.")
+            ledger = [(e["employee_id"], {"employee_id": e["employee_id"], "name": " ".join(
+                filter(None, (e.get("first_name"), e.get("middle_name"), e.get("last_name"))))})
+                for e in employees]
+            report = reconcile(ledger, rows, key=("employee_id",), compare=("name",))
+            for line in format_reconciliation(report, "employees").splitlines():
+                self.log(line)
+            return report
+        except Exception as e:
+            self.log(f"Error reconciling employees: {e}")
+            self.log(traceback.format_exc())
+            return None
+        finally:
+            self.quit()
+
+    def employee_rows(self):
+        """
+        Every employee in the list: from its data source when that returns rows with
+        an employee_id, else by paging the rendered table.
+        """
+        try:
+            rows = source_rows(self.driver, EMPLOYEE_ENDPOINT, required=("employee_id",))
+            for row in rows:
+                row.setdefault("name", " ".join(
+                    filter(None, (row.get("first_name"), row.get("middle_name"), row.get("last_name")))))
+            return rows
+        except Exception as e:
+            self.log(f"Employee data source unavailable, paging the list instead: {e}")
+        rows = {}
+        while True:
+            for row in rendered_rows(self.driver, EMPLOYEE_TABLE, EMPLOYEE_COLUMNS):
+                rows.setdefault(row.get("employee_id"), row)
+            buttons = self.driver.find_elements(By.XPATH, EMPLOYEE_NEXT_PAGE)
+            if not buttons:
+                return list(rows.values())
+            first_row = self.driver.find_element(By.CSS_SELECTOR, f"{EMPLOYEE_TABLE} tbody tr").text
+            self.driver.execute_script("arguments[0].click();", buttons[0])
+            # Vue may patch the rows in place, so wait for the content rather than staleness
+            self.wait_until(lambda d: d.find_element(By.CSS_SELECTOR, f"{EMPLOYEE_TABLE} tbody tr").text != first_row)
+
+
 # ----------------------------------------------------------------------
 #  Employee Meal Schedule Test Class (Updated & Dynamic)
 # ----------------------------------------------------------------------
 class EmployeeMealTest(BaseCanteenAutomation):
+    MODAL_XPATH = "//div[contains(@class, 'fixed') and contains(@class, 'top-0') and contains(@class, 'z-10')]"
+
     def run(self, meal_date, meal_schedule_list=None, department_list=None, employee_list=None):
-        meal_schedule_list = meal_schedule_list or []
-        department_list = department_list or []
-        employee_list = employee_list or []
         self.log("Starting Employee Meal Schedule Test...")
 
         try:
             self.init_driver()
             self.login()
-            self.driver.get(EMPLOYEE_MEAL_SCHEDULE_URL)
-            self.log("Employee Meal Schedule page loaded.")
-            time.sleep(2)
+            return self.submit_schedule(meal_date, meal_schedule_list, department_list, employee_list)
+
+        except Exception as e:
+            self.log(f"Error in Employee Meal Test: {e}")
+            self.log(traceback.format_exc())
+            return False
+        finally:
+            self.quit()
+
+    def run_plan(self, submissions):
+        """
+        Submit every MealSubmission (see meal_planner) in one logged-in session.
+        Returns [(submission, ok)]; a failed submission does not stop the rest.
+        """
+        self.log(f"Running meal plan with {len(submissions)} submissions...")
+        results = []
+        try:
+            self.init_driver()
+            self.login()
+            for n, s in enumerate(submissions, 1):
+                self.log(f"Submission {n}/{len(submissions)}: {s.date}, {len(s.meals)} meals, "
+                         f"{len(s.employees)} employees")
+                ok = self.submit_schedule(s.date, list(s.meals), list(s.departments), list(s.employees))
+                results.append((s, ok))
+        except Exception as e:
+            self.log(f"Error in meal plan: {e}")
+            self.log(traceback.format_exc())
+        finally:
+            self.quit()
+        done = sum(1 for _, ok in results if ok)
+        self.log(f"Meal plan finished: {done} of {len(submissions)} submissions saved.")
+        return results
+
+    def submit_schedule(self, meal_date, meal_schedule_list=None, department_list=None, employee_list=None):
+        """Fill and submit one Create modal for a single `meal_date` on a logged-in session."""
+        meal_schedule_list = meal_schedule_list or []
+        department_list = department_list or []
+        employee_list = employee_list or []
+
+        try:
+            if not self.driver.current_url.startswith(EMPLOYEE_MEAL_SCHEDULE_URL):
+                self.driver.get(EMPLOYEE_MEAL_SCHEDULE_URL)
+                self.log("Employee Meal Schedule page loaded.")
+                self.pause(2)
 
             # Click the Create button
             self.wait_click(By.XPATH, "//button[contains(text(), 'Create')]")
             self.log("Clicked 'Create'.")
-            time.sleep(1)
+            self.pause(1)
 
             # Wait for modal
-            MODAL_XPATH = "//div[contains(@class, 'fixed') and contains(@class, 'top-0') and contains(@class, 'z-10')]"
             modal = WebDriverWait(self.driver, 10).until(
-                EC.visibility_of_element_located((By.XPATH, MODAL_XPATH))
+                EC.visibility_of_element_located((By.XPATH, self.MODAL_XPATH))
             )
             self.log("Modal detected.")
 
@@ -221,17 +392,25 @@ class EmployeeMealTest(BaseCanteenAutomation):
                 EC.element_to_be_clickable((By.XPATH, ".//button[text()='Add']"))
             )
             self.driver.execute_script("arguments[0].click();", add_button)
+            self.wait_until(EC.invisibility_of_element_located((By.XPATH, self.MODAL_XPATH)))
             self.log("Meal schedule submitted successfully!")
-            time.sleep(2)
+            self.pause(2)
 
             return True
 
         except Exception as e:
             self.log(f"Error in Employee Meal Test: {e}")
             self.log(traceback.format_exc())
+            self.reset_schedule_page()
             return False
-        finally:
-            self.quit()
+
+    def reset_schedule_page(self):
+        """Reload the schedule page so a modal left open by a failed submission does not leak into the next."""
+        try:
+            self.driver.get(EMPLOYEE_MEAL_SCHEDULE_URL)
+            self.log("Employee Meal Schedule page reloaded after the failed submission.")
+        except Exception as e:
+            self.log(f"Could not reload the Employee Meal Schedule page: {e}")
 
     # -----------------------
     # Helper: Robust Multiselect Input
@@ -240,16 +419,10 @@ class EmployeeMealTest(BaseCanteenAutomation):
         if not items:
             return
         try:
-            input_field = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, f"//input[@class='multiselect__input' and @placeholder='{placeholder_text}']"))
-            )
-            self.driver.execute_script("arguments[0].focus();", input_field)
-            for item in items:
-                input_field.send_keys(item)
-                time.sleep(0.5)
-                input_field.send_keys(Keys.ENTER)
-                self.log(f"Selected '{item}' in '{placeholder_text}'")
-            time.sleep(0.5)
+            selected = VueMultiselect(self.driver).select_many({"placeholder": placeholder_text}, items, match="prefix")
+            for label in selected:
+                self.log(f"Selected '{label}' in '{placeholder_text}'")
+            self.pause(0.5)
         except Exception as e:
             self.log(f"Multiselect '{placeholder_text}' failed: {e}")
             self.log(traceback.format_exc())
@@ -258,12 +431,29 @@ class EmployeeMealTest(BaseCanteenAutomation):
 # ----------------------------------------------------------------------
 #  Wrapper Functions (for Tkinter UI)
 # ----------------------------------------------------------------------
-def employee_meal(username, password, meal_date, meal_schedule_list=None, department_list=None, employee_list=None, log_callback=None):
-    test = EmployeeMealTest(username, password, log_callback)
+def employee_meal(username, password, meal_date, meal_schedule_list=None, department_list=None, employee_list=None, log_callback=None, session_store=None):
+    test = EmployeeMealTest(username, password, log_callback, session_store)
     result = test.run(meal_date, meal_schedule_list, department_list, employee_list)
     return result, "\n".join(test.logs)
 
-def add_employee(username, password, employee_id, first_name, last_name, middle_name="", department_list=None, is_active=True, log_callback=None):
-    test = AddEmployeeTest(username, password, log_callback)
-    result = test.run(employee_id, first_name, last_name, middle_name, department_list, is_active)
+def employee_meal_plan(username, password, submissions, log_callback=None, session_store=None):
+    test = EmployeeMealTest(username, password, log_callback, session_store)
+    results = test.run_plan(submissions)
+    return results, "\n".join(test.logs)
+
+def add_employee(username, password, employee_id, first_name, last_name, middle_name="", department_list=None, is_active=True, log_callback=None, session_store=None, verify=True):
+    test = AddEmployeeTest(username, password, log_callback, session_store)
+    result = test.run(employee_id, first_name, last_name, middle_name, department_list, is_active, verify)
     return result, "\n".join(test.logs)
+
+def add_employees(username, password, employees, log_callback=None, session_store=None):
+    """Create each employee without the per-record search, then reconcile the whole batch once."""
+    submitted = []
+    for employee in employees:
+        test = AddEmployeeTest(username, password, log_callback, session_store)
+        if test.run(employee["employee_id"], employee["first_name"], employee["last_name"],
+                    employee.get("middle_name", ""), employee.get("department_list"),
+                    employee.get("is_active", True), verify=False):
+            submitted.append(employee)
+    report = EmployeeReconciliation(username, password, log_callback, session_store).run(submitted)
+    return submitted, report
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Adjust system path so tests import the packages the same way the scripts do
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
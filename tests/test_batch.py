@@ -0,0 +1,19 @@
+from core.batch import invalid_result, read_records
+
+
+def test_read_records_from_csv_converts_boolean_fields(tmp_path):
+    path = tmp_path / "records.csv"
+    path.write_text("supplier,tax_on_free_active\nA,Yes\nB,0\n", encoding="utf-8")
+    rows = list(read_records(str(path), ("tax_on_free_active",)))
+    assert rows == [{"supplier": "A", "tax_on_free_active": True}, {"supplier": "B", "tax_on_free_active": False}]
+
+
+def test_read_records_from_jsonl_skips_blank_lines(tmp_path):
+    path = tmp_path / "records.jsonl"
+    path.write_text('{"store": "Main"}\n\n{"store": "ER"}\n', encoding="utf-8")
+    assert list(read_records(str(path))) == [{"store": "Main"}, {"store": "ER"}]
+
+
+def test_invalid_result_joins_errors():
+    assert invalid_result(3, ["supplier: required", "quantity: not a number"]) == {
+        "index": 3, "status": "invalid", "duration": 0, "error": "supplier: required; quantity: not a number"}
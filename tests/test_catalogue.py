@@ -0,0 +1,34 @@
+import pytest
+
+from core.catalogue import CatalogueIndex, CatalogueItem, item_label, parse_item_label
+from core.master_data import ResolutionError
+
+
+def test_parse_item_label_with_and_without_unit():
+    assert parse_item_label("DIC10 - Diclofenac 50mg Tablet (Strip)") == CatalogueItem(
+        "DIC10", "Diclofenac 50mg Tablet", "Strip", "DIC10 - Diclofenac 50mg Tablet (Strip)")
+    assert parse_item_label("GAU1 - Gauze Roll") == CatalogueItem("GAU1", "Gauze Roll", None, "GAU1 - Gauze Roll")
+
+
+def test_parse_item_label_keeps_nested_brackets_in_the_name():
+    item = parse_item_label("ORS1 - ORS (Orange) Sachet (Box)")
+    assert (item.code, item.name, item.unit) == ("ORS1", "ORS (Orange) Sachet", "Box")
+
+
+def test_unparsable_label_is_all_name():
+    assert parse_item_label("Cotton") == CatalogueItem(None, "Cotton", None, "Cotton")
+
+
+def test_item_label_round_trips_endpoint_entries():
+    entry = {"code": "DIC10", "name": "Diclofenac 50mg Tablet", "unit": "Strip"}
+    assert parse_item_label(item_label(entry)).code == "DIC10"
+    assert item_label({"name": "Cotton"}) == "Cotton"
+    assert item_label("PCM5 - Paracetamol 500mg Tablet (Strip)") == "PCM5 - Paracetamol 500mg Tablet (Strip)"
+
+
+def test_name_shared_by_several_units_is_ambiguous():
+    index = CatalogueIndex(["PCM5 - Paracetamol 500mg Tablet (Strip)", "PCM6 - Paracetamol 500mg Tablet (Box)"])
+    assert index.by_code("pcm6").unit == "Box"
+    with pytest.raises(ResolutionError) as error:
+        index.resolve("Paracetamol 500mg Tablet")
+    assert len(error.value.suggestions) == 2
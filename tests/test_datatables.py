@@ -0,0 +1,33 @@
+import datetime
+
+from core.datatables import cell_text, row_record, snake_case, typed_record
+
+VIEW = '<button type="button" class="btn view-detail" data-id="42">View Detail</button>'
+
+
+def test_snake_case_and_cell_text():
+    assert snake_case("PO Number") == "po_number"
+    assert cell_text("<b>Shree &amp; Sons</b> ") == "Shree & Sons"
+    assert cell_text(12.5) == 12.5
+
+
+def test_object_row_keeps_keys_and_takes_id_from_the_action_cell():
+    row = {"po_number": "PO-2025-00042", "supplier": "<span>Shree Pharma</span>", "action": VIEW}
+    assert row_record(row, []) == {"id": 42, "po_number": "PO-2025-00042", "supplier": "Shree Pharma",
+                                   "action": "View Detail"}
+
+
+def test_array_row_is_keyed_by_column_titles():
+    columns = [{"title": "PO Number"}, {"title": "Supplier"}, {"title": ""}]
+    record = row_record(["PO-2025-00042", "Shree Pharma", VIEW], columns)
+    assert record == {"po_number": "PO-2025-00042", "supplier": "Shree Pharma", "column_2": "View Detail", "id": 42}
+
+
+def test_existing_id_is_not_overridden():
+    assert row_record({"id": 7, "action": VIEW}, [])["id"] == 7
+
+
+def test_typed_record_keeps_text_that_does_not_convert():
+    record = typed_record({"total_amount": "1,200.00", "order_date": "2025-03-04", "status": ""},
+                          {"total_amount": float, "order_date": datetime.date.fromisoformat, "status": int})
+    assert record == {"total_amount": "1,200.00", "order_date": datetime.date(2025, 3, 4), "status": ""}
@@ -0,0 +1,27 @@
+from Purchase_Order.detail_crawler import DetailCache, DetailCrawler, listing_start, needs_fetch
+
+
+def test_listing_starts_at_the_watermark_date():
+    assert listing_start("2025-01-01", None) == "2025-01-01"
+    assert listing_start("2025-01-01", "2025-03-04 10:00:00") == "2025-03-04"
+    assert listing_start("2025-06-01", "2025-03-04 10:00:00") == "2025-06-01"
+
+
+def test_needs_fetch_compares_markers():
+    markers = {"PO-1": "2025-03-04 10:00:00"}
+    assert needs_fetch({"po_number": "PO-2", "updated_at": "2025-01-01 00:00:00"}, markers)
+    assert needs_fetch({"po_number": "PO-1", "updated_at": "2025-03-05 09:00:00"}, markers)
+    assert not needs_fetch({"po_number": "PO-1", "updated_at": "2025-03-04 10:00:00"}, markers)
+
+
+def test_rows_without_po_number_or_id_are_skipped(tmp_path):
+    cache = DetailCache(str(tmp_path / "details.sqlite"))
+    cache.put("PO-1", "2025-03-04 10:00:00", {"fields": {}})
+    cache.advance_watermark()
+    rows = [{"id": 1, "po_number": "PO-1", "updated_at": "2025-03-04 10:00:00"},
+            {"id": 2, "po_number": "", "updated_at": "2025-03-05 10:00:00"},
+            {"id": None, "po_number": "PO-3", "updated_at": "2025-03-05 10:00:00"}]
+    stats = DetailCrawler("user", "secret", cache).crawl([rows])
+    assert stats == {"listed": 3, "skipped": 3, "fetched": 0, "failed": 0}
+    assert cache.watermark == "2025-03-04 10:00:00"
+    cache.close()
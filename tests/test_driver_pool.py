@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+
+from core.driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self, n):
+        self.n = n
+        self.alive = True
+        self.quit_called = False
+        self.window_handles = ["main"]
+        self.cdp = []
+        self.scripts = []
+        self.urls = []
+        self.logs_read = 0
+        self.switch_to = self
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        return "about:blank"
+
+    def window(self, handle):
+        pass
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.current_url
+        self.cdp.append(cmd)
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+
+    def get(self, url):
+        self.urls.append(url)
+
+    def get_log(self, kind):
+        self.logs_read += 1
+        return []
+
+    def quit(self):
+        self.quit_called = True
+
+
+def counting_factory():
+    created = []
+
+    def factory():
+        created.append(FakeDriver(len(created)))
+        return created[-1]
+    return factory, created
+
+
+def test_release_resets_and_reuses_the_driver():
+    factory, created = counting_factory()
+    pool = DriverPool(1, factory)
+    with pool.lease() as driver:
+        pass
+    assert pool.acquire() is driver
+    assert len(created) == 1
+    assert driver.cdp == ["Network.clearBrowserCookies"]
+    assert any("sessionStorage.clear()" in s for s in driver.scripts)
+    assert driver.urls == ["about:blank"]
+    assert driver.logs_read == 1
+
+
+def test_discarded_driver_wakes_a_waiter_that_starts_a_new_one():
+    factory, created = counting_factory()
+    pool = DriverPool(1, factory, lease_timeout=5)
+    first = pool.acquire()
+    leased = []
+    waiter = threading.Thread(target=lambda: leased.append(pool.acquire()))
+    waiter.start()
+    time.sleep(0.1)
+    assert not leased  # pool is full, the waiter blocks
+    first.alive = False
+    pool.release(first)  # reset fails on the dead driver, so the slot is freed
+    waiter.join(timeout=2)
+    assert not waiter.is_alive()
+    assert leased == [created[1]]
+    assert first.quit_called
+
+
+def test_acquire_times_out_with_a_descriptive_error():
+    factory, _ = counting_factory()
+    pool = DriverPool(1, factory, lease_timeout=0.1)
+    pool.acquire()
+    with pytest.raises(TimeoutError, match="all 1 drivers in the pool are leased"):
+        pool.acquire()
+
+
+def test_failed_start_frees_the_slot():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("chrome failed")
+        return FakeDriver(len(calls))
+
+    pool = DriverPool(1, factory, lease_timeout=0.1)
+    with pytest.raises(RuntimeError, match="chrome failed"):
+        pool.acquire()
+    assert pool.acquire().n == 2
+
+
+def test_close_quits_drivers_and_wakes_waiters():
+    factory, created = counting_factory()
+    pool = DriverPool(1, factory, lease_timeout=5)
+    pool.acquire()
+    errors = []
+
+    def wait():
+        try:
+            pool.acquire()
+        except RuntimeError as e:
+            errors.append(e)
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    time.sleep(0.1)
+    pool.close()
+    waiter.join(timeout=2)
+    assert [str(e) for e in errors] == ["DriverPool is closed"]
+    assert created[0].quit_called
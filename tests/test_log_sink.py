@@ -0,0 +1,98 @@
+import gzip
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import core.log_sink as log_sink
+from core.log_sink import LogSink, get_sink
+
+
+def lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_records_are_written_as_jsonl(tmp_path):
+    path = str(tmp_path / "app.jsonl")
+    sink = LogSink(path)
+    sink.emit("hello", worker="w1", job="j1", step="login")
+    sink.emit({"not": "text"}, level="warning")
+    sink.close()
+    first, second = lines(path)
+    assert (first["msg"], first["worker"], first["job"], first["step"]) == ("hello", "w1", "j1", "login")
+    assert second["level"] == "warning"
+
+
+def test_write_errors_do_not_kill_the_writer(tmp_path, capsys):
+    sink = LogSink(str(tmp_path / "missing" / "app.jsonl"))
+    sink.emit("lost")
+    time.sleep(log_sink.FLUSH_INTERVAL * 2)
+    assert sink._thread.is_alive()
+    sink.close()
+    assert "could not write" in capsys.readouterr().err
+
+
+def test_full_queue_drops_and_counts(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_sink, "MAX_QUEUED", 2)
+    release = threading.Event()
+
+    class SlowSink(LogSink):
+        def _write(self, batch):
+            release.wait(5)
+            super()._write(batch)
+
+    path = str(tmp_path / "app.jsonl")
+    sink = SlowSink(path)
+    sink.emit("first")
+    while not sink._queue.empty():  # wait until the writer holds "first" in _write
+        time.sleep(0.01)
+    for i in range(10):
+        sink.emit(i)
+    release.set()
+    sink.close()
+    records = lines(path)
+    assert [r["msg"] for r in records[:3]] == ["first", 0, 1]
+    assert records[-1]["msg"] == "log sink queue full: 8 records dropped"
+
+
+def test_rotation_keeps_backup_count_archives(tmp_path):
+    path = str(tmp_path / "app.jsonl")
+    sink = LogSink(path, max_bytes=200, backup_count=2)
+    for i in range(6):
+        sink._write([{"msg": "x" * 150, "n": i}])
+    sink.close()
+    archives = sorted(name for name in os.listdir(tmp_path) if name.endswith(".gz"))
+    assert archives == ["app.jsonl.1.gz", "app.jsonl.2.gz"]
+    assert not os.path.exists(f"{path}.rotate.lock")
+    with gzip.open(f"{path}.1.gz", "rt", encoding="utf-8") as f:
+        assert json.loads(f.readlines()[-1])["n"] == 5
+
+
+def test_rotation_is_skipped_while_another_process_holds_the_lock(tmp_path):
+    path = str(tmp_path / "app.jsonl")
+    open(f"{path}.rotate.lock", "w").close()
+    sink = LogSink(path, max_bytes=10)
+    sink._write([{"msg": "x" * 50}])
+    sink.close()
+    assert os.path.exists(path)
+    assert not any(name.endswith(".gz") for name in os.listdir(tmp_path))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_gets_its_own_writer(tmp_path):
+    path = str(tmp_path / "app.jsonl")
+    get_sink(path).emit("parent")
+    pid = os.fork()
+    if pid == 0:
+        try:
+            sink = get_sink(path)
+            sink.emit("child")
+            sink.close()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    get_sink(path).close()
+    assert sorted(r["msg"] for r in lines(path)) == ["child", "parent"]
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from core.catalogue import CatalogueIndex
+from core.master_data import MasterDataDirectory, MasterDataError, MasterDataIndex, ResolutionError
+
+SUPPLIERS = ["Shree Pharma", "Apex Medical", "Apex Medicos", "Nepal Drugs"]
+
+
+def test_resolve_exact_and_unique_prefix():
+    index = MasterDataIndex(SUPPLIERS)
+    assert index.resolve(" shree pharma ") == "Shree Pharma"
+    assert index.resolve("Nepal") == "Nepal Drugs"
+
+
+def test_ambiguous_prefix_lists_the_candidates():
+    with pytest.raises(ResolutionError) as error:
+        MasterDataIndex(SUPPLIERS).resolve("Apex Medic")
+    assert error.value.suggestions == ["Apex Medical", "Apex Medicos"]
+
+
+def test_close_match_is_suggested_not_resolved():
+    with pytest.raises(ResolutionError) as error:
+        MasterDataIndex(SUPPLIERS).resolve("Shri Pharma")
+    assert error.value.suggestions[0] == "Shree Pharma"
+
+
+def test_catalogue_resolves_codes_and_names():
+    index = CatalogueIndex(["DIC10 - Diclofenac 50mg Tablet (Strip)", "PCM5 - Paracetamol 500mg Tablet (Strip)"])
+    assert index.resolve("dic10") == "DIC10 - Diclofenac 50mg Tablet (Strip)"
+    assert index.resolve("Paracetamol") == "PCM5 - Paracetamol 500mg Tablet (Strip)"
+    with pytest.raises(ResolutionError):
+        index.resolve("Paracetamoll 500mg Tablet")
+
+
+def test_directory_pulls_once_and_caches_on_disk(tmp_path):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return SUPPLIERS
+
+    directory = MasterDataDirectory("suppliers", "test", str(tmp_path))
+    assert directory.resolve("nepal", fetch) == "Nepal Drugs"
+    assert directory.resolve("Shree Pharma", fetch) == "Shree Pharma"
+    assert len(calls) == 1
+    assert MasterDataDirectory("suppliers", "test", str(tmp_path)).labels() == directory.labels()
+
+
+def test_empty_pull_raises_and_is_not_cached(tmp_path):
+    directory = MasterDataDirectory("suppliers", "test", str(tmp_path))
+    with pytest.raises(MasterDataError):
+        directory.resolve("Shree Pharma", fetch=lambda: [])
+    assert directory.index() is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_empty_cache_file_is_ignored(tmp_path):
+    directory = MasterDataDirectory("suppliers", "test", str(tmp_path))
+    with open(directory.path, "w", encoding="utf-8") as f:
+        json.dump({"fetched_at": 9e12, "labels": []}, f)
+    assert directory.index() is None
+    assert directory.resolve("nepal", fetch=lambda: SUPPLIERS) == "Nepal Drugs"
@@ -0,0 +1,47 @@
+from meal_planner import covered_cells, plan_meal_submissions
+
+
+def roster(*cells, department=None):
+    return [{"employee": e, "date": d, "meal": m, "department": department} for e, d, m in cells]
+
+
+def cells_of(rows):
+    return {(row["employee"], row["date"], row["meal"]) for row in rows}
+
+
+def test_shared_schedule_is_one_submission_per_date():
+    rows = roster(*[(e, d, m) for e in ("E1", "E2", "E3") for d in ("2025-12-01", "2025-12-02")
+                    for m in ("Lunch", "Dinner")], department="Nursing")
+    plan = plan_meal_submissions(rows)
+    assert [s.date for s in plan] == ["2025-12-01", "2025-12-02"]
+    for s in plan:
+        assert s.employees == ("E1", "E2", "E3")
+        assert s.meals == ("Dinner", "Lunch")
+        assert s.departments == ("Nursing",)
+    assert covered_cells(plan) == cells_of(rows)
+
+
+def test_departments_are_not_merged_across_employees():
+    rows = (roster(("E1", "2025-12-01", "Lunch"), department="Nursing")
+            + roster(("E2", "2025-12-01", "Lunch"), department="Pharmacy")
+            + roster(("E3", "2025-12-01", "Lunch")))
+    plan = plan_meal_submissions(rows)
+    assert sorted((s.departments, s.employees) for s in plan) == [
+        ((), ("E3",)), (("Nursing",), ("E1",)), (("Pharmacy",), ("E2",))]
+    assert covered_cells(plan) == cells_of(rows)
+
+
+def test_plan_covers_an_irregular_roster_exactly():
+    rows = roster(("E1", "2025-12-01", "Lunch"), ("E1", "2025-12-02", "Dinner"),
+                  ("E2", "2025-12-01", "Lunch"), ("E2", "2025-12-01", "Dinner"),
+                  ("E3", "2025-12-03", "Breakfast"))
+    plan = plan_meal_submissions(rows)
+    assert covered_cells(plan) == cells_of(rows)
+    assert len(plan) < len(rows)
+
+
+def test_max_employees_splits_large_blocks():
+    rows = roster(*[(f"E{i}", "2025-12-01", "Lunch") for i in range(5)])
+    plan = plan_meal_submissions(rows, max_employees=2)
+    assert [len(s.employees) for s in plan] == [2, 2, 1]
+    assert covered_cells(plan) == cells_of(rows)
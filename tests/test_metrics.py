@@ -0,0 +1,55 @@
+from core.metrics import METRICS, WORKFLOW_TOTAL, StepMetrics, condition_name, instrument_class, percentile
+from core.waits import input_enabled
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_summary_puts_the_workflow_total_first():
+    metrics = StepMetrics()
+    for seconds in (1.0, 2.0, 3.0):
+        metrics.record("PurchaseOrder", "select_store", seconds)
+    metrics.record("PurchaseOrder", WORKFLOW_TOTAL, 4.0)
+    metrics.record("PurchaseOrder", "tax", 9.0)
+    rows = metrics.summary()
+    assert [row[1] for row in rows] == [WORKFLOW_TOTAL, "tax", "select_store"]
+    assert rows[2] == ("PurchaseOrder", "select_store", 3, 2.0, 3.0, 3.0, 6.0)
+
+
+def test_samples_merge_into_another_instance():
+    worker, parent = StepMetrics(), StepMetrics()
+    worker.record("StockTransfer", "save_transfer", 0.5)
+    parent.merge(worker.samples())
+    assert parent.samples() == [("StockTransfer", "save_transfer", 0.5)]
+
+
+def test_only_the_outermost_entry_point_counts_as_a_workflow_run():
+    @instrument_class
+    class Bot:
+        def run(self):
+            self.step()
+            return self.load_dashboard()
+
+        def load_dashboard(self):
+            return "done"
+
+        def step(self):
+            pass
+
+    METRICS.reset()
+    try:
+        assert Bot().run() == "done"
+        steps = [step for workflow, step, _ in METRICS.samples() if workflow == "Bot"]
+        assert sorted(steps) == sorted([WORKFLOW_TOTAL, "run", "step", "load_dashboard"])
+    finally:
+        METRICS.reset()
+
+
+def test_condition_name_uses_the_factory_name():
+    assert condition_name(input_enabled(("id", "email"))) == "input_enabled"
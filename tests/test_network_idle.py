@@ -0,0 +1,61 @@
+import json
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from core.network_idle import NetworkTracker, reset_tracker, tracker_for
+
+
+def event(method, request_id, at, **params):
+    message = {"message": {"method": method, "params": dict(params, requestId=request_id)}}
+    return {"timestamp": at * 1000, "message": json.dumps(message)}
+
+
+class LogDriver:
+    def __init__(self, *batches):
+        self.batches = list(batches)
+
+    def get_log(self, kind):
+        if self.batches is None:
+            raise WebDriverException("log type 'performance' not found")
+        return self.batches.pop(0) if self.batches else []
+
+
+def test_tracks_xhr_until_it_finishes():
+    now = time.time()
+    driver = LogDriver([event("Network.requestWillBeSent", "1", now, type="XHR", request={"url": "/api"}),
+                        event("Network.requestWillBeSent", "2", now, type="Image")],
+                       [event("Network.loadingFinished", "1", now)])
+    tracker = NetworkTracker(driver)
+    tracker.poll()
+    assert list(tracker.inflight) == ["1"]
+    assert tracker.idle_for(now) == 0.0
+    tracker.poll()
+    assert tracker.inflight == {}
+    assert tracker.idle_for(now - 10) < 1.0  # counted from the last activity
+
+
+def test_stale_requests_stop_blocking():
+    old = time.time() - 60
+    tracker = NetworkTracker(LogDriver([event("Network.requestWillBeSent", "1", old, type="Fetch")]))
+    tracker.poll()
+    assert tracker.inflight == {}
+
+
+def test_driver_without_performance_log_is_never_polled_again():
+    driver = LogDriver()
+    driver.batches = None
+    tracker = NetworkTracker(driver)
+    tracker.poll()
+    assert tracker.available is False
+
+
+def test_reset_tracker_drains_the_log_and_drops_the_tracker():
+    now = time.time()
+    driver = LogDriver([event("Network.requestWillBeSent", "1", now, type="XHR")])
+    tracker_for(driver)
+    reset_tracker(driver)
+    assert driver.batches == []
+    tracker = tracker_for(driver)
+    tracker.poll()
+    assert tracker.inflight == {}
@@ -0,0 +1,87 @@
+import datetime
+
+import pytest
+
+from benchmarks.standin_server import StandinState
+from core.reconciliation import field_pairs, normalise, reconcile, source_rows
+from Purchase_Order.batch_purchase_order import reconcile_batch
+
+PREPARED_BY = {"prepared_by": "requisitioner"}
+
+
+def test_normalise_and_field_pairs():
+    assert normalise("  Shree   PHARMA ") == "shree pharma"
+    assert normalise(None) == ""
+    assert field_pairs(("a", "b")) == [("a", "a"), ("b", "b")]
+    assert field_pairs({"a": "x"}) == [("a", "x")]
+
+
+def test_matched_missing_and_mismatched():
+    ledger = [(1, {"supplier": "A", "prepared_by": "Ram"}),
+              (2, {"supplier": "B", "prepared_by": "Sita"}),
+              (3, {"supplier": "C", "prepared_by": "Hari"})]
+    rows = [{"supplier": "a", "requisitioner": "ram"}, {"supplier": "B", "requisitioner": "Gita"}]
+    report = reconcile(ledger, rows, key=("supplier",), compare=PREPARED_BY)
+    assert report.matched == [1]
+    assert report.missing == [3]
+    assert report.mismatched == [(2, {"prepared_by": ("Sita", "Gita")})]
+    assert report.duplicated == []
+
+
+def test_same_key_entries_pair_with_their_best_row():
+    ledger = [(1, {"supplier": "A", "prepared_by": "Ram"}), (2, {"supplier": "A", "prepared_by": "Sita"})]
+    rows = [{"supplier": "A", "requisitioner": "Sita"}, {"supplier": "A", "requisitioner": "Ram"}]
+    report = reconcile(ledger, rows, key=("supplier",), compare=PREPARED_BY)
+    assert sorted(report.matched) == [1, 2]
+    assert report.mismatched == []
+
+
+def test_same_key_entry_without_a_row_is_the_one_missing():
+    ledger = [(1, {"supplier": "A", "prepared_by": "Ram"}), (2, {"supplier": "A", "prepared_by": "Sita"})]
+    rows = [{"supplier": "A", "requisitioner": "Sita"}]
+    report = reconcile(ledger, rows, key=("supplier",), compare=PREPARED_BY)
+    assert report.matched == [2]
+    assert report.missing == [1]
+
+
+def test_more_rows_than_entries_are_duplicates():
+    ledger = [(1, {"supplier": "A"})]
+    rows = [{"supplier": "A"}, {"supplier": "A"}]
+    report = reconcile(ledger, rows, key=("supplier",))
+    assert [ref for ref, _ in report.duplicated] == [1]
+
+
+def test_reconcile_batch_against_saved_rows():
+    today = datetime.date.today().isoformat()
+    state = StandinState(purchase_orders=20)
+    snapshot = lambda: {row["po_number"]: row for row in state.purchase_order_rows("All", today, today)}
+    records = [(0, {"supplier": "Shree Pharma", "store": "Main Store", "prepared_by": "Ram"}),
+               (1, {"supplier": "Shree Pharma", "store": "Main Store", "prepared_by": "Sita"}),
+               (2, {"supplier": "Nepal Drugs", "store": "Main Store", "prepared_by": "Hari"})]
+    before = snapshot()
+    for _, record in records[:2]:
+        state.add_purchase_order(record)
+    report = reconcile_batch(records, before, snapshot())
+    assert sorted(report.matched) == [0, 1]
+    assert report.missing == [2]
+    assert report.duplicated == [] and report.mismatched == []
+
+
+class ScriptDriver:
+    def __init__(self, result):
+        self.result = result
+
+    def set_script_timeout(self, timeout):
+        pass
+
+    def execute_async_script(self, script, *args):
+        return self.result
+
+
+def test_source_rows_requires_fields_when_asked():
+    rows = [{"employee_id": "EMP1"}]
+    assert source_rows(ScriptDriver({"rows": rows}), "/api/employees", required=("employee_id",)) == rows
+    assert source_rows(ScriptDriver({"rows": [{"id": 1}]}), "/api/employees") == [{"id": 1}]
+    for result in ({"rows": [{"id": 1}]}, {"rows": []}, {"error": "HTTP 404"}):
+        with pytest.raises(LookupError):
+            source_rows(ScriptDriver(result), "/api/employees", required=("employee_id",))
@@ -0,0 +1,95 @@
+import threading
+
+from core.scheduler import affinity_key, plan_affinity, run_queues, switches
+
+FIELDS = ("store", "supplier")
+
+
+def jobs(*pairs):
+    return [(i, {"store": store, "supplier": supplier}) for i, (store, supplier) in enumerate(pairs)]
+
+
+def test_affinity_key_is_normalised():
+    assert affinity_key({"store": " Main  Store", "supplier": "ACME"}, FIELDS) == ("main store", "acme")
+
+
+def test_plan_keeps_groups_together_and_covers_every_job():
+    planned = jobs(("A", "x"), ("B", "y"), ("A", "x"), ("B", "y"), ("A", "x"), ("C", "z"))
+    queues = plan_affinity(planned, 2, FIELDS)
+    assert sorted(index for queue in queues for index, _ in queue) == list(range(6))
+    for queue in queues:
+        assert switches(queue, FIELDS) == len({affinity_key(r, FIELDS) for _, r in queue})
+
+
+def test_plan_splits_a_group_bigger_than_a_fair_share():
+    queues = plan_affinity(jobs(*[("A", "x")] * 6), 3, FIELDS)
+    assert [len(queue) for queue in queues] == [2, 2, 2]
+
+
+class Worker:
+    def __init__(self):
+        self.closed = False
+
+    def quit(self):
+        self.closed = True
+
+
+def ok(worker, index, record):
+    return {"index": index, "status": "ok", "duration": 0, "error": None}
+
+
+def test_run_queues_reports_every_job_and_closes_workers():
+    workers = []
+
+    def open_worker(n):
+        workers.append(Worker())
+        return workers[-1]
+
+    seen = []
+    results = run_queues([[(0, {}), (1, {})], [(2, {})]], open_worker, ok, on_result=seen.append)
+    assert sorted(r["index"] for r in results) == [0, 1, 2]
+    assert seen == results
+    assert all(worker.closed for worker in workers)
+
+
+def test_worker_that_fails_to_open_fails_only_its_queue():
+    def open_worker(n):
+        if n == 0:
+            raise RuntimeError("login failed")
+        return Worker()
+
+    results = {r["index"]: r for r in run_queues([[(0, {}), (1, {})], [(2, {})]], open_worker, ok)}
+    assert results[0]["status"] == results[1]["status"] == "failed"
+    assert "login failed" in results[0]["error"]
+    assert results[2]["status"] == "ok"
+
+
+def test_job_that_raises_does_not_stop_its_queue():
+    def run_job(worker, index, record):
+        if index == 0:
+            raise ValueError("bad record")
+        return ok(worker, index, record)
+
+    results = {r["index"]: r["status"] for r in run_queues([[(0, {}), (1, {})]], lambda n: Worker(), run_job)}
+    assert results == {0: "failed", 1: "ok"}
+
+
+def test_grouped_jobs_emit_one_row_per_record():
+    lock = threading.Lock()
+    calls = []
+
+    def run_group(worker, indices, lines):
+        with lock:
+            calls.append(indices)
+        return [ok(worker, index, record) for index, record in lines]
+
+    queue = [((0, 1), [(0, {}), (1, {})]), ((2,), [(2, {})])]
+    results = run_queues([queue], lambda n: Worker(), run_group)
+    assert [r["index"] for r in results] == [0, 1, 2]
+    assert calls == [(0, 1), (2,)]
+
+    def fail_open(n):
+        raise RuntimeError("no driver")
+
+    failed = run_queues([queue], fail_open, run_group)
+    assert [(r["index"], r["status"]) for r in failed] == [(0, "failed"), (1, "failed"), (2, "failed")]
@@ -0,0 +1,34 @@
+import os
+import threading
+import time
+
+from core.session_store import LoginLock
+
+
+def test_stale_lock_file_is_broken(tmp_path):
+    path = str(tmp_path / "session.lock")
+    with open(path, "w") as f:
+        f.write("99999")  # left behind by a crashed process
+    old = time.time() - 300
+    os.utime(path, (old, old))
+    with LoginLock(path, stale=120):
+        with open(path) as f:
+            assert f.read() == str(os.getpid())
+    assert not os.path.exists(path)
+
+
+def test_fresh_lock_file_is_waited_for(tmp_path):
+    path = str(tmp_path / "session.lock")
+    with open(path, "w") as f:
+        f.write("99999")
+    acquired = threading.Event()
+
+    def take():
+        with LoginLock(path, stale=120):
+            acquired.set()
+    thread = threading.Thread(target=take)
+    thread.start()
+    assert not acquired.wait(0.5)  # held by another (live) process
+    os.remove(path)
+    assert acquired.wait(2)
+    thread.join()
@@ -0,0 +1,24 @@
+import pytest
+
+from Purchase_Order.sharded_query import date_shards
+
+
+def test_shards_cover_the_range_without_gaps():
+    assert date_shards("2025-01-01", "2025-01-10", 4) == [
+        ("2025-01-01", "2025-01-04"), ("2025-01-05", "2025-01-08"), ("2025-01-09", "2025-01-10")]
+
+
+def test_single_day_range_and_shards():
+    assert date_shards("2025-01-01", "2025-01-01", 7) == [("2025-01-01", "2025-01-01")]
+    assert len(date_shards("2025-01-01", "2025-01-31", 1)) == 31
+
+
+@pytest.mark.parametrize("days", [0, -1])
+def test_shard_size_below_one_day_is_rejected(days):
+    with pytest.raises(ValueError):
+        date_shards("2025-01-01", "2025-01-10", days)
+
+
+def test_reversed_range_is_rejected():
+    with pytest.raises(ValueError):
+        date_shards("2025-01-10", "2025-01-01")
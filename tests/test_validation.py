@@ -0,0 +1,68 @@
+import pytest
+
+from core.master_data import MasterDataDirectory
+from core.validation import boolean, choice, integer, iso_date, master, percent, required, validate_records
+
+
+def test_required_strips_and_rejects_blank():
+    assert required("  ACME ") == "ACME"
+    with pytest.raises(ValueError):
+        required("   ")
+
+
+def test_choice_returns_canonical_spelling():
+    check = choice("CASH", "Credit")
+    assert check(" cash ") == "CASH"
+    with pytest.raises(ValueError):
+        check("cheque")
+
+
+@pytest.mark.parametrize("value, expected", [("12", "12"), (" 7.0 ", "7"), (30, "30")])
+def test_integer_normalises_whole_numbers(value, expected):
+    assert integer(minimum=0, maximum=365)(value) == expected
+
+
+@pytest.mark.parametrize("value", ["abc", "1.5", "-1", "366", "inf", "-Infinity", "nan"])
+def test_integer_rejects_bad_values(value):
+    with pytest.raises(ValueError):
+        integer(minimum=0, maximum=365)(value)
+
+
+def test_iso_date_percent_boolean():
+    assert iso_date("2025-03-01") == "2025-03-01"
+    with pytest.raises(ValueError):
+        iso_date("01/03/2025")
+    assert percent(" 13 % ") == "13%"
+    with pytest.raises(ValueError):
+        percent("130")
+    assert boolean("Yes") is True and boolean("") is False
+    with pytest.raises(ValueError):
+        boolean("maybe")
+
+
+def test_master_passes_values_through_without_a_cache(tmp_path):
+    directory = MasterDataDirectory("suppliers", "test", str(tmp_path))
+    assert master(directory)("Anything") == "Anything"
+
+
+def test_master_resolves_against_the_cached_index(tmp_path):
+    directory = MasterDataDirectory("suppliers", "test", str(tmp_path))
+    directory.store(["Shree Pharma", "Apex Medical"])
+    check = master(directory)
+    assert check("shree") == "Shree Pharma"
+    with pytest.raises(ValueError):
+        check("Shri Pharma")
+
+
+def test_validate_records_splits_valid_rejected_and_fixed():
+    rules = {"supplier": (required,), "credit_days": (integer(minimum=0),)}
+    report = validate_records([
+        {"supplier": "ACME", "credit_days": "30"},
+        {"supplier": " ACME ", "credit_days": "30.0"},
+        {"supplier": "", "credit_days": "inf"},
+    ], rules)
+    assert [index for index, _ in report.valid] == [0, 1]
+    assert report.valid[1][1] == {"supplier": "ACME", "credit_days": "30"}
+    assert [index for index, _ in report.fixed] == [1]
+    (index, _, errors), = report.rejected
+    assert index == 2 and len(errors) == 2
@@ -5,6 +5,7 @@ import time
 
 # Import the updated Selenium test functions
 from test_canteen_ui import add_employee, employee_meal, LOG_FILE
+from UI.log_bridge import TkEventBridge
 
 
 def clear_log_file():
@@ -12,96 +13,104 @@ def clear_log_file():
         f.write("")  # Clear existing log
 
 
-# --- Helper to append logs to the UI ---
+# --- Helper to append logs to the UI (safe to call from worker threads) ---
 def append_log(msg):
     timestamp = time.strftime("[%Y-%m-%d %H:%M:%S] ")
-    log_text.insert(tk.END, timestamp + msg + "\n")
+    bridge.post("log", timestamp + msg)
+
+
+# --- Main-loop handlers for events posted through the bridge ---
+def write_log_lines(lines):
+    log_text.insert(tk.END, "\n".join(lines) + "\n")
     log_text.see(tk.END)
 
 
+def set_status(text, fg):
+    status_label.config(text=text, fg=fg)
+
+
+def set_run_button(state):
+    run_button.config(state=state)
+
+
 # --- Run Selected Test ---
 def run_selected_test():
     test_name = test_var.get()
-    status_label.config(text="Running test...", fg="blue")
-    run_button.config(state=tk.DISABLED)
-    log_text.delete(1.0, tk.END)
 
+    # Tk widgets may only be read on the main thread, so collect every input here
     username = username_entry.get().strip()
     password = password_entry.get().strip()
+    if test_name == "Add Employee Test":
+        inputs = {
+            "employee_id": employee_id_entry.get().strip(),
+            "first_name": first_name_entry.get().strip(),
+            "middle_name": middle_name_entry.get().strip(),
+            "last_name": last_name_entry.get().strip(),
+            "department_list": [d.strip() for d in departments_entry.get().split(",") if d.strip()],
+            "is_active": is_active_var.get(),
+        }
+        if not username or not password or not inputs["employee_id"] or not inputs["first_name"] \
+                or not inputs["last_name"]:
+            messagebox.showwarning(
+                "Input Error", "Please fill required fields: username, password, employee id, first and last names."
+            )
+            return
+    elif test_name == "Employee Meal Schedule Test":
+        inputs = {
+            "meal_date": ems_date_entry.get().strip(),
+            "meal_schedule_list": [m.strip() for m in ems_meal_schedule_entry.get().split(",") if m.strip()],
+            "department_list": [d.strip() for d in ems_departments_entry.get().split(",") if d.strip()],
+            "employee_list": [e.strip() for e in ems_employee_ids_entry.get().split(",") if e.strip()],
+        }
+        if not username or not password or not inputs["meal_date"]:
+            messagebox.showwarning("Input Error", "Please fill username, password, and meal date.")
+            return
+    else:
+        inputs = {}
+
+    status_label.config(text="Running test...", fg="blue")
+    run_button.config(state=tk.DISABLED)
+    log_text.delete(1.0, tk.END)
 
     def task():
         try:
             if test_name == "Add Employee Test":
-                emp_id = employee_id_entry.get().strip()
-                first_name = first_name_entry.get().strip()
-                middle_name = middle_name_entry.get().strip()
-                last_name = last_name_entry.get().strip()
-                departments = [d.strip() for d in departments_entry.get().split(",") if d.strip()]
-                is_active = is_active_var.get()
-
-                if not username or not password or not emp_id or not first_name or not last_name:
-                    messagebox.showwarning(
-                        "Input Error", "Please fill required fields: username, password, employee id, first and last names."
-                    )
-                    status_label.config(text="Idle...", fg="black")
-                    run_button.config(state=tk.NORMAL)
-                    return
-
                 success, logs = add_employee(
                     username=username,
                     password=password,
-                    employee_id=emp_id,
-                    first_name=first_name,
-                    last_name=last_name,
-                    middle_name=middle_name,
-                    department_list=departments,
-                    is_active=is_active,
-                    log_callback=lambda m: append_log(m)
+                    log_callback=lambda m: append_log(m),
+                    **inputs
                 )
 
-                status_label.config(
-                    text=("Employee Added!" if success else "Add Employee Failed!"),
-                    fg=("green" if success else "red")
+                bridge.post(
+                    "status",
+                    "Employee Added!" if success else "Add Employee Failed!",
+                    "green" if success else "red"
                 )
 
             elif test_name == "Employee Meal Schedule Test":
-                meal_date = ems_date_entry.get().strip()
-                meal_schedule_list = [m.strip() for m in ems_meal_schedule_entry.get().split(",") if m.strip()]
-                departments = [d.strip() for d in ems_departments_entry.get().split(",") if d.strip()]
-                employee_ids = [e.strip() for e in ems_employee_ids_entry.get().split(",") if e.strip()]
-
-                if not username or not password or not meal_date:
-                    messagebox.showwarning(
-                        "Input Error", "Please fill username, password, and meal date."
-                    )
-                    status_label.config(text="Idle...", fg="black")
-                    run_button.config(state=tk.NORMAL)
-                    return
-
                 success, logs = employee_meal(
                     username=username,
                     password=password,
-                    meal_date=meal_date,
-                    meal_schedule_list=meal_schedule_list,
-                    department_list=departments,
-                    employee_list=employee_ids,
-                    log_callback=lambda m: append_log(m)
+                    log_callback=lambda m: append_log(m),
+                    **inputs
                 )
 
-                status_label.config(
-                    text=("Meal Schedule Created!" if success else "Meal Schedule Failed!"),
-                    fg=("green" if success else "red")
+                bridge.post(
+                    "status",
+                    "Meal Schedule Created!" if success else "Meal Schedule Failed!",
+                    "green" if success else "red"
                 )
 
             else:
                 append_log(f"{test_name} is not implemented.")
-                status_label.config(text="Test Not Implemented", fg="orange")
+                bridge.post("status", "Test Not Implemented", "orange")
 
         except Exception as exc:
             append_log(f"Unexpected error: {exc}")
-            status_label.config(text="Test Error!", fg="red")
+            bridge.post("status", "Test Error!", "red")
         finally:
-            run_button.config(state=tk.NORMAL)
+            bridge.post("run_button", tk.NORMAL)
 
     threading.Thread(target=task, daemon=True).start()
 
@@ -199,4 +208,10 @@ tk.Label(root, text="Test Logs:", font=("Arial", 12, "bold")).pack(pady=5)
 log_text = scrolledtext.ScrolledText(root, height=18, width=100, font=("Courier", 10))
 log_text.pack(pady=5)
 
+bridge = TkEventBridge(root)
+bridge.on("log", write_log_lines)
+bridge.on("status", set_status)
+bridge.on("run_button", set_run_button)
+bridge.start()
+
 root.mainloop()